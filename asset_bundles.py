@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Era Asset Bundles
+Packs the sprites into a shared bundle (terrain, fire, effects, vegetation)
+and one bundle per era, each on its own atlas pages, and writes a manifest
+of the pages, sprite regions, dependencies and byte sizes. AssetBundles.gd
+loads a bundle from it when the first civilization of that era spawns, so
+startup only pays for the shared bundle and the eras in play.
+
+By default only the sprites asset_prune.py keeps for export are bundled.
+"""
+
+import argparse
+import io
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from asset_prune import load_sprite_atlas, prune
+from project_graph import PROJECT_DIR
+
+BUNDLE_DIR_NAME = "bundles"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+SHARED_BUNDLE = "shared"
+SHARED_CATEGORIES = ["terrain", "fire", "effects", "vegetation"]
+
+DEFAULT_PAGE_SIZE = 512
+# Transparent gutter around every sprite, so filtering never samples a neighbour
+DEFAULT_PADDING = 2
+# Page sides are rounded up to this, the block size of compressed textures
+PAGE_ALIGN = 4
+
+
+def bundle_name(category, era):
+    return SHARED_BUNDLE if category in SHARED_CATEGORIES or era is None else era
+
+
+def align(value, step=PAGE_ALIGN):
+    return -(-value // step) * step
+
+
+def pack_shelves(sizes, page_size=DEFAULT_PAGE_SIZE, padding=DEFAULT_PADDING):
+    """Shelf-pack (width, height) boxes onto pages
+
+    Returns ([(page, x, y)] in input order, [(width, height)] of each page),
+    tallest boxes first so shelves waste little height.
+    """
+    placements = [None] * len(sizes)
+    pages = []
+    x = y = shelf_height = 0
+    for index in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i)):
+        width, height = sizes[index][0] + 2 * padding, sizes[index][1] + 2 * padding
+        if width > page_size or height > page_size:
+            raise ValueError(f"Sprite of {sizes[index]} doesn't fit a {page_size} px page")
+        if not pages:
+            pages.append([0, 0])
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > page_size:
+            pages.append([0, 0])
+            x = y = shelf_height = 0
+        placements[index] = (len(pages) - 1, x + padding, y + padding)
+        shelf_height = max(shelf_height, height)
+        pages[-1][0] = max(pages[-1][0], x + width)
+        pages[-1][1] = max(pages[-1][1], y + height)
+        x += width
+    return placements, [(align(width), align(height)) for width, height in pages]
+
+
+def png_bytes(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds them, so unchanged pages keep their imports"""
+    path = Path(path)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def collect_bundles(project_dir=PROJECT_DIR, everything=False):
+    """Bundle name to sorted res:// sprite paths, from the sprite atlas"""
+    atlas = load_sprite_atlas(project_dir)
+    excluded = set() if everything else set(prune(project_dir)[2])
+    bundles = {}
+    for path, (category, era) in sorted(atlas.items()):
+        if path in excluded:
+            continue
+        if not (Path(project_dir) / path[len("res://"):]).exists():
+            print(f"⚠️  Missing sprite for bundle: {path}")
+            continue
+        bundles.setdefault(bundle_name(category, era), []).append(path)
+    return bundles
+
+
+def build_bundles(project_dir=PROJECT_DIR, everything=False, page_size=DEFAULT_PAGE_SIZE, padding=DEFAULT_PADDING):
+    """Write every bundle's atlas pages and the manifest; returns (manifest, files written)"""
+    project_dir = Path(project_dir)
+    output_dir = project_dir / "sprites" / BUNDLE_DIR_NAME
+    manifest = {"version": MANIFEST_VERSION, "page_size": page_size, "padding": padding, "bundles": {}}
+    written = []
+    kept_files = set()
+
+    for name, paths in sorted(collect_bundles(project_dir, everything).items()):
+        images = []
+        for path in paths:
+            with Image.open(project_dir / path[len("res://"):]) as img:
+                images.append(img.convert("RGBA"))
+        placements, page_sizes = pack_shelves([image.size for image in images], page_size, padding)
+
+        pages = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in page_sizes]
+        sprites = {}
+        for path, image, (page, x, y) in zip(paths, images, placements):
+            pages[page].paste(image, (x, y))
+            sprites[path] = [page, x, y, image.width, image.height]
+
+        bundle = {
+            "depends": [] if name == SHARED_BUNDLE else [SHARED_BUNDLE],
+            "pages": [],
+            "sprites": sprites,
+            "source_bytes": sum((project_dir / path[len("res://"):]).stat().st_size for path in paths)
+        }
+        for index, page in enumerate(pages):
+            page_file = output_dir / name / f"page_{index}.png"
+            data = png_bytes(page)
+            if write_if_changed(page_file, data):
+                written.append(page_file)
+            kept_files.add(page_file)
+            bundle["pages"].append({"file": f"res://sprites/{BUNDLE_DIR_NAME}/{name}/{page_file.name}",
+                                    "size": list(page.size), "bytes": len(data)})
+        bundle["bytes"] = sum(page["bytes"] for page in bundle["pages"])
+        manifest["bundles"][name] = bundle
+
+    # Pages left over from bundles or page counts that no longer exist
+    for stale in sorted(output_dir.glob("*/page_*.png")):
+        if stale not in kept_files:
+            stale.unlink()
+            Path(f"{stale}.import").unlink(missing_ok=True)
+            written.append(stale)
+    for directory in output_dir.glob("*/"):
+        if directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+
+    if write_if_changed(output_dir / MANIFEST_FILE, (json.dumps(manifest, indent=2) + "\n").encode("utf-8")):
+        written.append(output_dir / MANIFEST_FILE)
+    return manifest, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack sprites into a shared bundle and one bundle per era")
+    parser.add_argument("--project", default=str(PROJECT_DIR), help="Godot project directory")
+    parser.add_argument("--all", action="store_true", help="Bundle every atlas sprite, not just the ones exports keep")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Largest atlas page side in pixels")
+    parser.add_argument("--padding", type=int, default=DEFAULT_PADDING, help="Gutter around each sprite in pixels")
+    args = parser.parse_args()
+
+    manifest, written = build_bundles(args.project, args.all, args.page_size, args.padding)
+    print(f"📦 {len(manifest['bundles'])} bundles, {len(written)} files updated")
+    for name, bundle in manifest["bundles"].items():
+        depends = f" (needs {', '.join(bundle['depends'])})" if bundle["depends"] else ""
+        sizes = ", ".join(f"{page['size'][0]}x{page['size'][1]}" for page in bundle["pages"])
+        print(f"   - {name}: {len(bundle['sprites'])} sprites on {len(bundle['pages'])} pages ({sizes}), "
+              f"{bundle['bytes'] / 1024:.1f} KiB from {bundle['source_bytes'] / 1024:.1f} KiB{depends}")
+    print(f"✅ Manifest at {Path(args.project) / 'sprites' / BUNDLE_DIR_NAME / MANIFEST_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
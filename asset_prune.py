@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Export Asset Pruning
+Works out which sprites the exported game can actually load and marks the
+rest (with their .import files) for exclusion, as a Godot export filter and
+a size report by sprite atlas category and era.
+
+project_graph.py resolves a format string such as
+"res://sprites/%s/unit_%s.png" to every file it could match. Here each
+placeholder is narrowed to the values the code passes it: string literals
+at the call sites of the enclosing function, and the eras listed in
+data/civilizations.json for arguments named era.
+"""
+
+import argparse
+import fnmatch
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from project_graph import FORMAT_PATTERN, PROJECT_DIR, ProjectGraph
+
+SPRITE_ATLAS = "sprites/sprite_atlas.json"
+CIVILIZATIONS_FILE = "data/civilizations.json"
+PRESETS_FILE = "export_presets.cfg"
+TEXTURE_SUFFIXES = (".png", ".svg", ".webp")
+
+# Kept whatever the graph says: baked TileMapLayer scenes load the world
+# tileset through paths WorldGenerator computes at run time
+KEEP_PATTERNS = ["res://sprites/tilesets/*"]
+
+# Written by asset_bundles.py
+BUNDLE_MANIFEST = "res://sprites/bundles/manifest.json"
+BUNDLE_PAGES = "res://sprites/bundles/"
+
+FUNC_PATTERN = re.compile(r"^\s*(?:static\s+)?func\s+(\w+)\s*\(([^)]*)\)")
+STRING_LITERAL = re.compile(r"^\"((?:[^\"\\]|\\.)*)\"$|^'((?:[^'\\]|\\.)*)'$")
+
+
+def split_arguments(text):
+    """Split an argument list at its top-level commas"""
+    arguments = []
+    depth = 0
+    quote = None
+    current = ""
+    for char in text:
+        if quote:
+            quote = None if char == quote and not current.endswith("\\") else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            arguments.append(current.strip())
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        arguments.append(current.strip())
+    return arguments
+
+
+def call_arguments(text, start):
+    """Arguments of the call whose opening bracket is at start"""
+    depth = 0
+    for position in range(start, len(text)):
+        if text[position] in "([":
+            depth += 1
+        elif text[position] in ")]":
+            depth -= 1
+            if depth == 0:
+                return split_arguments(text[start + 1:position])
+    return []
+
+
+def literal_value(expression):
+    match = STRING_LITERAL.match(expression.strip())
+    if match is None:
+        return None
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def civilization_eras(project_dir=PROJECT_DIR):
+    """Eras a civilization can be in, from the civilizations data file"""
+    with open(Path(project_dir) / CIVILIZATIONS_FILE) as f:
+        civilizations = json.load(f)
+    return sorted(set(civilizations) | {civ.get("era", name) for name, civ in civilizations.items()})
+
+
+class ArgumentTracer:
+    """Narrows the placeholders of format string references to the values the scripts pass them"""
+
+    def __init__(self, graph, scripts, data_bindings):
+        self.graph = graph
+        self.data_bindings = data_bindings
+        self.texts = {path: (graph.project_dir / path[len("res://"):]).read_text(encoding="utf-8")
+                      for path in scripts}
+
+    def format_arguments(self, reference):
+        """Expressions filling each placeholder, from the % operator after the string"""
+        lines = self.texts[reference.source].splitlines()
+        line = lines[reference.line - 1]
+        for quote in "\"'":
+            literal = quote + reference.target + quote
+            if literal in line:
+                rest = line[line.index(literal) + len(literal):].lstrip()
+                break
+        else:
+            return None
+        if not rest.startswith("%"):
+            return None
+        rest = rest[1:].lstrip()
+        if rest.startswith("["):
+            return call_arguments(rest, 0)
+        match = re.match(r"[\w.]+(?:\([^)]*\))?", rest)
+        return [match.group(0)] if match else None
+
+    def enclosing_function(self, reference):
+        """(name, parameter names) of the function a reference sits in, or None at class level"""
+        lines = self.texts[reference.source].splitlines()
+        for line in reversed(lines[:reference.line]):
+            match = FUNC_PATTERN.match(line)
+            if match:
+                parameters = [re.split(r"[:=]", parameter)[0].strip()
+                              for parameter in match.group(2).split(",") if parameter.strip()]
+                return match.group(1), parameters
+        return None
+
+    def call_sites(self, function):
+        """Argument lists of every call to function in the reachable scripts"""
+        calls = []
+        pattern = re.compile(r"(?<!func )\b%s\s*\(" % re.escape(function))
+        for text in self.texts.values():
+            for match in pattern.finditer(text):
+                calls.append(call_arguments(text, match.end() - 1))
+        return calls
+
+    def values(self, expression, function=None, parameters=()):
+        """Strings an expression can hold, or None when they can't be worked out"""
+        literal = literal_value(expression)
+        if literal is not None:
+            return {literal}
+        if expression in parameters:
+            index = parameters.index(expression)
+            found = set()
+            for arguments in self.call_sites(function):
+                if index >= len(arguments):
+                    return None
+                value = self.values(arguments[index])
+                if value is None:
+                    return None
+                found |= value
+            # A function nothing calls loads nothing
+            return found
+        name = expression.rsplit(".", 1)[-1]
+        if name in self.data_bindings:
+            return set(self.data_bindings[name])
+        return None
+
+    def narrowed_pattern(self, reference):
+        """Regex for the paths a format string reference can really produce"""
+        arguments = self.format_arguments(reference)
+        placeholders = [match for match in FORMAT_PATTERN.finditer(reference.target) if match.group(1) != "%"]
+        if arguments is None or len(arguments) != len(placeholders):
+            return reference.pattern
+        function, parameters = self.enclosing_function(reference) or (None, [])
+
+        parts = []
+        position = 0
+        for match, argument in zip(placeholders, arguments):
+            parts.append(re.escape(reference.target[position:match.start()]).replace("%%", "%"))
+            values = self.values(argument, function, parameters)
+            if values is None:
+                parts.append(r"-?\d+" if match.group(1)[-1] in "di" else "[^/]+")
+            else:
+                parts.append("(?:%s)" % "|".join(re.escape(value) for value in sorted(values)) if values else "(?!)")
+            position = match.end()
+        parts.append(re.escape(reference.target[position:]).replace("%%", "%"))
+        return re.compile("".join(parts) + "$")
+
+
+def load_sprite_atlas(project_dir=PROJECT_DIR):
+    """res:// path to (category, era) for every sprite the atlas lists"""
+    with open(Path(project_dir) / SPRITE_ATLAS) as f:
+        atlas = json.load(f)
+    sprites = {}
+    for category, entries in atlas.items():
+        groups = entries.items() if isinstance(entries, dict) else [(None, entries)]
+        for era, sprites_in_group in groups:
+            for sprite in sprites_in_group:
+                sprites["res://sprites/" + sprite["file"]] = (category, era)
+    return sprites
+
+
+def prune(project_dir=PROJECT_DIR):
+    """(graph, reachable set, excluded sprite paths) after narrowing every format string"""
+    graph = ProjectGraph(project_dir)
+    reachable = graph.reachable()
+    scripts = sorted(path for path in reachable if path.endswith(".gd"))
+    tracer = ArgumentTracer(graph, scripts, {"era": civilization_eras(project_dir)})
+    for reference in graph.references:
+        if reference.is_pattern and reference.source in tracer.texts:
+            reference.pattern = tracer.narrowed_pattern(reference)
+            reference.targets = graph.resolve(reference)
+        elif reference.source == BUNDLE_MANIFEST:
+            # The manifest loads its pages; the sprites it lists are only keys,
+            # or bundling a sprite once would keep it from ever being pruned
+            reference.targets = [path for path in reference.targets if path.startswith(BUNDLE_PAGES)]
+    graph.link()
+    reachable = graph.reachable()
+
+    excluded = []
+    for path in sorted(graph.files):
+        if not path.endswith(TEXTURE_SUFFIXES) or not path.startswith("res://sprites/") or path in reachable:
+            continue
+        if any(fnmatch.fnmatch(path, pattern) for pattern in KEEP_PATTERNS):
+            continue
+        excluded.append(path)
+    return graph, reachable, excluded
+
+
+def export_filter(graph, excluded):
+    """Godot exclude_filter entries: a dir/* glob where a whole directory goes, else each file and its .import"""
+    excluded = set(excluded)
+    by_directory = defaultdict(list)
+    for path in graph.files:
+        by_directory[path.rsplit("/", 1)[0]].append(path)
+
+    entries = []
+    for directory, paths in sorted(by_directory.items()):
+        textures = [path for path in paths if path.endswith(TEXTURE_SUFFIXES)]
+        dropped = [path for path in textures if path in excluded]
+        if not dropped:
+            continue
+        others = [path for path in paths if path not in excluded and not
+                  (path.endswith(".import") and path[:-len(".import")] in excluded)]
+        if not others:
+            entries.append(directory[len("res://"):] + "/*")
+            continue
+        for path in sorted(dropped):
+            entries.append(path[len("res://"):])
+            if path + ".import" in graph.files:
+                entries.append(path[len("res://"):] + ".import")
+    return entries
+
+
+def size_report(graph, excluded, atlas):
+    """Rows of {category, era, kept, excluded, kept_bytes, excluded_bytes}, sidecars counted with their sprite"""
+    excluded = set(excluded)
+    rows = {}
+    sprites = sorted(path for path in graph.files
+                     if path.startswith("res://sprites/") and path.endswith(TEXTURE_SUFFIXES))
+    for path in sprites:
+        category, era = atlas.get(path, ("unlisted", None))
+        row = rows.setdefault((category, era or "-"), {"category": category, "era": era or "-", "kept": 0,
+                                                       "excluded": 0, "kept_bytes": 0, "excluded_bytes": 0})
+        size = graph.files[path] + graph.files.get(path + ".import", 0)
+        state = "excluded" if path in excluded else "kept"
+        row[state] += 1
+        row[state + "_bytes"] += size
+    return [rows[key] for key in sorted(rows)]
+
+
+def apply_to_presets(presets_file, entries):
+    """Set exclude_filter in every preset of an export_presets.cfg; returns how many were set"""
+    text = Path(presets_file).read_text()
+    value = 'exclude_filter="%s"' % ", ".join(entries)
+    text, count = re.subn(r'^exclude_filter=".*"$', lambda match: value, text, flags=re.MULTILINE)
+    Path(presets_file).write_text(text)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exclude sprites the game never loads from exports")
+    parser.add_argument("--project", default=str(PROJECT_DIR), help="Godot project directory")
+    parser.add_argument("-o", "--output", help="Write the export filter, one entry per line, to this file")
+    parser.add_argument("--json", help="Write the exclusions and size report to this file")
+    parser.add_argument("--apply", action="store_true", help=f"Set exclude_filter in the project's {PRESETS_FILE}")
+    args = parser.parse_args()
+
+    graph, _, excluded = prune(args.project)
+    atlas = load_sprite_atlas(args.project)
+    rows = size_report(graph, excluded, atlas)
+    entries = export_filter(graph, excluded)
+
+    kept = sum(row["kept"] for row in rows)
+    kept_bytes = sum(row["kept_bytes"] for row in rows)
+    excluded_bytes = sum(row["excluded_bytes"] for row in rows)
+    print(f"🧹 {len(excluded)} of {kept + len(excluded)} sprites excluded, "
+          f"{excluded_bytes / 1024:.0f} KiB of {(kept_bytes + excluded_bytes) / 1024:.0f} KiB")
+    print(f"   {'category':<12}{'era':<13}{'kept':>5}{'excluded':>10}{'KiB kept':>10}{'KiB cut':>9}")
+    for row in rows:
+        print(f"   {row['category']:<12}{row['era']:<13}{row['kept']:>5}{row['excluded']:>10}"
+              f"{row['kept_bytes'] / 1024:>10.1f}{row['excluded_bytes'] / 1024:>9.1f}")
+
+    print(f"📦 Export filter ({len(entries)} entries):")
+    print(f'   exclude_filter="{", ".join(entries)}"')
+
+    if args.output:
+        Path(args.output).write_text("\n".join(entries) + "\n")
+        print(f"✅ Filter written to {args.output}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"excluded": excluded, "filter": entries, "sizes": rows}, f, indent=2)
+        print(f"✅ Report written to {args.json}")
+    if args.apply:
+        presets_file = Path(args.project) / PRESETS_FILE
+        if not presets_file.exists():
+            print(f"❌ No {presets_file}; add an export preset in the Godot editor first")
+            return 1
+        print(f"✅ exclude_filter set in {apply_to_presets(presets_file, entries)} presets of {presets_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Chunk Texture Baker
+Composites terrain tiles and static vegetation of a baked world into one
+texture per chunk, so the game draws one sprite per chunk instead of one
+TerrainTile node (plus vegetation children) per tile
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from world_baker import TERRAIN_TYPES, VEGETATION_TYPES
+from world_format import open_world
+
+DEFAULT_SPRITE_DIR = "oneiric-parallax/sprites"
+DEFAULT_CHUNK_SIZE = 16
+TILE_SIZE = 32
+
+# TerrainTile.setup_vegetation draws vegetation at 0.8 scale, up to 8 px off centre
+VEGETATION_SCALE = 0.8
+VEGETATION_JITTER = 8
+
+
+def load_sprite(path, size=None):
+    """Load a sprite as a float32 RGBA array, optionally resized with nearest filtering"""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        if size is not None and img.size != size:
+            img = img.resize(size, Image.NEAREST)
+        return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def load_terrain_atlas(sprite_dir):
+    """Stack terrain tiles in TERRAIN_TYPES order, falling back to grass like set_terrain_sprite"""
+    terrain_dir = Path(sprite_dir) / "terrain"
+    fallback = load_sprite(terrain_dir / "grass.png", (TILE_SIZE, TILE_SIZE))
+    tiles = []
+    for terrain in TERRAIN_TYPES:
+        path = terrain_dir / f"{terrain}.png"
+        tiles.append(load_sprite(path, (TILE_SIZE, TILE_SIZE)) if path.exists() else fallback)
+    return np.stack(tiles)
+
+
+def load_vegetation_sprites(sprite_dir):
+    """Vegetation sprites in VEGETATION_TYPES order, pre-scaled like the game draws them"""
+    vegetation_dir = Path(sprite_dir) / "vegetation"
+    sprites = []
+    for vegetation in VEGETATION_TYPES:
+        path = vegetation_dir / f"{vegetation}.png"
+        if path.exists():
+            with Image.open(path) as img:
+                size = (round(img.width * VEGETATION_SCALE), round(img.height * VEGETATION_SCALE))
+            sprites.append(load_sprite(path, size))
+        else:
+            sprites.append(None)
+    return sprites
+
+
+def vegetation_offsets(x, y, bit, seed):
+    """Deterministic per-tile pixel offsets in [-VEGETATION_JITTER, VEGETATION_JITTER]
+
+    A hash of the tile coordinates rather than a random stream, so a tile
+    gets the same offset whichever chunk renders it.
+    """
+    h = (x.astype(np.uint32) * np.uint32(73856093)) ^ (y.astype(np.uint32) * np.uint32(19349663))
+    h ^= np.uint32((bit * 83492791 + seed) & 0xFFFFFFFF)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0x5BD1E995)
+    h ^= h >> np.uint32(15)
+    span = 2 * VEGETATION_JITTER + 1
+    dx = (h % np.uint32(span)).astype(np.int64) - VEGETATION_JITTER
+    dy = ((h >> np.uint32(16)) % np.uint32(span)).astype(np.int64) - VEGETATION_JITTER
+    return dx, dy
+
+
+def composite_over(canvas, sprite, left, top):
+    """Alpha-composite one sprite onto a float RGBA canvas at many positions at once
+
+    Positions must not overlap each other; pixels outside the canvas are clipped.
+    """
+    if len(left) == 0:
+        return
+    height, width = sprite.shape[:2]
+    rows = top[:, None, None] + np.arange(height)[None, :, None]
+    cols = left[:, None, None] + np.arange(width)[None, None, :]
+    rows, cols = np.broadcast_arrays(rows, cols)
+    inside = (rows >= 0) & (rows < canvas.shape[0]) & (cols >= 0) & (cols < canvas.shape[1])
+
+    source = np.broadcast_to(sprite, rows.shape + (4,))[inside]
+    rows = rows[inside]
+    cols = cols[inside]
+    dest = canvas[rows, cols]
+
+    src_alpha = source[:, 3:]
+    dst_alpha = dest[:, 3:] * (1.0 - src_alpha)
+    out_alpha = src_alpha + dst_alpha
+    out_rgb = (source[:, :3] * src_alpha + dest[:, :3] * dst_alpha) / np.maximum(out_alpha, 1e-6)
+    canvas[rows, cols] = np.concatenate([out_rgb, out_alpha], axis=1)
+
+
+def render_chunk(world, chunk_x, chunk_y, chunk_size, terrain_atlas, vegetation_sprites, seed=0):
+    """Render one chunk as a float RGBA array (rows are y, columns are x)"""
+    x0, y0 = chunk_x * chunk_size, chunk_y * chunk_size
+    x1, y1 = min(x0 + chunk_size, world.width), min(y0 + chunk_size, world.height)
+
+    # Terrain: gather tiles from the atlas and lay them out as one image
+    terrain = np.asarray(world["terrain"][x0:x1, y0:y1])
+    tiles = terrain_atlas[terrain]
+    tiles_x, tiles_y = terrain.shape
+    canvas = tiles.transpose(1, 2, 0, 3, 4).reshape(tiles_y * TILE_SIZE, tiles_x * TILE_SIZE, 4).copy()
+
+    # Vegetation: include a one-tile halo so sprites hanging over the chunk
+    # edge from neighbouring tiles are drawn too
+    hx0, hy0 = max(x0 - 1, 0), max(y0 - 1, 0)
+    hx1, hy1 = min(x1 + 1, world.width), min(y1 + 1, world.height)
+    vegetation = np.asarray(world["vegetation"][hx0:hx1, hy0:hy1])
+
+    for bit, sprite in enumerate(vegetation_sprites):
+        if sprite is None:
+            continue
+        local_x, local_y = np.nonzero(vegetation & (1 << bit))
+        if len(local_x) == 0:
+            continue
+        tile_x = local_x + hx0
+        tile_y = local_y + hy0
+        dx, dy = vegetation_offsets(tile_x, tile_y, bit, seed)
+        centre_x = (tile_x - x0) * TILE_SIZE + TILE_SIZE // 2 + dx
+        centre_y = (tile_y - y0) * TILE_SIZE + TILE_SIZE // 2 + dy
+        left = centre_x - sprite.shape[1] // 2
+        top = centre_y - sprite.shape[0] // 2
+
+        # Sprites two tiles apart can't overlap, so each parity class
+        # composites in a single vectorized pass
+        for parity_x in (0, 1):
+            for parity_y in (0, 1):
+                group = ((tile_x & 1) == parity_x) & ((tile_y & 1) == parity_y)
+                composite_over(canvas, sprite, left[group], top[group])
+
+    return canvas
+
+
+def bake_chunks(world_path, output_dir, sprite_dir=DEFAULT_SPRITE_DIR, chunk_size=DEFAULT_CHUNK_SIZE,
+                res_root="oneiric-parallax"):
+    """Render every chunk of a baked world and write chunk PNGs plus chunks.json"""
+    world = open_world(world_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    terrain_atlas = load_terrain_atlas(sprite_dir)
+    vegetation_sprites = load_vegetation_sprites(sprite_dir)
+    seed = int(world.meta.get("params", {}).get("seed", 0))
+
+    chunks_x = -(-world.width // chunk_size)
+    chunks_y = -(-world.height // chunk_size)
+
+    try:
+        res_dir = "res://" + output_dir.resolve().relative_to(Path(res_root).resolve()).as_posix()
+    except ValueError:
+        res_dir = output_dir.as_posix()
+
+    chunks = []
+    for chunk_x in range(chunks_x):
+        for chunk_y in range(chunks_y):
+            canvas = render_chunk(world, chunk_x, chunk_y, chunk_size, terrain_atlas, vegetation_sprites, seed)
+            pixels = np.clip(canvas * 255.0 + 0.5, 0, 255).astype(np.uint8)
+            file_name = f"chunk_{chunk_x}_{chunk_y}.png"
+            Image.fromarray(pixels, "RGBA").save(output_dir / file_name)
+            chunks.append({
+                "x": chunk_x,
+                "y": chunk_y,
+                "file": f"{res_dir}/{file_name}",
+                # Top-left corner in world pixels; TerrainTile sprites are centred on x * 32
+                "origin": [chunk_x * chunk_size * TILE_SIZE - TILE_SIZE // 2,
+                           chunk_y * chunk_size * TILE_SIZE - TILE_SIZE // 2]
+            })
+
+    index = {
+        "world": Path(world_path).name,
+        "width": world.width,
+        "height": world.height,
+        "tile_size": TILE_SIZE,
+        "chunk_size": chunk_size,
+        "chunks_x": chunks_x,
+        "chunks_y": chunks_y,
+        "chunks": chunks
+    }
+    with open(output_dir / "chunks.json", "w") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake chunk textures for a baked world")
+    parser.add_argument("world", help="Baked .world file")
+    parser.add_argument("-o", "--output", help="Output directory (default: sprites/chunks/<world name>)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Tiles per chunk side")
+    parser.add_argument("--sprites", default=DEFAULT_SPRITE_DIR, help="Sprite directory")
+    args = parser.parse_args()
+
+    output = args.output or Path(args.sprites) / "chunks" / Path(args.world).stem
+    print(f"🧱 Baking {args.chunk_size}x{args.chunk_size}-tile chunks...")
+    start = time.perf_counter()
+    index = bake_chunks(args.world, output, args.sprites, args.chunk_size)
+    print(f"✅ {len(index['chunks'])} chunks written to {output} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Chunk Store
+On-disk, memory-mapped storage for worlds too large to hold in RAM, written
+chunk by chunk by world_baker.py --chunked and read back one chunk at a time
+
+Layout of a store directory:
+    index.json      size, chunk size, layer dtypes, params, stats and which
+                    chunks have been baked
+    <layer>.npy     one array per layer of shape
+                    (chunks_x, chunks_y, chunk_size, chunk_size), so every
+                    chunk is one contiguous block on disk
+
+Chunks on the right and bottom edges are padded to the full chunk size;
+chunk() and region() crop the padding away. Tiles are indexed [x, y] like
+WorldGenerator.world_data.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+STORE_FORMAT = "opchunks"
+STORE_VERSION = 1
+INDEX_FILE = "index.json"
+
+
+class ChunkStoreError(Exception):
+    pass
+
+
+class ChunkStore:
+    """A chunked world on disk; layers are memory-mapped, so only touched chunks are paged in"""
+
+    def __init__(self, path, mode="r"):
+        self.path = Path(path)
+        self.mode = mode
+        index_file = self.path / INDEX_FILE
+        if not index_file.exists():
+            raise ChunkStoreError(f"{self.path} is not a chunk store")
+        with open(index_file) as f:
+            self.index = json.load(f)
+        if self.index.get("format") != STORE_FORMAT:
+            raise ChunkStoreError(f"{self.path} is not a chunk store")
+        if self.index["version"] > STORE_VERSION:
+            raise ChunkStoreError(f"{self.path} is store version {self.index['version']}, "
+                                  f"this reader supports up to {STORE_VERSION}")
+
+        self.width = self.index["width"]
+        self.height = self.index["height"]
+        self.chunk_size = self.index["chunk_size"]
+        self.chunks_x = self.index["chunks_x"]
+        self.chunks_y = self.index["chunks_y"]
+        self.meta = self.index["meta"]
+        self.baked = np.array(self.index["baked"], dtype=bool).reshape(self.chunks_x, self.chunks_y)
+        self._layers = {}
+
+    @classmethod
+    def create(cls, path, width, height, chunk_size, layer_dtypes, meta=None):
+        """Create an empty store; layer files are allocated sparsely, not written out"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        chunks_x = -(-width // chunk_size)
+        chunks_y = -(-height // chunk_size)
+
+        for name, dtype in layer_dtypes.items():
+            np.lib.format.open_memmap(path / f"{name}.npy", mode="w+", dtype=np.dtype(dtype).newbyteorder("<"),
+                                      shape=(chunks_x, chunks_y, chunk_size, chunk_size))
+
+        index = {
+            "format": STORE_FORMAT,
+            "version": STORE_VERSION,
+            "width": width,
+            "height": height,
+            "chunk_size": chunk_size,
+            "chunks_x": chunks_x,
+            "chunks_y": chunks_y,
+            "layers": {name: np.dtype(dtype).newbyteorder("<").str for name, dtype in layer_dtypes.items()},
+            "meta": meta or {},
+            "baked": [False] * (chunks_x * chunks_y)
+        }
+        with open(path / INDEX_FILE, "w") as f:
+            json.dump(index, f, indent=2)
+        return cls(path, "r+")
+
+    def layer_names(self):
+        return list(self.index["layers"])
+
+    def layer(self, name):
+        """Memory-mapped (chunks_x, chunks_y, chunk_size, chunk_size) array for a layer"""
+        if name not in self._layers:
+            if name not in self.index["layers"]:
+                raise KeyError(name)
+            self._layers[name] = np.load(self.path / f"{name}.npy", mmap_mode=self.mode)
+        return self._layers[name]
+
+    def chunk_bounds(self, chunk_x, chunk_y):
+        """Tile bounds (x0, y0, x1, y1) of a chunk, clipped to the world"""
+        x0, y0 = chunk_x * self.chunk_size, chunk_y * self.chunk_size
+        return x0, y0, min(x0 + self.chunk_size, self.width), min(y0 + self.chunk_size, self.height)
+
+    def chunk(self, chunk_x, chunk_y, layers=None):
+        """Layers of one chunk as name -> array, without padding"""
+        x0, y0, x1, y1 = self.chunk_bounds(chunk_x, chunk_y)
+        return {name: self.layer(name)[chunk_x, chunk_y, :x1 - x0, :y1 - y0]
+                for name in layers or self.layer_names()}
+
+    def write_chunk(self, chunk_x, chunk_y, layers):
+        """Write a chunk's layers (name -> array no larger than the chunk)"""
+        for name, array in layers.items():
+            width, height = array.shape
+            self.layer(name)[chunk_x, chunk_y, :width, :height] = array
+            self.layer(name).flush()
+
+    def region(self, name, x0, y0, x1, y1):
+        """One layer over tiles [x0, x1) x [y0, y1), read from the chunks it covers"""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        layer = self.layer(name)
+        out = np.empty((x1 - x0, y1 - y0), dtype=layer.dtype)
+        size = self.chunk_size
+        for chunk_x in range(x0 // size, -(-x1 // size)):
+            for chunk_y in range(y0 // size, -(-y1 // size)):
+                cx0, cy0 = max(x0, chunk_x * size), max(y0, chunk_y * size)
+                cx1, cy1 = min(x1, (chunk_x + 1) * size), min(y1, (chunk_y + 1) * size)
+                out[cx0 - x0:cx1 - x0, cy0 - y0:cy1 - y0] = layer[chunk_x, chunk_y,
+                                                                  cx0 - chunk_x * size:cx1 - chunk_x * size,
+                                                                  cy0 - chunk_y * size:cy1 - chunk_y * size]
+        return out
+
+    def mark_baked(self, chunk_x, chunk_y):
+        self.baked[chunk_x, chunk_y] = True
+
+    def save_index(self):
+        self.index["meta"] = self.meta
+        self.index["baked"] = self.baked.ravel().tolist()
+        index_file = self.path / INDEX_FILE
+        temporary = index_file.with_suffix(".tmp")
+        with open(temporary, "w") as f:
+            json.dump(self.index, f, indent=2)
+        temporary.replace(index_file)
+
+
+def open_store(path, mode="r"):
+    return ChunkStore(path, mode)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python chunk_store.py <store directory> [chunk_x chunk_y]")
+        return 1
+
+    store = open_store(sys.argv[1])
+    print(f"🧊 {store.path} (store v{store.index['version']})")
+    print(f"   - Size: {store.width}x{store.height} in {store.chunks_x}x{store.chunks_y} "
+          f"chunks of {store.chunk_size}")
+    print(f"   - Baked: {int(store.baked.sum())}/{store.baked.size} chunks")
+    print(f"   - Layers: {', '.join(f'{name} ({dtype})' for name, dtype in store.index['layers'].items())}")
+
+    if len(sys.argv) >= 4:
+        chunk_x, chunk_y = int(sys.argv[2]), int(sys.argv[3])
+        for name, array in store.chunk(chunk_x, chunk_y).items():
+            print(f"   - Chunk {chunk_x},{chunk_y} {name}: min {array.min()}, max {array.max()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
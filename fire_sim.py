@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Fire Spread Simulator
+Reproduces FireSystem.gd / FireSystemSimple.gd over a baked world and runs
+seeded Monte Carlo trials for balancing spread_chance and extinguish_chance
+
+Two modes:
+    ca      NumPy cellular automaton stepping every fire each dt, like
+            update_fires does each frame
+    events  Event-driven: each fire's next spread and extinguish times are
+            drawn from the matching exponential distributions and processed
+            from a heap, so sparse fires on huge maps over hours of game time
+            cost only the events that actually happen
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from world_baker import fire_layers
+from world_format import open_world
+
+# Matches the tunables at the top of each fire system script
+FIRE_SYSTEMS = {
+    # Used by GameManager; fires also die once they reach max_age
+    "simple": {"spread_chance": 0.2, "extinguish_chance": 0.05, "max_age": 15.0},
+    "full": {"spread_chance": 0.3, "extinguish_chance": 0.1, "max_age": float("inf")}
+}
+
+# get_spreadable_positions: the 8 tiles around a fire
+SPREAD_OFFSETS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)])
+
+DEFAULT_TRIALS = 1000
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_DT = 0.1
+DEFAULT_MAX_TIME = 600.0
+MODES = ["ca", "events"]
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def world_fire_layers(world):
+    """Flammability and fuel load layers, computed for worlds baked before they were stored"""
+    if "flammability" in world and "fuel_load" in world:
+        return {"flammability": world["flammability"], "fuel_load": world["fuel_load"]}
+    return fire_layers(world["terrain"], world["vegetation"])
+
+
+def random_flammable_tiles(world, count, rng, attempts=10000):
+    """Flat indices of random flammable tiles, sampled without scanning the whole map"""
+    flammability = world_fire_layers(world)["flammability"]
+    tiles = []
+    for _ in range(attempts):
+        if len(tiles) == count:
+            break
+        x, y = int(rng.integers(world.width)), int(rng.integers(world.height))
+        if flammability[x, y]:
+            tiles.append(x * world.height + y)
+    if len(tiles) < count:
+        raise ValueError(f"Could not find {count} flammable tiles in {world.path}")
+    return np.array(tiles, dtype=np.int64)
+
+
+def simulate_batch(flammable, ignitions, rng, spread_chance, extinguish_chance, max_age,
+                   dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME, fuel_load=None):
+    """Run one batch of independent trials side by side
+
+    Trials share one flat occupancy grid of shape (trials, width, height),
+    but only burning tiles are ever touched, so a step costs O(active fires).
+    Each step does what FireSystem.update_fires does for one frame of
+    length dt: age every fire, roll a spread attempt to a random valid
+    neighbour (in bounds and not already burning) that catches only if
+    flammable, then roll extinguishing.
+
+    Returns per-trial burned tile counts, fuel burned (sum of fuel_load
+    over burned tiles), peak simultaneous fires and the game time at which
+    the last fire went out (max_time if it never did).
+    """
+    width, height = flammable.shape
+    tiles = width * height
+    ignitions = np.asarray(ignitions).reshape(len(ignitions), -1)
+    trials = len(ignitions)
+    flammable = flammable.ravel()
+
+    burning = np.zeros(trials * tiles, dtype=bool)
+    burned = np.zeros(trials * tiles, dtype=bool)
+    fires = np.unique(np.arange(trials)[:, None] * tiles + ignitions)
+    ages = np.zeros(fires.size)
+    burning[fires] = True
+    burned[fires] = True
+
+    peak = np.bincount(fires // tiles, minlength=trials)
+    duration = np.full(trials, max_time)
+    elapsed = 0.0
+
+    while fires.size and elapsed < max_time:
+        elapsed += dt
+        ages += dt
+
+        # Spread attempts
+        attempting = fires[rng.random(fires.size) < spread_chance * dt]
+        if attempting.size:
+            trial, tile = np.divmod(attempting, tiles)
+            x, y = np.divmod(tile, height)
+            nx = x[:, None] + SPREAD_OFFSETS[:, 0]
+            ny = y[:, None] + SPREAD_OFFSETS[:, 1]
+            inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            neighbours = trial[:, None] * tiles + np.clip(nx, 0, width - 1) * height + np.clip(ny, 0, height - 1)
+            valid = inside & ~burning[neighbours]
+
+            # Pick uniformly among the valid neighbours of each fire
+            counts = valid.sum(axis=1)
+            spreads = counts > 0
+            pick = (rng.random(attempting.size) * counts).astype(np.int64)
+            chosen = np.argmax(np.cumsum(valid, axis=1) > pick[:, None], axis=1)
+            targets = neighbours[np.arange(attempting.size), chosen][spreads]
+            new_fires = np.unique(targets[flammable[targets % tiles]])
+        else:
+            new_fires = np.empty(0, dtype=np.int64)
+
+        # Extinguishing
+        out = (rng.random(fires.size) < extinguish_chance * dt) | (ages > max_age)
+        burning[fires[out]] = False
+        fires = fires[~out]
+        ages = ages[~out]
+
+        if new_fires.size:
+            new_fires = new_fires[~burning[new_fires]]
+            burning[new_fires] = True
+            burned[new_fires] = True
+            fires = np.concatenate([fires, new_fires])
+            ages = np.concatenate([ages, np.zeros(new_fires.size)])
+
+        active = np.bincount(fires // tiles, minlength=trials)
+        np.maximum(peak, active, out=peak)
+        finished = (active == 0) & (duration == max_time)
+        duration[finished] = elapsed
+
+    burned = burned.reshape(trials, tiles)
+    burned_fuel = burned @ np.asarray(fuel_load, dtype=np.int64).ravel() if fuel_load is not None else np.zeros(trials)
+    return burned.sum(axis=1), burned_fuel, peak, duration
+
+
+def simulate_events(world, ignitions, rng, spread_chance, extinguish_chance, max_age,
+                    max_time=DEFAULT_MAX_TIME):
+    """Run one trial event by event
+
+    A per-frame roll of chance * delta is a Poisson process with rate
+    chance, so each fire draws its next spread time and its extinguish time
+    from exponential distributions (the latter capped at max_age) and only
+    those moments are simulated. Burning tiles live in a dict keyed by tile,
+    so checking a spread target is a lookup rather than a scan of all fires,
+    and flammability is read from the memory-mapped layers only for tiles
+    fire actually reaches.
+
+    Returns burned tile count, fuel burned, peak simultaneous fires, game
+    time at which the last fire went out (max_time if it never did) and
+    events processed.
+    """
+    width, height = world.width, world.height
+    layers = world_fire_layers(world)
+    flammability = layers["flammability"]
+    fuel_load = layers["fuel_load"]
+
+    spread_interval = 1.0 / spread_chance if spread_chance > 0 else float("inf")
+    extinguish_interval = 1.0 / extinguish_chance if extinguish_chance > 0 else float("inf")
+
+    burning = {}
+    burned = set()
+    events = []
+    next_fire_id = itertools.count()
+    sequence = itertools.count()
+
+    def ignite(tile, now):
+        fire_id = next(next_fire_id)
+        burning[tile] = fire_id
+        burned.add(tile)
+        lifetime = min(rng.exponential(extinguish_interval), max_age)
+        heapq.heappush(events, (now + lifetime, next(sequence), "extinguish", fire_id, tile))
+        heapq.heappush(events, (now + rng.exponential(spread_interval), next(sequence), "spread", fire_id, tile))
+
+    for index in ignitions:
+        tile = divmod(int(index), height)
+        if tile not in burning:
+            ignite(tile, 0.0)
+
+    peak = len(burning)
+    processed = 0
+    now = 0.0
+    while events and events[0][0] < max_time:
+        now, _, kind, fire_id, tile = heapq.heappop(events)
+        if burning.get(tile) != fire_id:
+            # The fire this event belonged to has gone out
+            continue
+        processed += 1
+
+        if kind == "extinguish":
+            del burning[tile]
+            if not burning:
+                break
+            continue
+
+        x, y = tile
+        candidates = [(x + dx, y + dy) for dx, dy in SPREAD_OFFSETS.tolist()
+                      if 0 <= x + dx < width and 0 <= y + dy < height and (x + dx, y + dy) not in burning]
+        if candidates:
+            target = candidates[int(rng.integers(len(candidates)))]
+            if flammability[target]:
+                ignite(target, now)
+                peak = max(peak, len(burning))
+        heapq.heappush(events, (now + rng.exponential(spread_interval), next(sequence), "spread", fire_id, tile))
+
+    burned_fuel = sum(int(fuel_load[tile]) for tile in burned)
+    return len(burned), burned_fuel, peak, max_time if burning else now, processed
+
+
+def _run_batch(job):
+    world_path, batch_index, batch_size, settings, seed, ignite = job
+    world = open_world(world_path)
+    rng = np.random.default_rng([seed, batch_index])
+
+    if ignite:
+        ignitions = np.tile([x * world.height + y for x, y in ignite], (batch_size, 1))
+    else:
+        # Players light fires where they will catch
+        ignitions = random_flammable_tiles(world, batch_size, rng)[:, None]
+
+    if settings.get("mode", "ca") == "events":
+        results = [simulate_events(world, trial_ignitions, rng, settings["spread_chance"],
+                                   settings["extinguish_chance"], settings["max_age"], settings["max_time"])
+                   for trial_ignitions in ignitions]
+        return tuple(np.array(column) for column in zip(*results))[:4]
+
+    layers = world_fire_layers(world)
+    return simulate_batch(np.asarray(layers["flammability"]) != 0, ignitions, rng, settings["spread_chance"],
+                          settings["extinguish_chance"], settings["max_age"], settings["dt"], settings["max_time"],
+                          layers["fuel_load"])
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=np.float64)
+    summary = {"mean": float(values.mean()), "std": float(values.std()),
+               "min": float(values.min()), "max": float(values.max())}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{percentile}"] = float(value)
+    return summary
+
+
+def run_trials(world_path, settings, trials=DEFAULT_TRIALS, seed=0, ignite=None,
+               batch_size=DEFAULT_BATCH_SIZE, pool=None):
+    """Run seeded Monte Carlo trials for one parameter set
+
+    Trials are split into fixed-size batches, each seeded by (seed, batch
+    index), so results don't depend on how many workers run them.
+    """
+    batches = -(-trials // batch_size)
+    jobs = [(world_path, index, min(batch_size, trials - index * batch_size), settings, seed, ignite)
+            for index in range(batches)]
+    results = pool.map(_run_batch, jobs) if pool else list(map(_run_batch, jobs))
+
+    burned = np.concatenate([result[0] for result in results])
+    burned_fuel = np.concatenate([result[1] for result in results])
+    peak = np.concatenate([result[2] for result in results])
+    duration = np.concatenate([result[3] for result in results])
+    histogram, edges = np.histogram(burned, bins=20)
+
+    return {
+        "settings": settings,
+        "trials": trials,
+        "burned_tiles": summarize(burned),
+        "burned_fuel": summarize(burned_fuel),
+        "peak_fires": summarize(peak),
+        "duration": summarize(duration),
+        "still_burning_fraction": float(np.mean(duration >= settings["max_time"])),
+        "burned_histogram": {"counts": histogram.tolist(), "edges": edges.tolist()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo fire spread trials over a baked world")
+    parser.add_argument("world", help="Baked .world file")
+    parser.add_argument("--mode", choices=MODES, default="ca",
+                        help="Step every fire each dt (ca) or jump between sampled events (events)")
+    parser.add_argument("--system", choices=sorted(FIRE_SYSTEMS), default="simple",
+                        help="Fire system script to start from (GameManager uses simple)")
+    parser.add_argument("--spread-chance", type=float, nargs="+", help="One or more values to sweep")
+    parser.add_argument("--extinguish-chance", type=float, nargs="+", help="One or more values to sweep")
+    parser.add_argument("--max-age", type=float, help="Seconds before a fire dies on its own")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ignite", type=int, nargs=2, metavar=("X", "Y"), action="append",
+                        help="Ignition tile, repeatable (default: a random flammable tile per trial)")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT, help="Seconds of game time per step (ca mode)")
+    parser.add_argument("--max-time", type=float, default=DEFAULT_MAX_TIME, help="Seconds of game time per trial")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--json", help="Write all results as JSON to this file")
+    args = parser.parse_args()
+
+    base = dict(FIRE_SYSTEMS[args.system])
+    if args.max_age is not None:
+        base["max_age"] = args.max_age
+    base["mode"] = args.mode
+    base["dt"] = args.dt
+    base["max_time"] = args.max_time
+
+    spread_values = args.spread_chance or [base["spread_chance"]]
+    extinguish_values = args.extinguish_chance or [base["extinguish_chance"]]
+
+    print(f"🔥 Running {args.trials} trials per setting on {args.world} ({args.mode} mode)...")
+    results = []
+    with Pool(args.workers) as pool:
+        for spread_chance, extinguish_chance in itertools.product(spread_values, extinguish_values):
+            settings = dict(base, spread_chance=spread_chance, extinguish_chance=extinguish_chance)
+            start = time.perf_counter()
+            result = run_trials(args.world, settings, args.trials, args.seed, args.ignite, pool=pool)
+            results.append(result)
+
+            burned = result["burned_tiles"]
+            print(f"   spread {spread_chance:.3f} / extinguish {extinguish_chance:.3f}: "
+                  f"burned mean {burned['mean']:.1f}, median {burned['p50']:.0f}, p95 {burned['p95']:.0f}, "
+                  f"max {burned['max']:.0f} tiles, fuel mean {result['burned_fuel']['mean']:.0f}; still burning {result['still_burning_fraction'] * 100:.1f}% "
+                  f"({time.perf_counter() - start:.2f}s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,6 +49,12 @@ func setup_managers():
 	
 	# Setup fire system
 	fire_system.setup(world_generator, world_container)
+	
+	# Spawn civilizations at baked sites
+	civilization_manager.setup(world_generator)
+	
+	# Terrain, vegetation and fire sprites; era sprites load with their first civilization
+	AssetBundles.load_bundle("shared")
 
 func setup_ui():
 	main_menu.new_game_requested.connect(_on_new_game_requested)
@@ -127,6 +133,7 @@ func _input(event):
 		if current_state == GameState.WORLD_GENERATION:
 			set_state(GameState.MAIN_MENU)
 		elif current_state == GameState.PLAYING:
+			AssetBundles.unload_era_bundles()
 			set_state(GameState.MAIN_MENU)
 
 func handle_camera_controls(event):
@@ -173,6 +180,7 @@ func handle_camera_movement(delta):
 func spawn_civilization_at(world_pos: Vector2):
 	# Create a new civilization at the specified position
 	var unit_scene = preload("res://scenes/entities/Unit.tscn")
+	AssetBundles.load_bundle("primitive")
 	
 	for i in range(3):  # Spawn 3 units
 		var unit = unit_scene.instantiate()
@@ -18,7 +18,7 @@ func setup_building():
 	
 func set_building_type(era: String, building_type: String):
 	var sprite_path = "res://sprites/%s/building_%s.png" % [era, building_type]
-	var texture = load(sprite_path)
+	var texture = AssetBundles.get_texture(sprite_path)
 	if texture:
 		sprite.texture = texture
 
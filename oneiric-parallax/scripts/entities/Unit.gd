@@ -75,7 +75,7 @@ func move_towards_target(delta):
 
 func set_sprite_for_era(era: String, unit_type: String):
 	var sprite_path = "res://sprites/%s/unit_%s.png" % [era, unit_type]
-	var texture = load(sprite_path)
+	var texture = AssetBundles.get_texture(sprite_path)
 	if texture:
 		sprite.texture = texture
 
@@ -3,13 +3,21 @@ class_name CivilizationManager
 
 var civilizations: Array[Civilization]
 var next_civ_id: int = 0
+var world_generator: WorldGenerator
+var next_spawn_site: int = 0
+
+func setup(generator: WorldGenerator):
+	world_generator = generator
 
 func spawn_initial_civilizations(container: Node2D):
-	# Spawn a few primitive civilizations
+	# Spawn a few primitive civilizations, starting again from the best site
+	next_spawn_site = 0
 	for i in range(3):
 		spawn_civilization("primitive", container)
 
 func spawn_civilization(era: String, container: Node2D):
+	# The first civilization of an era brings in that era's sprites
+	AssetBundles.load_bundle(era)
 	var civ = Civilization.new()
 	civ.id = next_civ_id
 	civ.era = era
@@ -34,6 +42,11 @@ func spawn_initial_units(civ: Civilization, container: Node2D):
 		civ.units.append(unit)
 
 func get_random_spawn_position() -> Vector2:
+	# Take the next best site baked by world_spawn.py; generated worlds have none
+	if world_generator and next_spawn_site < world_generator.baked_spawn_sites.size():
+		var site = world_generator.baked_spawn_sites[next_spawn_site]
+		next_spawn_site += 1
+		return Vector2(site[0], site[1]) * world_generator.tile_size
 	return Vector2(randf_range(100, 900), randf_range(100, 900))
 
 func _process(delta):
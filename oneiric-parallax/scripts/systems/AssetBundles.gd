@@ -0,0 +1,66 @@
+extends RefCounted
+class_name AssetBundles
+
+# Sprite bundles written by asset_bundles.py: a shared bundle plus one per
+# era, each packed onto a few atlas pages. A bundle's textures are only in
+# memory once something loads it, such as the first civilization of an era.
+const MANIFEST_PATH = "res://sprites/bundles/manifest.json"
+
+static var manifest: Dictionary = {}
+static var loaded_bundles: Dictionary = {}
+# Sprite res:// path -> AtlasTexture on its bundle's page
+static var textures: Dictionary = {}
+
+static func load_manifest() -> bool:
+	if manifest.is_empty() and FileAccess.file_exists(MANIFEST_PATH):
+		var parsed = JSON.parse_string(FileAccess.get_file_as_string(MANIFEST_PATH))
+		if parsed is Dictionary:
+			manifest = parsed
+	return not manifest.is_empty()
+
+static func load_bundle(bundle_name: String):
+	if loaded_bundles.has(bundle_name) or not load_manifest():
+		return
+	var bundle = manifest.get("bundles", {}).get(bundle_name)
+	if bundle == null:
+		# Eras with nothing to bundle have no entry; their sprites load one by one
+		return
+	loaded_bundles[bundle_name] = true
+	for dependency in bundle.get("depends", []):
+		load_bundle(dependency)
+
+	var pages = []
+	for page in bundle.get("pages", []):
+		pages.append(load(page["file"]))
+	for sprite_path in bundle.get("sprites", {}):
+		var region = bundle["sprites"][sprite_path]
+		var texture = AtlasTexture.new()
+		texture.atlas = pages[int(region[0])]
+		texture.region = Rect2(region[1], region[2], region[3], region[4])
+		textures[sprite_path] = texture
+	print("Loaded sprite bundle: ", bundle_name)
+
+static func unload_bundle(bundle_name: String) -> bool:
+	if not loaded_bundles.has(bundle_name):
+		return false
+	for other in loaded_bundles:
+		if bundle_name in manifest["bundles"][other].get("depends", []):
+			push_warning("Sprite bundle %s is still needed by %s" % [bundle_name, other])
+			return false
+	loaded_bundles.erase(bundle_name)
+	for sprite_path in manifest["bundles"][bundle_name].get("sprites", {}):
+		textures.erase(sprite_path)
+	print("Unloaded sprite bundle: ", bundle_name)
+	return true
+
+static func unload_era_bundles():
+	# Everything but the shared bundle, whose dependents are all eras
+	for bundle_name in loaded_bundles.keys():
+		if bundle_name != "shared":
+			unload_bundle(bundle_name)
+
+static func get_texture(sprite_path: String) -> Texture2D:
+	# Sprites outside the loaded bundles still load from their own files
+	if textures.has(sprite_path):
+		return textures[sprite_path]
+	return load(sprite_path)
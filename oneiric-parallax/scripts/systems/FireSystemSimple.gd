@@ -111,6 +111,11 @@ func is_position_flammable(pos: Vector2) -> bool:
 	if tile_x < 0 or tile_x >= world_generator.world_size.x or tile_y < 0 or tile_y >= world_generator.world_size.y:
 		return false
 	
+	# Baked worlds carry a precomputed flammability layer
+	var flammability = world_generator.baked_layers.get("flammability")
+	if flammability != null:
+		return flammability[tile_x * world_generator.world_size.y + tile_y] != 0
+	
 	var tile_data = world_generator.world_data[tile_x][tile_y]
 	var terrain_type = tile_data.get("terrain_type", "")
 	var vegetation = tile_data.get("vegetation", [])
@@ -154,7 +159,7 @@ class Fire:
 		fire_sprite.position = position
 		
 		# Try to load fire texture
-		var fire_texture = load("res://sprites/fire/fire_medium_frame_0.png")
+		var fire_texture = AssetBundles.get_texture("res://sprites/fire/fire_medium_frame_0.png")
 		if fire_texture:
 			fire_sprite.texture = fire_texture
 		else:
@@ -26,8 +26,37 @@ var resource_noise: FastNoiseLite
 # World data
 var world_data: Array[Array] = []
 
+# Raw layers of a baked world (name -> PackedByteArray, x-major)
+const BAKED_WORLD_MAGIC = "OPWD"
+const BAKED_WORLD_VERSION = 1
+var baked_layers: Dictionary = {}
+# Stats computed by world_baker.py, stored in the baked world header
+var baked_stats: Dictionary = {}
+# HPA* graph from world_nav.py, stored in the baked world header
+var baked_navigation: Dictionary = {}
+# Ranked [x, y, score] civilization sites from world_spawn.py, best first
+var baked_spawn_sites: Array = []
+
+# Worlds pre-baked by world_cache.py, keyed by a hash of the generation params
+const WORLD_CACHE_DIR = "res://data/worlds/cache"
+# Cached worlds baked with other placement tables are stale
+const PLACEMENT_TABLES_PATH = "res://data/placement_tables.json"
+
+# Terrain lookup table exported by world_baker.py --export-biome-lut
+const BIOME_LUT_PATH = "res://data/biome_lut.json"
+var biome_lut: Dictionary = {}
+
 func _ready():
 	setup_noise_generators()
+	load_biome_lut()
+
+func load_biome_lut():
+	if not FileAccess.file_exists(BIOME_LUT_PATH):
+		return
+	var file = FileAccess.open(BIOME_LUT_PATH, FileAccess.READ)
+	var lut = JSON.parse_string(file.get_as_text())
+	if lut is Dictionary:
+		biome_lut = lut
 
 func setup_noise_generators():
 	elevation_noise = FastNoiseLite.new()
@@ -75,11 +104,21 @@ func generate_world(container: Node2D):
 	generate_world_async(container)
 
 func generate_world_async(container: Node2D):
+	var cached_path = find_cached_world()
+	if cached_path != "":
+		print("Loading cached world: ", cached_path)
+		await load_baked_world_async(cached_path, container)
+		return
+	
 	print("Starting world generation...")
 	generation_progress.emit(0.0, "Initializing world data...")
 	
 	# Clear existing world
 	clear_world(container)
+	baked_layers = {}
+	baked_stats = {}
+	baked_navigation = {}
+	baked_spawn_sites = []
 	
 	# Initialize world data array
 	world_data = []
@@ -100,6 +139,177 @@ func generate_world_async(container: Node2D):
 	generation_progress.emit(1.0, "World generation complete!")
 	generation_complete.emit()
 
+func find_cached_world() -> String:
+	var index_path = WORLD_CACHE_DIR + "/index.json"
+	if not FileAccess.file_exists(index_path):
+		return ""
+	var file = FileAccess.open(index_path, FileAccess.READ)
+	var index = JSON.parse_string(file.get_as_text())
+	if not index is Dictionary:
+		return ""
+	
+	var key = cache_key_text(int(index.get("baker_version", 0))).sha256_text()
+	var entry = index.get("worlds", {}).get(key)
+	if entry == null:
+		return ""
+	# Same check as world_cache.WorldCache.get
+	if entry.get("placement", "") != FileAccess.get_sha256(PLACEMENT_TABLES_PATH):
+		return ""
+	return WORLD_CACHE_DIR + "/" + entry.file
+
+func cache_key_text(baker_version: int) -> String:
+	# Must match world_cache.cache_key_text
+	var fields = [
+		"v%d" % baker_version,
+		"seed=%d" % seed_value,
+		"size=%dx%d" % [world_size.x, world_size.y],
+		"temperature_scale=%.6f" % temperature_scale,
+		"humidity_scale=%.6f" % humidity_scale,
+		"elevation_scale=%.6f" % elevation_scale,
+		"resource_density=%.6f" % resource_density,
+		"vegetation_density=%.6f" % vegetation_density,
+		"river_count=%d" % river_count
+	]
+	return "|".join(fields)
+
+func load_baked_world(path: String, container: Node2D, view_path: String = ""):
+	load_baked_world_async(path, container, view_path)
+
+func load_baked_world_async(path: String, container: Node2D, view_path: String = ""):
+	# Load a world baked offline by world_baker.py instead of generating it.
+	# view_path can be a chunk index (.json) from chunk_baker.py or a
+	# TileMapLayer scene (.tscn) from tileset_builder.py; either replaces
+	# the one-TerrainTile-per-tile view.
+	print("Loading baked world: ", path)
+	generation_progress.emit(0.0, "Loading baked world...")
+	
+	var world = read_baked_world(path)
+	if world.is_empty():
+		return
+	
+	clear_world(container)
+	world_size = Vector2i(world.width, world.height)
+	baked_layers = world.layers
+	
+	var meta = world.meta
+	baked_stats = meta.get("stats", {})
+	baked_navigation = meta.get("navigation", {})
+	baked_spawn_sites = meta.get("spawn_sites", [])
+	var terrain = baked_layers["terrain"]
+	var resources = baked_layers["resources"]
+	var vegetation = baked_layers["vegetation"]
+	var elevation = baked_layers["elevation"]
+	var temperature = baked_layers["temperature"]
+	var humidity = baked_layers["humidity"]
+	var fertility = baked_layers["fertility"]
+	
+	world_data = []
+	for x in range(world_size.x):
+		world_data.append([])
+		for y in range(world_size.y):
+			# Layers are stored x-major to match world_data[x][y]
+			var i = x * world_size.y + y
+			world_data[x].append({
+				"elevation": elevation.decode_half(i * 2),
+				"temperature": temperature.decode_half(i * 2),
+				"humidity": humidity.decode_half(i * 2),
+				"terrain_type": meta.terrain_types[terrain[i]],
+				"resources": decode_bitset(resources[i], meta.resource_types),
+				"fertility": fertility.decode_half(i * 2),
+				"vegetation": decode_bitset(vegetation[i], meta.vegetation_types)
+			})
+		
+		if x % 10 == 0:
+			var progress = (float(x) / world_size.x) * 0.9
+			generation_progress.emit(progress, "Loading baked world... (%d/%d)" % [x + 1, world_size.x])
+			await get_tree().process_frame
+	
+	if view_path.ends_with(".json"):
+		create_chunk_sprites(view_path, container)
+	elif view_path.ends_with(".tscn"):
+		create_tilemap_world(view_path, container)
+	else:
+		await create_world_tiles(container)
+	
+	generation_progress.emit(1.0, "World loaded!")
+	generation_complete.emit()
+
+func create_chunk_sprites(index_path: String, container: Node2D):
+	generation_progress.emit(0.9, "Placing terrain chunks...")
+	
+	var file = FileAccess.open(index_path, FileAccess.READ)
+	if file == null:
+		push_error("Could not open chunk index: " + index_path)
+		return
+	
+	var index = JSON.parse_string(file.get_as_text())
+	for chunk in index.chunks:
+		var chunk_sprite = Sprite2D.new()
+		chunk_sprite.texture = load(chunk.file)
+		chunk_sprite.centered = false
+		chunk_sprite.position = Vector2(chunk.origin[0], chunk.origin[1])
+		container.add_child(chunk_sprite)
+
+func create_tilemap_world(scene_path: String, container: Node2D):
+	generation_progress.emit(0.9, "Placing tilemap...")
+	
+	var tilemap_scene = load(scene_path)
+	if tilemap_scene == null:
+		push_error("Could not load tilemap scene: " + scene_path)
+		return
+	container.add_child(tilemap_scene.instantiate())
+
+func read_baked_world(path: String) -> Dictionary:
+	# See world_format.py for the file layout
+	var file = FileAccess.open(path, FileAccess.READ)
+	if file == null:
+		push_error("Could not open baked world: " + path)
+		return {}
+	
+	if file.get_buffer(4).get_string_from_ascii() != BAKED_WORLD_MAGIC:
+		push_error("Not a baked world file: " + path)
+		return {}
+	
+	var version = file.get_16()
+	if version > BAKED_WORLD_VERSION:
+		push_error("Baked world version %d is newer than supported (%d): %s" % [version, BAKED_WORLD_VERSION, path])
+		return {}
+	
+	var layer_count = file.get_16()
+	var width = file.get_32()
+	var height = file.get_32()
+	var meta_size = file.get_32()
+	var meta = JSON.parse_string(file.get_buffer(meta_size).get_string_from_utf8())
+	
+	var directory = []
+	for i in range(layer_count):
+		var layer_name = read_padded_string(file, 24)
+		read_padded_string(file, 4)  # dtype, fixed per layer name
+		var offset = file.get_64()
+		var size = file.get_64()
+		directory.append([layer_name, offset, size])
+	
+	var layers = {}
+	for entry in directory:
+		file.seek(entry[1])
+		layers[entry[0]] = file.get_buffer(entry[2])
+	
+	return {"width": width, "height": height, "meta": meta, "layers": layers}
+
+func read_padded_string(file: FileAccess, length: int) -> String:
+	var bytes = file.get_buffer(length)
+	var end = bytes.find(0)
+	if end != -1:
+		bytes = bytes.slice(0, end)
+	return bytes.get_string_from_ascii()
+
+func decode_bitset(bits: int, names: Array) -> Array:
+	var decoded = []
+	for i in range(names.size()):
+		if bits & (1 << i):
+			decoded.append(names[i])
+	return decoded
+
 func clear_world(container: Node2D):
 	terrain_tiles.clear()
 	for child in container.get_children():
@@ -161,6 +371,9 @@ func generate_terrain_types():
 			await get_tree().process_frame
 
 func determine_terrain_type_advanced(elevation: float, temperature: float, humidity: float) -> String:
+	if not biome_lut.is_empty():
+		return lookup_biome(elevation, temperature, humidity)
+	
 	# Water level
 	if elevation < 0.3:
 		return "water"
@@ -199,6 +412,25 @@ func determine_terrain_type_advanced(elevation: float, temperature: float, humid
 		else:
 			return "desert"
 
+func lookup_biome(elevation: float, temperature: float, humidity: float) -> String:
+	# Same result as the comparisons below; see world_baker.build_biome_lut
+	var thresholds = biome_lut.thresholds
+	var shape = biome_lut.shape
+	var index = biome_bin(elevation, thresholds.elevation) * int(shape[1])
+	index = (index + biome_bin(temperature, thresholds.temperature)) * int(shape[2])
+	index += biome_bin(humidity, thresholds.humidity)
+	return biome_lut.terrain[index]
+
+func biome_bin(value: float, thresholds: Array) -> int:
+	# Values exactly on a threshold get a bin of their own
+	var bin = 0
+	for threshold in thresholds:
+		if value >= threshold:
+			bin += 1
+		if value > threshold:
+			bin += 1
+	return bin
+
 func generate_resources():
 	generation_progress.emit(0.6, "Placing resources...")
 	
@@ -377,6 +609,9 @@ func create_terrain_tile_advanced(x: int, y: int, tile_data: Dictionary, contain
 	terrain_tiles.append(tile)
 
 func get_world_stats() -> Dictionary:
+	if not baked_stats.is_empty():
+		return baked_stats
+	
 	var stats = {
 		"total_tiles": world_size.x * world_size.y,
 		"terrain_counts": {},
@@ -419,3 +654,28 @@ func get_world_stats() -> Dictionary:
 	stats.avg_humidity = total_humidity / total_tiles
 	
 	return stats
+
+func get_move_cost(tile: Vector2i) -> int:
+	# Baked movement cost, 0 for impassable; -1 if the world has no navigation layers
+	var costs = baked_layers.get("move_cost")
+	if costs == null:
+		return -1
+	if tile.x < 0 or tile.y < 0 or tile.x >= world_size.x or tile.y >= world_size.y:
+		return 0
+	return costs[tile.x * world_size.y + tile.y]
+
+func get_region(tile: Vector2i) -> int:
+	# Connected region, 0 for impassable; -1 if the world has no navigation layers
+	var regions = baked_layers.get("region")
+	if regions == null:
+		return -1
+	if tile.x < 0 or tile.y < 0 or tile.x >= world_size.x or tile.y >= world_size.y:
+		return 0
+	return regions.decode_u32((tile.x * world_size.y + tile.y) * 4)
+
+func is_reachable(from_tile: Vector2i, to_tile: Vector2i) -> bool:
+	# Tiles in the same region have a walkable path between them
+	var region = get_region(from_tile)
+	if region == -1:
+		return true  # Generated at runtime, so nothing is known to be blocked
+	return region != 0 and region == get_region(to_tile)
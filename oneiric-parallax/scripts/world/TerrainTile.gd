@@ -30,7 +30,7 @@ func setup_terrain_advanced(tile_data: Dictionary):
 
 func set_terrain_sprite():
 	var sprite_path = "res://sprites/terrain/%s.png" % terrain_type
-	var terrain_texture = load(sprite_path)
+	var terrain_texture = AssetBundles.get_texture(sprite_path)
 	if terrain_texture:
 		texture = terrain_texture
 	else:
@@ -47,7 +47,7 @@ func setup_vegetation():
 	for veg_type in vegetation:
 		var veg_sprite = Sprite2D.new()
 		var veg_path = "res://sprites/vegetation/%s.png" % veg_type
-		var veg_texture = load(veg_path)
+		var veg_texture = AssetBundles.get_texture(veg_path)
 		
 		if veg_texture:
 			veg_sprite.texture = veg_texture
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Project Resource Graph
+Indexes the Godot project once, parses every scene, resource and script in
+parallel for the res:// paths they reference, and builds the dependency
+graph from project.godot down. Reports references that don't resolve and
+files nothing reachable uses.
+
+Format strings such as "res://sprites/%s/unit_%s.png" are matched against
+the index as globs, so they resolve to every file they could load.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from bisect import bisect_right
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path("oneiric-parallax")
+PROJECT_FILE = "project.godot"
+
+# Files Godot writes next to a resource; they ship or drop with it
+SIDECAR_SUFFIXES = (".import", ".uid")
+PARSED_SUFFIXES = (".gd", ".tscn", ".tres", ".godot", ".json")
+
+# Directories never part of the project: the editor's import cache and dotted dirs
+SKIPPED_DIRS = {".godot"}
+
+STRING_PATTERN = re.compile(r"\"((?:[^\"\\\n]|\\.)*)\"|'((?:[^'\\\n]|\\.)*)'")
+CALL_PATTERN = re.compile(r"\b(preload|load)\(\s*$")
+CLASS_NAME_PATTERN = re.compile(r"^class_name\s+(\w+)", re.MULTILINE)
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Z]\w*\b")
+DYNAMIC_LOAD_PATTERN = re.compile(r"\b(?:preload|load)\(\s*([^\"'\s)][^)]*)\)")
+FORMAT_PATTERN = re.compile(r"%(%|[-+ 0#]*\d*(?:\.\d+)?[a-zA-Z])")
+
+
+class Reference:
+    """One res:// path a file mentions"""
+
+    def __init__(self, source, line, kind, target):
+        self.source = source
+        self.line = line
+        self.kind = kind
+        self.target = target
+        self.pattern = format_pattern(target)
+        # Filled in by ProjectGraph: the indexed files it resolves to
+        self.targets = []
+
+    @property
+    def is_pattern(self):
+        return self.pattern is not None
+
+    def to_json(self):
+        return {"source": self.source, "line": self.line, "kind": self.kind, "target": self.target}
+
+
+def format_pattern(target):
+    """Regex matching every path a GDScript format string can produce, or None for a plain path
+
+    %d and friends match digits; any other placeholder matches within one path segment.
+    """
+    if FORMAT_PATTERN.search(target) is None:
+        return None
+    parts = []
+    position = 0
+    for match in FORMAT_PATTERN.finditer(target):
+        parts.append(re.escape(target[position:match.start()]))
+        spec = match.group(1)
+        if spec == "%":
+            parts.append("%")
+        elif spec[-1] in "di":
+            parts.append(r"-?\d+")
+        else:
+            parts.append("[^/]+")
+        position = match.end()
+    parts.append(re.escape(target[position:]))
+    return re.compile("".join(parts) + "$")
+
+
+def index_project(project_dir=PROJECT_DIR):
+    """Map res:// path to size in bytes for every file in the project, plus the set of directories"""
+    project_dir = Path(project_dir)
+    files = {}
+    directories = {"res://"}
+    pending = [(str(project_dir), "res://")]
+    while pending:
+        path, res_dir = pending.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name in SKIPPED_DIRS:
+                    continue
+                res_path = res_dir + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    directories.add(res_path)
+                    pending.append((entry.path, res_path + "/"))
+                else:
+                    files[res_path] = entry.stat().st_size
+    return files, directories
+
+
+def parse_file(project_dir, res_path):
+    """(references, class name, capitalised identifiers, dynamic load count) of one scene, resource or script"""
+    text = (Path(project_dir) / res_path[len("res://"):]).read_text(encoding="utf-8", errors="replace")
+    script = res_path.endswith(".gd")
+    references = []
+    line_starts = [0] + [match.end() for match in re.finditer("\n", text)]
+
+    for match in STRING_PATTERN.finditer(text):
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        if not value.startswith("res://"):
+            continue
+        line = bisect_right(line_starts, match.start())
+        line_text = text[line_starts[line - 1]:match.start()]
+        if script:
+            call = CALL_PATTERN.search(line_text)
+            kind = call.group(1) if call else "string"
+        elif line_text.startswith("[ext_resource"):
+            kind = "ext_resource"
+        else:
+            kind = "setting" if res_path.endswith(".godot") else "property"
+        references.append(Reference(res_path, line, kind, value))
+
+    class_name = None
+    identifiers = set()
+    dynamic_loads = 0
+    if script:
+        found = CLASS_NAME_PATTERN.search(text)
+        class_name = found.group(1) if found else None
+        # Identifiers of the code alone, so names in strings and comments don't count
+        code = STRING_PATTERN.sub('""', text)
+        code = re.sub(r"#.*", "", code)
+        identifiers = set(IDENTIFIER_PATTERN.findall(code))
+        for argument in DYNAMIC_LOAD_PATTERN.findall(code):
+            # load(sprite_path) is checked already when sprite_path is set from a res:// literal
+            assigned = re.search(r"\b%s\s*:?=\s*[\"']res://" % re.escape(argument.strip()), text)
+            if not (argument.strip().isidentifier() and assigned):
+                dynamic_loads += 1
+    return references, class_name, identifiers, dynamic_loads
+
+
+def is_sidecar(res_path):
+    return res_path.endswith(SIDECAR_SUFFIXES)
+
+
+class ProjectGraph:
+    """Resource dependency graph of a Godot project"""
+
+    def __init__(self, project_dir=PROJECT_DIR, workers=None):
+        self.project_dir = Path(project_dir)
+        self.files, self.directories = index_project(self.project_dir)
+        self.references = []
+        self.classes = {}
+        self.dynamic_loads = {}
+
+        parsed = sorted(path for path in self.files if path.endswith(PARSED_SUFFIXES))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda path: parse_file(self.project_dir, path), parsed))
+
+        identifiers = {}
+        for path, (references, class_name, names, dynamic_loads) in zip(parsed, results):
+            self.references.extend(references)
+            identifiers[path] = names
+            if class_name:
+                self.classes[class_name] = path
+            if dynamic_loads:
+                self.dynamic_loads[path] = dynamic_loads
+
+        # A script naming another script's class_name depends on it
+        self.class_uses = defaultdict(set)
+        for path, names in identifiers.items():
+            for name in names:
+                script = self.classes.get(name)
+                if script and script != path:
+                    self.class_uses[path].add(script)
+
+        for reference in self.references:
+            reference.targets = self.resolve(reference)
+        self.link()
+
+    def link(self):
+        """Rebuild the edges from the references' targets, after changing any of them"""
+        self.edges = defaultdict(set)
+        for path, scripts in self.class_uses.items():
+            self.edges[path].update(scripts)
+        for reference in self.references:
+            self.edges[reference.source].update(reference.targets)
+
+    def resolve(self, reference):
+        """Indexed files a reference loads; empty when it's broken"""
+        target = reference.target
+        if reference.is_pattern:
+            return sorted(path for path in self.files
+                          if not is_sidecar(path) and reference.pattern.match(path))
+        if target in self.files:
+            return [target]
+        # A directory loads whatever is in it at run time (the world cache, for one)
+        directory = target.rstrip("/")
+        if directory in self.directories:
+            return sorted(path for path in self.files if path.startswith(directory + "/"))
+        return []
+
+    def broken(self):
+        return [reference for reference in self.references if not reference.targets]
+
+    def reachable(self, roots=None):
+        """Every file reachable from project.godot (or the given roots), sidecars included"""
+        roots = ["res://" + PROJECT_FILE] if roots is None else roots
+        seen = set(roots)
+        queue = deque(roots)
+        while queue:
+            path = queue.popleft()
+            for target in self.edges.get(path, ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        for path in list(seen):
+            for suffix in SIDECAR_SUFFIXES:
+                if path + suffix in self.files:
+                    seen.add(path + suffix)
+        return seen
+
+    def unused(self, roots=None):
+        """Files nothing reachable references, sidecars left out"""
+        reachable = self.reachable(roots)
+        return sorted(path for path in self.files if path not in reachable and not is_sidecar(path))
+
+    def dependents(self, res_path):
+        """Files that reference res_path directly"""
+        return sorted(source for source, targets in self.edges.items() if res_path in targets)
+
+    def to_json(self):
+        reachable = self.reachable()
+        return {
+            "files": len(self.files),
+            "bytes": sum(self.files.values()),
+            "classes": self.classes,
+            "edges": {source: sorted(targets) for source, targets in sorted(self.edges.items()) if targets},
+            "references": [reference.to_json() for reference in self.references],
+            "broken": [reference.to_json() for reference in self.broken()],
+            "unused": self.unused(),
+            "reachable_bytes": sum(self.files[path] for path in reachable if path in self.files),
+            "dynamic_loads": self.dynamic_loads
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every res:// reference in the Godot project and list unused files")
+    parser.add_argument("--project", default=str(PROJECT_DIR), help="Godot project directory")
+    parser.add_argument("--json", help="Write the graph and report to this file")
+    parser.add_argument("--deps", metavar="RES_PATH", help="Show what a file references and what references it")
+    parser.add_argument("--unused", action="store_true", help="List every unused file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = ProjectGraph(args.project)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.deps:
+        print(f"🔗 {args.deps}")
+        for target in sorted(graph.edges.get(args.deps, ())):
+            print(f"   → {target}")
+        for source in graph.dependents(args.deps):
+            print(f"   ← {source}")
+        return 0
+
+    broken = graph.broken()
+    unused = graph.unused()
+    patterns = sum(reference.is_pattern for reference in graph.references)
+    print(f"🗂️  {len(graph.files)} files, {len(graph.references)} references ({patterns} format strings), "
+          f"{len(graph.classes)} script classes in {elapsed:.0f} ms")
+
+    if broken:
+        print(f"❌ {len(broken)} broken references:")
+        for reference in broken:
+            print(f"   - {reference.source}:{reference.line} {reference.kind} {reference.target}")
+    else:
+        print("✅ Every reference resolves")
+
+    unused_bytes = sum(graph.files[path] for path in unused)
+    print(f"🧹 {len(unused)} unused files, {unused_bytes / 1024:.0f} KiB")
+    by_directory = defaultdict(list)
+    for path in unused:
+        by_directory[path.rsplit("/", 1)[0]].append(path)
+    for directory, paths in sorted(by_directory.items()):
+        if args.unused:
+            for path in paths:
+                print(f"   - {path}")
+        else:
+            print(f"   - {directory}/: {len(paths)} files")
+
+    unchecked = sum(graph.dynamic_loads.values())
+    if unchecked:
+        print(f"⚠️  {unchecked} load() calls with computed paths can't be checked: "
+              f"{', '.join(sorted(graph.dynamic_loads))}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(graph.to_json(), f, indent=2)
+        print(f"✅ Graph written to {args.json}")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,9 @@ Godot Project Setup Script
 Sets up the basic project structure for the cosmic civilization game
 """
 
-import os
+import argparse
+import difflib
+import hashlib
 import json
 from pathlib import Path
 
@@ -542,46 +544,11 @@ INPUT_MAP = {
     "slow_down": [{"type": "keyboard", "scancode": 45}],         # -
 }
 
-def create_directories():
-    """Create all necessary directories"""
-    print("Creating project directories...")
-    for directory in DIRECTORIES:
-        dir_path = PROJECT_DIR / directory
-        dir_path.mkdir(parents=True, exist_ok=True)
-    print("✓ Directories created")
+# Settings merged into project.godot; keys already there are left alone
+PROJECT_SETTINGS = """[application]
 
-def create_scenes():
-    """Create scene files"""
-    print("Creating scene files...")
-    for scene_name, scene_content in SCENE_TEMPLATES.items():
-        scene_path = PROJECT_DIR / scene_name
-        scene_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(scene_path, 'w') as f:
-            f.write(scene_content)
-    print("✓ Scene files created")
+run/main_scene="res://Main.tscn"
 
-def create_scripts():
-    """Create GDScript files"""
-    print("Creating script files...")
-    for script_name, script_content in SCRIPT_TEMPLATES.items():
-        script_path = PROJECT_DIR / script_name
-        script_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-    print("✓ Script files created")
-
-def update_project_settings():
-    """Update project.godot with our settings"""
-    print("Updating project settings...")
-    
-    project_file = PROJECT_DIR / "project.godot"
-    
-    # Read existing content
-    with open(project_file, 'r') as f:
-        content = f.read()
-    
-    # Add our settings
-    additional_settings = '''
 [input]
 
 move_camera_left={
@@ -613,64 +580,231 @@ toggle_pause={
 [rendering]
 
 textures/canvas_textures/default_texture_filter=0
-'''
-    
-    # Add main scene setting
-    if 'run/main_scene' not in content:
-        main_scene_setting = '\nrun/main_scene="res://Main.tscn"'
-        # Insert after [application] section
-        content = content.replace('[application]', '[application]' + main_scene_setting)
-    
-    # Append additional settings
-    with open(project_file, 'w') as f:
-        f.write(content + additional_settings)
-    
-    print("✓ Project settings updated")
+"""
+
+# Civilization templates
+CIVILIZATION_DATA = {
+    "primitive": {
+        "name": "Primitive Tribe",
+        "era": "primitive",
+        "technologies": ["fire", "tools", "language"],
+        "units": ["gatherer", "hunter", "shaman"],
+        "buildings": ["hut", "fire_pit", "shrine"]
+    },
+    "industrial": {
+        "name": "Industrial Nation",
+        "era": "industrial", 
+        "technologies": ["steam_power", "electricity", "railways"],
+        "units": ["worker", "engineer", "soldier"],
+        "buildings": ["factory", "power_plant", "barracks"]
+    },
+    "space": {
+        "name": "Space Civilization",
+        "era": "space",
+        "technologies": ["fusion_power", "space_travel", "terraforming"],
+        "units": ["scientist", "astronaut", "engineer"],
+        "buildings": ["lab", "spaceport", "habitat"]
+    }
+}
+
+# Hashes of what the scaffolder last wrote, to tell its own files from local edits
+MANIFEST_FILE = ".scaffold.json"
+
+def content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def load_manifest():
+    manifest_path = PROJECT_DIR / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    with open(PROJECT_DIR / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+class Scaffold:
+    """Writes project files only when their content changes
+
+    A file is created when missing and updated when its template changed,
+    but only if it still matches what the scaffolder last wrote; files
+    edited since (or never written by it) are skipped unless forced. With
+    dry_run, changes are printed as diffs instead of written.
+    """
+
+    def __init__(self, dry_run=False, force=False):
+        self.dry_run = dry_run
+        self.force = force
+        self.manifest = load_manifest()
+        self.counts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+    def write(self, name, content, owned=True):
+        """Write PROJECT_DIR / name; owned=False files (like project.godot) may always be updated"""
+        path = PROJECT_DIR / name
+        current = path.read_text() if path.exists() else None
+        if current == content:
+            self.manifest[name] = content_hash(content)
+            self.counts["unchanged"] += 1
+            return
+        if current is not None and owned and not self.force and self.manifest.get(name) != content_hash(current):
+            print(f"  ! {name} has local changes, skipped (use --force to overwrite)")
+            self.counts["skipped"] += 1
+            return
+
+        action = "created" if current is None else "updated"
+        self.counts[action] += 1
+        if self.dry_run:
+            print(f"  ~ Would {action[:-1]} {name}")
+            diff = difflib.unified_diff((current or "").splitlines(keepends=True), content.splitlines(keepends=True),
+                                        f"a/{name}", f"b/{name}")
+            print("".join("    " + line if line.endswith("\n") else "    " + line + "\n" for line in diff), end="")
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        self.manifest[name] = content_hash(content)
+        print(f"  + {action.capitalize()} {name}")
+
+    def finish(self):
+        if not self.dry_run:
+            save_manifest(self.manifest)
+        summary = ", ".join(f"{count} {action}" for action, count in self.counts.items())
+        print(f"{'🔍 Dry run: ' if self.dry_run else '✓ '}{summary}")
+
+def create_directories(dry_run=False):
+    """Create all necessary directories"""
+    print("Creating project directories...")
+    for directory in DIRECTORIES:
+        dir_path = PROJECT_DIR / directory
+        if dry_run:
+            if not dir_path.exists():
+                print(f"  ~ Would create {directory}/")
+            continue
+        dir_path.mkdir(parents=True, exist_ok=True)
+    if not dry_run:
+        print("✓ Directories created")
 
-def create_data_files():
+def create_scenes(scaffold):
+    """Create scene files"""
+    print("Creating scene files...")
+    for scene_name, scene_content in SCENE_TEMPLATES.items():
+        scaffold.write(scene_name, scene_content)
+
+def create_scripts(scaffold):
+    """Create GDScript files"""
+    print("Creating script files...")
+    for script_name, script_content in SCRIPT_TEMPLATES.items():
+        scaffold.write(script_name, script_content)
+
+def parse_project_file(text):
+    """project.godot as [(section, [(key, raw text)])], keeping every line
+
+    The first section is None for the preamble. Entries without a key hold
+    comments and blank lines; multi-line values (dictionaries, arrays) stay
+    with their key until their brackets balance.
+    """
+    sections = [(None, [])]
+    lines = text.splitlines(keepends=True)
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]") and "=" not in stripped:
+            sections.append((stripped[1:-1], []))
+            i += 1
+            continue
+        if "=" not in stripped or stripped.startswith(";"):
+            sections[-1][1].append((None, line))
+            i += 1
+            continue
+        key = stripped.split("=", 1)[0]
+        raw = line
+        depth = _bracket_depth(line)
+        while depth > 0 and i + 1 < len(lines):
+            i += 1
+            raw += lines[i]
+            depth += _bracket_depth(lines[i])
+        sections[-1][1].append((key, raw))
+        i += 1
+    return sections
+
+def _bracket_depth(line):
+    """Net opened brackets on a line, ignoring quoted strings"""
+    depth = 0
+    in_string = False
+    previous = ""
+    for char in line:
+        if char == '"' and previous != "\\":
+            in_string = not in_string
+        elif not in_string:
+            depth += char in "{[("
+            depth -= char in "}])"
+        previous = char
+    return depth
+
+def merge_project_settings(text, settings=PROJECT_SETTINGS):
+    """Add every section and key of settings missing from a project.godot text"""
+    sections = parse_project_file(text)
+    by_name = {name: entries for name, entries in sections}
+    for name, wanted in parse_project_file(settings)[1:]:
+        entries = by_name.get(name)
+        if entries is None:
+            entries = []
+            sections.append((name, entries))
+            by_name[name] = entries
+        present = {key for key, _ in entries if key}
+        missing = [(key, raw) for key, raw in wanted if key and key not in present]
+        if not missing:
+            continue
+        # New keys go after the section's last setting, before its trailing blank lines
+        last = max([index for index, (key, _) in enumerate(entries) if key] or [-1])
+        if last >= 0 and not entries[last][1].endswith("\n"):
+            entries[last] = (entries[last][0], entries[last][1] + "\n")
+        entries[last + 1:last + 1] = missing
+        if not entries[0:1] or entries[0][0] is not None or entries[0][1].strip():
+            entries.insert(0, (None, "\n"))
+
+    merged = ""
+    for name, entries in sections:
+        if name is not None:
+            # One blank line before every section header
+            if merged and not merged.endswith("\n\n"):
+                merged += "\n" if merged.endswith("\n") else "\n\n"
+            merged += f"[{name}]\n"
+        merged += "".join(raw for _, raw in entries)
+    return merged
+
+def update_project_settings(scaffold):
+    """Merge our settings into project.godot"""
+    print("Updating project settings...")
+    project_file = PROJECT_DIR / "project.godot"
+    content = project_file.read_text() if project_file.exists() else ""
+    scaffold.write("project.godot", merge_project_settings(content), owned=False)
+
+def create_data_files(scaffold):
     """Create initial data files"""
     print("Creating data files...")
-    
-    # Civilization templates
-    civ_data = {
-        "primitive": {
-            "name": "Primitive Tribe",
-            "era": "primitive",
-            "technologies": ["fire", "tools", "language"],
-            "units": ["gatherer", "hunter", "shaman"],
-            "buildings": ["hut", "fire_pit", "shrine"]
-        },
-        "industrial": {
-            "name": "Industrial Nation",
-            "era": "industrial", 
-            "technologies": ["steam_power", "electricity", "railways"],
-            "units": ["worker", "engineer", "soldier"],
-            "buildings": ["factory", "power_plant", "barracks"]
-        },
-        "space": {
-            "name": "Space Civilization",
-            "era": "space",
-            "technologies": ["fusion_power", "space_travel", "terraforming"],
-            "units": ["scientist", "astronaut", "engineer"],
-            "buildings": ["lab", "spaceport", "habitat"]
-        }
-    }
-    
-    with open(PROJECT_DIR / "data" / "civilizations.json", 'w') as f:
-        json.dump(civ_data, f, indent=2)
-    
-    print("✓ Data files created")
+    scaffold.write("data/civilizations.json", json.dumps(CIVILIZATION_DATA, indent=2))
 
 def main():
+    parser = argparse.ArgumentParser(description="Set up the Godot project structure")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change as diffs, write nothing")
+    parser.add_argument("--force", action="store_true", help="Overwrite files with local changes")
+    args = parser.parse_args()
+
     print("Setting up Godot project structure...")
     print(f"Project directory: {PROJECT_DIR.absolute()}")
-    
-    create_directories()
-    create_scenes()
-    create_scripts()
-    update_project_settings()
-    create_data_files()
-    
+
+    scaffold = Scaffold(args.dry_run, args.force)
+    create_directories(args.dry_run)
+    create_scenes(scaffold)
+    create_scripts(scaffold)
+    update_project_settings(scaffold)
+    create_data_files(scaffold)
+    scaffold.finish()
+    if args.dry_run:
+        return
+
     print("\n🎉 Godot project setup complete!")
     print("\nNext steps:")
     print("1. Run the sprite generator: python sprite_generator.py")
@@ -679,4 +813,4 @@ def main():
     print("\nProject structure ready for cosmic civilization development!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
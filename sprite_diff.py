@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Sprite Diff Tool
+Compares two sprite builds (or a build against a stored hash manifest) and
+reports which sprites changed, ranked by how much they changed
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_SPRITE_DIR = "oneiric-parallax/sprites"
+HEATMAP_SCALE = 4
+
+
+def file_hash(path):
+    """SHA-1 of the raw file bytes, used to skip decoding unchanged sprites"""
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def scan_sprites(sprite_dir):
+    """Map relative sprite paths to absolute paths for every PNG in a tree"""
+    sprite_dir = Path(sprite_dir)
+    return {
+        sprite_file.relative_to(sprite_dir).as_posix(): sprite_file
+        for sprite_file in sorted(sprite_dir.rglob("*.png"))
+    }
+
+
+def build_manifest(sprite_dir):
+    """Build a hash manifest of a sprite tree"""
+    manifest = {}
+    for rel_path, sprite_file in scan_sprites(sprite_dir).items():
+        with Image.open(sprite_file) as img:
+            size = list(img.size)
+        manifest[rel_path] = {"sha1": file_hash(sprite_file), "size": size}
+    return manifest
+
+
+def load_rgba(path):
+    """Load a sprite as a float32 RGBA array in the 0-1 range"""
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGBA"), dtype=np.float32) / 255.0
+
+
+def pad_to(pixels, height, width):
+    """Pad an RGBA array with transparent pixels to the given size"""
+    padded = np.zeros((height, width, 4), dtype=np.float32)
+    padded[:pixels.shape[0], :pixels.shape[1]] = pixels
+    return padded
+
+
+def pixel_delta(old_pixels, new_pixels):
+    """Per-pixel perceptual delta between two RGBA arrays
+
+    Colors are compared premultiplied by alpha so changes under fully
+    transparent pixels don't count, and RGB channels are weighted by their
+    contribution to luminance. Returns a 2D array in the 0-1 range.
+    """
+    height = max(old_pixels.shape[0], new_pixels.shape[0])
+    width = max(old_pixels.shape[1], new_pixels.shape[1])
+    old_pixels = pad_to(old_pixels, height, width)
+    new_pixels = pad_to(new_pixels, height, width)
+
+    old_rgb = old_pixels[..., :3] * old_pixels[..., 3:]
+    new_rgb = new_pixels[..., :3] * new_pixels[..., 3:]
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    color_delta = np.abs(old_rgb - new_rgb) @ weights
+    alpha_delta = np.abs(old_pixels[..., 3] - new_pixels[..., 3])
+    return np.maximum(color_delta, alpha_delta)
+
+
+def summarize_delta(delta):
+    """Reduce a per-pixel delta map to ranking metrics"""
+    changed = delta > (1.0 / 255.0)
+    return {
+        "changed_pixels": int(changed.sum()),
+        "changed_fraction": float(changed.mean()),
+        "mean_delta": float(delta.mean()),
+        "max_delta": float(delta.max()),
+    }
+
+
+def write_heatmap(old_path, new_path, delta, output_file):
+    """Write an old | new | heatmap strip scaled up for review"""
+    height, width = delta.shape
+    strip = Image.new("RGBA", (width * 3, height), (40, 40, 40, 255))
+    for index, path in enumerate([old_path, new_path]):
+        if path is not None:
+            with Image.open(path) as img:
+                sprite = img.convert("RGBA")
+                strip.paste(sprite, (index * width, 0), sprite)
+
+    # Black (no change) through red to yellow (full change)
+    heat = np.zeros((height, width, 4), dtype=np.uint8)
+    heat[..., 0] = np.clip(delta * 2.0, 0.0, 1.0) * 255
+    heat[..., 1] = np.clip(delta * 2.0 - 1.0, 0.0, 1.0) * 255
+    heat[..., 3] = 255
+    strip.paste(Image.fromarray(heat, "RGBA"), (width * 2, 0))
+
+    strip = strip.resize((width * 3 * HEATMAP_SCALE, height * HEATMAP_SCALE), Image.NEAREST)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    strip.save(output_file)
+
+
+def diff_trees(old_dir, new_dir, heatmap_dir=None):
+    """Compare two sprite trees
+
+    Sprites whose file bytes hash the same are skipped without decoding.
+    Returns a report dictionary with changed sprites ranked by mean delta.
+    """
+    old_sprites = scan_sprites(old_dir)
+    new_sprites = scan_sprites(new_dir)
+
+    report = {
+        "unchanged": 0,
+        "reencoded": [],
+        "changed": [],
+        "added": sorted(set(new_sprites) - set(old_sprites)),
+        "removed": sorted(set(old_sprites) - set(new_sprites)),
+    }
+
+    for rel_path in sorted(set(old_sprites) & set(new_sprites)):
+        old_path = old_sprites[rel_path]
+        new_path = new_sprites[rel_path]
+        if file_hash(old_path) == file_hash(new_path):
+            report["unchanged"] += 1
+            continue
+
+        old_pixels = load_rgba(old_path)
+        new_pixels = load_rgba(new_path)
+        delta = pixel_delta(old_pixels, new_pixels)
+        metrics = summarize_delta(delta)
+
+        if old_pixels.shape != new_pixels.shape:
+            metrics["resized"] = [list(old_pixels.shape[1::-1]), list(new_pixels.shape[1::-1])]
+        elif metrics["changed_pixels"] == 0:
+            # Same pixels, different encoding
+            report["reencoded"].append(rel_path)
+            continue
+
+        metrics["file"] = rel_path
+        report["changed"].append(metrics)
+
+        if heatmap_dir is not None:
+            write_heatmap(old_path, new_path, delta, Path(heatmap_dir) / rel_path)
+
+    report["changed"].sort(key=lambda entry: (entry["mean_delta"], entry["changed_pixels"]), reverse=True)
+    return report
+
+
+def diff_against_manifest(manifest, new_dir):
+    """Compare a sprite tree against a stored hash manifest
+
+    A manifest holds no pixels, so changed sprites are reported without
+    a magnitude; resized sprites are ranked first.
+    """
+    new_sprites = scan_sprites(new_dir)
+
+    report = {
+        "unchanged": 0,
+        "reencoded": [],
+        "changed": [],
+        "added": sorted(set(new_sprites) - set(manifest)),
+        "removed": sorted(set(manifest) - set(new_sprites)),
+    }
+
+    for rel_path in sorted(set(manifest) & set(new_sprites)):
+        new_path = new_sprites[rel_path]
+        if file_hash(new_path) == manifest[rel_path]["sha1"]:
+            report["unchanged"] += 1
+            continue
+
+        with Image.open(new_path) as img:
+            size = list(img.size)
+        entry = {"file": rel_path}
+        if size != manifest[rel_path]["size"]:
+            entry["resized"] = [manifest[rel_path]["size"], size]
+        report["changed"].append(entry)
+
+    report["changed"].sort(key=lambda entry: "resized" not in entry)
+    return report
+
+
+def print_report(report, limit=20):
+    """Print a ranked summary of a diff report"""
+    print("📊 Sprite Diff:")
+    print(f"✅ Unchanged: {report['unchanged']}")
+    print(f"♻️  Re-encoded (same pixels): {len(report['reencoded'])}")
+    print(f"⚠️  Changed: {len(report['changed'])}")
+    print(f"➕ Added: {len(report['added'])}")
+    print(f"➖ Removed: {len(report['removed'])}")
+
+    if report["changed"]:
+        print("\nChanged sprites (largest first):")
+        for entry in report["changed"][:limit]:
+            line = f"  {entry['file']}"
+            if "mean_delta" in entry:
+                line += (f": mean {entry['mean_delta']:.4f}, max {entry['max_delta']:.3f}, "
+                         f"{entry['changed_pixels']} px ({entry['changed_fraction'] * 100:.1f}%)")
+            if "resized" in entry:
+                old_size, new_size = entry["resized"]
+                line += f" [resized {old_size[0]}x{old_size[1]} -> {new_size[0]}x{new_size[1]}]"
+            print(line)
+        if len(report["changed"]) > limit:
+            print(f"  ... and {len(report['changed']) - limit} more")
+
+    for label in ["added", "removed"]:
+        for rel_path in report[label][:limit]:
+            print(f"  {label}: {rel_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sprite builds and rank changed sprites")
+    parser.add_argument("old", help="Baseline sprite directory, or a manifest JSON file")
+    parser.add_argument("new", nargs="?", default=DEFAULT_SPRITE_DIR, help="Sprite directory to check")
+    parser.add_argument("--heatmaps", help="Write old | new | heatmap review images to this directory")
+    parser.add_argument("--json", help="Write the full report as JSON to this file")
+    parser.add_argument("--write-manifest", action="store_true",
+                        help="Write a hash manifest of NEW to the OLD path instead of diffing")
+    args = parser.parse_args()
+
+    if args.write_manifest:
+        manifest = build_manifest(args.new)
+        with open(args.old, "w") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"✅ Manifest of {len(manifest)} sprites saved to {args.old}")
+        return 0
+
+    old_path = Path(args.old)
+    if old_path.is_file():
+        with open(old_path) as f:
+            report = diff_against_manifest(json.load(f), args.new)
+        if args.heatmaps:
+            print("⚠️  Heatmaps need a baseline sprite tree, not a manifest")
+    else:
+        report = diff_trees(old_path, args.new, args.heatmaps)
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.json}")
+
+    changed = report["changed"] or report["added"] or report["removed"]
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
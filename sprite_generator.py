@@ -11,6 +11,8 @@ import json
 from pathlib import Path
 import math
 
+from tileset_builder import build_tileset
+
 # Color palettes for different eras
 COLOR_PALETTES = {
     "primitive": {
@@ -2392,6 +2394,11 @@ class SpriteGenerator:
             json.dump(atlas_info, f, indent=2)
         
         print(f"Atlas info saved to {self.output_dir / 'sprite_atlas.json'}")
+    
+    def generate_tileset(self):
+        """Generate the terrain/vegetation TileSet resource for Godot"""
+        tileset_file = build_tileset(self.output_dir)
+        print(f"TileSet saved to {tileset_file}")
 
 def main():
     if len(sys.argv) > 1:
@@ -2402,6 +2409,7 @@ def main():
     generator = SpriteGenerator(output_dir)
     generator.generate_all_sprites()
     generator.generate_sprite_atlas_info()
+    generator.generate_tileset()
     
     print("\n✓ Sprite generation complete!")
     print(f"  Generated sprites in: {generator.output_dir}")
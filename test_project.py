@@ -5,8 +5,18 @@ Quick test to validate the Godot project structure
 
 import os
 import json
+import shutil
+import tempfile
 from pathlib import Path
 
+import numpy as np
+import pytest
+
+from asset_bundles import build_bundles
+from project_graph import ProjectGraph
+from world_baker import DERIVED_LAYERS, TERRAIN_TYPES, WorldBaker, merge_chunk_stats, stats_partial, world_stats
+from world_journal import WorldSave, WorldSaveError, replay
+
 def test_godot_project():
     print("🎮 Testing Cosmic Civilization Demo Project...")
     
@@ -89,7 +99,17 @@ def test_godot_project():
     
     print("✅ All critical files found!")
     print("✅ Sprite atlas validated!")
-    
+
+    # Check every res:// reference resolves
+    graph = ProjectGraph(project_root)
+    broken = graph.broken()
+    if broken:
+        print("❌ Broken resource references:")
+        for reference in broken:
+            print(f"   - {reference.source}:{reference.line} {reference.target}")
+        return False
+    print(f"✅ All {len(graph.references)} resource references resolve!")
+
     # Count resources
     total_sprites = 0
     for category in atlas_data:
@@ -132,10 +152,80 @@ def test_godot_project():
     
     return True
 
+def test_bundle_round_trip():
+    """Bundling every sprite, then bundling again, gives back the pruned bundles"""
+    print("📦 Testing asset bundle round trip...")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project = Path(temp_dir) / "oneiric-parallax"
+        shutil.copytree("oneiric-parallax", project, ignore=shutil.ignore_patterns(".godot"))
+        pruned, _ = build_bundles(project)
+        everything, _ = build_bundles(project, everything=True)
+        rebuilt, _ = build_bundles(project)
+
+    assert len(everything["bundles"]) > len(pruned["bundles"])
+    assert rebuilt == pruned, "Sprites bundled by --all stayed in the default bundles"
+    print(f"✅ {len(pruned['bundles'])} pruned bundles restored after bundling all {len(everything['bundles'])}")
+
+def test_journal_derived_layers():
+    """Edited, compacted and replayed saves agree on the layers and meta derived from terrain"""
+    print("💾 Testing world journal derived layers...")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        world_file = WorldBaker({"seed": 7, "world_size": 48}).bake().save(Path(temp_dir) / "world.world")
+        with WorldSave.create(Path(temp_dir) / "save", world_file) as save:
+            before = {name: np.array(save.layer(name)) for name in DERIVED_LAYERS}
+            xs, ys = np.meshgrid(np.arange(8, 40), np.arange(20, 24), indexing="ij")
+            save.set_tiles("terrain", xs, ys, TERRAIN_TYPES.index("water"))
+            save.set_tiles("vegetation", xs, ys, 0)
+            with pytest.raises(WorldSaveError):
+                save.set_tiles("fuel_load", [0], [0], 0)
+            with pytest.raises(ValueError):
+                save.prune(keep=0)
+
+            edited = {name: np.array(save.layer(name)) for name in DERIVED_LAYERS}
+            edited_meta = save.meta()
+            save.compact()
+            compacted = {name: np.array(save.layer(name)) for name in DERIVED_LAYERS}
+            compacted_meta = save.meta()
+        replayed, replayed_meta = replay(Path(temp_dir) / "save")
+
+    assert not (edited["fuel_load"][xs, ys]).any()
+    assert not np.array_equal(edited["region"], before["region"])
+    for name in DERIVED_LAYERS:
+        assert np.array_equal(edited[name], compacted[name]), name
+        assert np.array_equal(edited[name], replayed[name]), name
+    for key in ["stats", "navigation", "spawn_sites"]:
+        assert edited_meta[key] == compacted_meta[key] == replayed_meta[key], key
+    print("✅ Derived layers agree after an edit, a compaction and a replay")
+
+def test_chunk_stats_merge():
+    """Stats merged from chunk partials match world_stats on the whole world"""
+    print("📊 Testing chunked world stats...")
+    baker = WorldBaker({"seed": 3, "world_size": 96}).bake()
+    climate = ["elevation", "temperature", "humidity", "fertility"]
+    whole = world_stats(baker.terrain, baker.resources, baker.vegetation,
+                        {name: getattr(baker, name) for name in climate})
+    partials = [stats_partial(baker.terrain[xs, ys], baker.resources[xs, ys], baker.vegetation[xs, ys],
+                              {name: getattr(baker, name)[xs, ys] for name in climate})
+                for xs in (slice(0, 40), slice(40, 96)) for ys in (slice(0, 70), slice(70, 96))]
+    merged = merge_chunk_stats(partials, 96 * 96)
+
+    assert merged.keys() == whole.keys()
+    assert merged["histograms"] == whole["histograms"]
+    assert merged["resource_coverage"] == whole["resource_coverage"]
+    for terrain, biome in whole["biomes"].items():
+        for name in climate:
+            assert merged["biomes"][terrain][name]["min"] == biome[name]["min"]
+            assert merged["biomes"][terrain][name]["max"] == biome[name]["max"]
+            assert merged["biomes"][terrain][name]["mean"] == pytest.approx(biome[name]["mean"])
+    print("✅ Chunk partials merge into the whole-world stats")
+
 if __name__ == "__main__":
     os.chdir("oneiric-parallax/..")
     success = test_godot_project()
     if success:
+        test_bundle_round_trip()
+        test_journal_derived_layers()
+        test_chunk_stats_merge()
         print("\n🎯 Project validation PASSED! Ready for Godot 4.4+")
     else:
         print("\n💥 Project validation FAILED!")
\ No newline at end of file
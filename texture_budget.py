@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Texture Memory Budget
+Estimates the GPU memory of every sprite as Godot imports it (from its
+.import compress mode, mipmaps and size limit), of every bundle atlas page,
+and the totals per bundle and sprite atlas category, including mip levels
+and the bytes spent on transparent padding. Totals are checked against
+budgets and any overrun fails the run.
+
+Sprites and categories count each sprite imported on its own, the way
+they load without bundles; pages and bundles count the atlases written by
+asset_bundles.py. Startup is the shared bundle plus the starting era.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from asset_bundles import BUNDLE_DIR_NAME, MANIFEST_FILE
+from asset_prune import load_sprite_atlas
+from project_graph import PROJECT_DIR
+
+MIB = 1024 * 1024
+
+# Import settings Godot uses for a texture without a .import file yet
+IMPORT_DEFAULTS = {"compress/mode": 0, "mipmaps/generate": False, "process/size_limit": 0}
+
+# (bits per pixel, block side) on the GPU for each compress/mode: lossless and
+# lossy decompress to RGBA8; VRAM compressed and Basis end up as 4x4 BC3/ETC2 blocks
+COMPRESS_FORMATS = {0: (32, 1), 1: (32, 1), 2: (8, 4), 3: (32, 1), 4: (8, 4)}
+
+# The era spawn_initial_civilizations starts every game in
+STARTUP_ERA = "primitive"
+
+# MiB; "*" applies to any bundle or category not named
+DEFAULT_BUDGETS = {
+    "sprite": 0.25,
+    "page": 4.0,
+    "bundles": {"shared": 2.0, "*": 1.0},
+    "categories": {"*": 2.0},
+    "startup": 4.0,
+    "total": 16.0
+}
+
+
+def read_import_params(import_file):
+    """[params] of a Godot .import file over IMPORT_DEFAULTS"""
+    params = dict(IMPORT_DEFAULTS)
+    if not Path(import_file).exists():
+        return params
+    section = None
+    for line in Path(import_file).read_text().splitlines():
+        if line.startswith("["):
+            section = line.strip("[]")
+        elif section == "params" and "=" in line:
+            key, value = line.split("=", 1)
+            if value in ("true", "false"):
+                params[key] = value == "true"
+            elif value.lstrip("-").isdigit():
+                params[key] = int(value)
+    return params
+
+
+def texture_bytes(width, height, params):
+    """(bytes, of which mip levels) a texture takes on the GPU once imported"""
+    size_limit = params.get("process/size_limit", 0)
+    if size_limit and max(width, height) > size_limit:
+        scale = size_limit / max(width, height)
+        width, height = max(1, round(width * scale)), max(1, round(height * scale))
+    bits, block = COMPRESS_FORMATS.get(params.get("compress/mode", 0), COMPRESS_FORMATS[0])
+
+    levels = []
+    while True:
+        blocks_x, blocks_y = -(-width // block), -(-height // block)
+        levels.append(blocks_x * blocks_y * block * block * bits // 8)
+        if not params.get("mipmaps/generate") or (width == 1 and height == 1):
+            break
+        width, height = max(1, width // 2), max(1, height // 2)
+    return sum(levels), sum(levels[1:])
+
+
+def opaque_fraction(image):
+    """Share of an image inside the bounding box of its non-transparent pixels"""
+    box = image.convert("RGBA").getchannel("A").getbbox()
+    if box is None:
+        return 0.0
+    return (box[2] - box[0]) * (box[3] - box[1]) / (image.width * image.height)
+
+
+def sprite_report(project_dir=PROJECT_DIR):
+    """One row per sprite atlas sprite on disk"""
+    project_dir = Path(project_dir)
+    rows = []
+    for path, (category, era) in sorted(load_sprite_atlas(project_dir).items()):
+        sprite_file = project_dir / path[len("res://"):]
+        if not sprite_file.exists():
+            continue
+        with Image.open(sprite_file) as image:
+            size = image.size
+            used = opaque_fraction(image)
+        total, mips = texture_bytes(*size, read_import_params(f"{sprite_file}.import"))
+        rows.append({"path": path, "category": category, "era": era, "size": list(size), "bytes": total,
+                     "mip_bytes": mips, "waste_bytes": round(total * (1 - used))})
+    return rows
+
+
+def bundle_report(project_dir=PROJECT_DIR):
+    """(page rows, bundle rows) from the bundle manifest, empty when there isn't one"""
+    project_dir = Path(project_dir)
+    manifest_file = project_dir / "sprites" / BUNDLE_DIR_NAME / MANIFEST_FILE
+    if not manifest_file.exists():
+        return [], {}
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+
+    pages = []
+    bundles = {}
+    for name, bundle in manifest["bundles"].items():
+        covered = [0] * len(bundle["pages"])
+        for page, _, _, width, height in bundle["sprites"].values():
+            covered[page] += width * height
+        row = {"pages": len(bundle["pages"]), "sprites": len(bundle["sprites"]), "bytes": 0, "mip_bytes": 0,
+               "waste_bytes": 0, "depends": bundle["depends"]}
+        for index, page in enumerate(bundle["pages"]):
+            page_file = project_dir / page["file"][len("res://"):]
+            width, height = page["size"]
+            total, mips = texture_bytes(width, height, read_import_params(f"{page_file}.import"))
+            waste = round(total * (1 - covered[index] / (width * height)))
+            pages.append({"path": page["file"], "bundle": name, "size": [width, height], "bytes": total,
+                          "mip_bytes": mips, "waste_bytes": waste})
+            row["bytes"] += total
+            row["mip_bytes"] += mips
+            row["waste_bytes"] += waste
+        bundles[name] = row
+    return pages, bundles
+
+
+def bundle_closure(bundles, names):
+    """Names plus everything they depend on"""
+    needed = []
+    pending = [name for name in names if name in bundles]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.append(name)
+            pending.extend(bundles[name]["depends"])
+    return needed
+
+
+def load_budgets(budgets_file=None):
+    budgets = json.loads(json.dumps(DEFAULT_BUDGETS))
+    if budgets_file:
+        with open(budgets_file) as f:
+            for key, value in json.load(f).items():
+                if isinstance(value, dict):
+                    budgets.setdefault(key, {}).update(value)
+                else:
+                    budgets[key] = value
+    return budgets
+
+
+def budget_for(budgets, scope, name):
+    limits = budgets.get(scope, {})
+    return limits.get(name, limits.get("*"))
+
+
+def memory_report(project_dir=PROJECT_DIR, budgets=None):
+    """Every estimate, the totals and the budget overruns"""
+    budgets = budgets or load_budgets()
+    sprites = sprite_report(project_dir)
+    pages, bundles = bundle_report(project_dir)
+
+    categories = {}
+    for sprite in sprites:
+        row = categories.setdefault(sprite["category"], {"sprites": 0, "bytes": 0, "mip_bytes": 0, "waste_bytes": 0})
+        row["sprites"] += 1
+        for key in ("bytes", "mip_bytes", "waste_bytes"):
+            row[key] += sprite[key]
+
+    startup = bundle_closure(bundles, [STARTUP_ERA])
+    report = {
+        "sprites": sprites,
+        "pages": pages,
+        "bundles": bundles,
+        "categories": categories,
+        "startup": {"bundles": startup, "bytes": sum(bundles[name]["bytes"] for name in startup)},
+        "total": {"bundles": sorted(bundles), "bytes": sum(row["bytes"] for row in bundles.values())},
+        "budgets": budgets,
+        "overruns": []
+    }
+
+    checks = [("sprite", sprite["path"], sprite["bytes"], budgets.get("sprite")) for sprite in sprites]
+    checks += [("page", page["path"], page["bytes"], budgets.get("page")) for page in pages]
+    checks += [("bundle", name, row["bytes"], budget_for(budgets, "bundles", name)) for name, row in bundles.items()]
+    checks += [("category", name, row["bytes"], budget_for(budgets, "categories", name))
+               for name, row in categories.items()]
+    checks += [("startup", "startup", report["startup"]["bytes"], budgets.get("startup")),
+               ("total", "total", report["total"]["bytes"], budgets.get("total"))]
+    for scope, name, size, budget in checks:
+        if budget is not None and size > budget * MIB:
+            report["overruns"].append({"scope": scope, "name": name, "bytes": size, "budget_bytes": int(budget * MIB)})
+    return report
+
+
+def print_table(title, rows, budgets, scope):
+    print(f"   {title:<14}{'count':>6}{'KiB':>9}{'mips':>8}{'waste':>7}{'budget':>9}")
+    for name, row in sorted(rows.items(), key=lambda item: -item[1]["bytes"]):
+        budget = budget_for(budgets, scope, name)
+        count = row.get("sprites", 0)
+        waste = row["waste_bytes"] / row["bytes"] if row["bytes"] else 0.0
+        flag = "" if budget is None else (" ❌" if row["bytes"] > budget * MIB else " ✅")
+        budget_text = "-" if budget is None else f"{budget * 1024:.0f}"
+        print(f"   {name:<14}{count:>6}{row['bytes'] / 1024:>9.1f}{row['mip_bytes'] / 1024:>8.1f}"
+              f"{waste:>7.0%}{budget_text:>9}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate sprite GPU memory and check it against budgets")
+    parser.add_argument("--project", default=str(PROJECT_DIR), help="Godot project directory")
+    parser.add_argument("--budgets", help="JSON file of budgets in MiB, merged over the defaults")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    report = memory_report(args.project, budgets)
+    sprite_bytes = sum(row["bytes"] for row in report["categories"].values())
+    print(f"🎮 Texture memory: {len(report['sprites'])} sprites {sprite_bytes / 1024:.0f} KiB as single files, "
+          f"{len(report['bundles'])} bundles {report['total']['bytes'] / 1024:.0f} KiB, "
+          f"startup {report['startup']['bytes'] / 1024:.0f} KiB ({' + '.join(report['startup']['bundles'])})")
+    print_table("category", report["categories"], budgets, "categories")
+    if report["bundles"]:
+        print_table("bundle", report["bundles"], budgets, "bundles")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.json}")
+
+    if report["overruns"]:
+        print(f"❌ {len(report['overruns'])} over budget:")
+        for overrun in report["overruns"]:
+            print(f"   - {overrun['scope']} {overrun['name']}: {overrun['bytes'] / 1024:.1f} KiB "
+                  f"of {overrun['budget_bytes'] / 1024:.0f} KiB")
+        return 1
+    print("✅ Within every budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
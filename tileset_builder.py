@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+TileSet Builder
+Packs the terrain and vegetation sprites into atlas textures, writes a Godot
+TileSet resource for them, and writes baked worlds as TileMapLayer scenes
+"""
+
+import argparse
+import base64
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from world_baker import TERRAIN_TYPES, VEGETATION_TYPES
+from world_format import open_world
+
+PROJECT_DIR = Path("oneiric-parallax")
+DEFAULT_SPRITE_DIR = PROJECT_DIR / "sprites"
+TILESET_DIR_NAME = "tilesets"
+TILESET_FILE = "world_tileset.tres"
+TILE_SIZE = 32
+
+TERRAIN_SOURCE_ID = 0
+VEGETATION_SOURCE_ID = 1
+
+# Godot Variant.Type for String, used for the tile custom data layers
+VARIANT_TYPE_STRING = 4
+
+# TileMapLayer.tile_map_data: a uint16 format version followed by one
+# 12-byte record per cell
+TILE_MAP_DATA_FORMAT = 0
+CELL_RECORD = np.dtype([("x", "<i2"), ("y", "<i2"), ("source", "<u2"),
+                        ("atlas_x", "<u2"), ("atlas_y", "<u2"), ("alternative", "<u2")])
+
+
+def res_path(path, project_dir=PROJECT_DIR):
+    """Turn a filesystem path inside the project into a res:// path"""
+    return "res://" + Path(path).resolve().relative_to(Path(project_dir).resolve()).as_posix()
+
+
+def build_atlas(sprite_dir, names, output_file):
+    """Pack same-sized sprites into a single-row atlas, in the given order"""
+    atlas = Image.new("RGBA", (TILE_SIZE * len(names), TILE_SIZE), (0, 0, 0, 0))
+    for index, name in enumerate(names):
+        sprite_file = Path(sprite_dir) / f"{name}.png"
+        if sprite_file.exists():
+            with Image.open(sprite_file) as img:
+                sprite = img.convert("RGBA")
+                if sprite.size != (TILE_SIZE, TILE_SIZE):
+                    sprite = sprite.resize((TILE_SIZE, TILE_SIZE), Image.NEAREST)
+                atlas.paste(sprite, (index * TILE_SIZE, 0))
+        else:
+            print(f"⚠️  Missing sprite for atlas: {sprite_file}")
+    atlas.save(output_file)
+    return output_file
+
+
+def atlas_source_section(resource_id, texture_id, names, custom_data_layer):
+    lines = [
+        f'[sub_resource type="TileSetAtlasSource" id="{resource_id}"]',
+        f'texture = ExtResource("{texture_id}")',
+        f"texture_region_size = Vector2i({TILE_SIZE}, {TILE_SIZE})"
+    ]
+    for index, name in enumerate(names):
+        lines.append(f"{index}:0/0 = 0")
+        lines.append(f'{index}:0/0/custom_data_{custom_data_layer} = "{name}"')
+    return "\n".join(lines)
+
+
+def build_tileset(sprite_dir=DEFAULT_SPRITE_DIR, project_dir=None):
+    """Write terrain/vegetation atlases, the TileSet .tres and a tile ID map
+
+    Terrain tiles sit at atlas coords (TERRAIN_TYPES index, 0) in source 0
+    and vegetation at (VEGETATION_TYPES index, 0) in source 1, with the
+    type name in the terrain_type / vegetation_type custom data layers.
+    """
+    sprite_dir = Path(sprite_dir)
+    project_dir = Path(project_dir) if project_dir else sprite_dir.parent
+    tileset_dir = sprite_dir / TILESET_DIR_NAME
+    tileset_dir.mkdir(parents=True, exist_ok=True)
+
+    terrain_atlas = build_atlas(sprite_dir / "terrain", TERRAIN_TYPES, tileset_dir / "terrain_atlas.png")
+    vegetation_atlas = build_atlas(sprite_dir / "vegetation", VEGETATION_TYPES, tileset_dir / "vegetation_atlas.png")
+
+    sections = [
+        "[gd_resource type=\"TileSet\" load_steps=5 format=3]",
+        "\n".join([
+            f'[ext_resource type="Texture2D" path="{res_path(terrain_atlas, project_dir)}" id="1_terrain"]',
+            f'[ext_resource type="Texture2D" path="{res_path(vegetation_atlas, project_dir)}" id="2_vegetation"]'
+        ]),
+        atlas_source_section("TileSetAtlasSource_terrain", "1_terrain", TERRAIN_TYPES, 0),
+        atlas_source_section("TileSetAtlasSource_vegetation", "2_vegetation", VEGETATION_TYPES, 1),
+        "\n".join([
+            "[resource]",
+            f"tile_size = Vector2i({TILE_SIZE}, {TILE_SIZE})",
+            'custom_data_layer_0/name = "terrain_type"',
+            f"custom_data_layer_0/type = {VARIANT_TYPE_STRING}",
+            'custom_data_layer_1/name = "vegetation_type"',
+            f"custom_data_layer_1/type = {VARIANT_TYPE_STRING}",
+            f'sources/{TERRAIN_SOURCE_ID} = SubResource("TileSetAtlasSource_terrain")',
+            f'sources/{VEGETATION_SOURCE_ID} = SubResource("TileSetAtlasSource_vegetation")'
+        ])
+    ]
+    tileset_file = tileset_dir / TILESET_FILE
+    with open(tileset_file, "w") as f:
+        f.write("\n\n".join(sections) + "\n")
+
+    tile_ids = {
+        "tileset": res_path(tileset_file, project_dir),
+        "terrain": {name: {"source": TERRAIN_SOURCE_ID, "atlas_coords": [index, 0]}
+                    for index, name in enumerate(TERRAIN_TYPES)},
+        "vegetation": {name: {"source": VEGETATION_SOURCE_ID, "atlas_coords": [index, 0]}
+                       for index, name in enumerate(VEGETATION_TYPES)}
+    }
+    with open(tileset_dir / "tile_ids.json", "w") as f:
+        json.dump(tile_ids, f, indent=2)
+
+    return tileset_file
+
+
+def encode_tile_map_data(x, y, source, atlas_x):
+    """Encode cells as a TileMapLayer.tile_map_data byte string"""
+    cells = np.zeros(len(x), dtype=CELL_RECORD)
+    cells["x"] = x
+    cells["y"] = y
+    cells["source"] = source
+    cells["atlas_x"] = atlas_x
+    return np.uint16(TILE_MAP_DATA_FORMAT).astype("<u2").tobytes() + cells.tobytes()
+
+
+# Index of the lowest set bit for every byte value (-1 for zero)
+_LOWEST_BIT = np.array([(value & -value).bit_length() - 1 for value in range(256)], dtype=np.int16)
+
+
+def tilemap_layers(world):
+    """Cell data for the Terrain layer and up to two vegetation layers"""
+    terrain = np.asarray(world["terrain"])
+    x, y = np.nonzero(np.ones_like(terrain, dtype=bool))
+    layers = {"Terrain": encode_tile_map_data(x, y, TERRAIN_SOURCE_ID, terrain[x, y])}
+
+    # A cell holds one tile per layer; world generation places at most two
+    # vegetation entries per tile, so they go on two layers
+    vegetation = np.asarray(world["vegetation"])
+    for layer_name in ["Vegetation", "VegetationDetail"]:
+        lowest = _LOWEST_BIT[vegetation]
+        x, y = np.nonzero(lowest >= 0)
+        layers[layer_name] = encode_tile_map_data(x, y, VEGETATION_SOURCE_ID, lowest[x, y])
+        vegetation = vegetation & (vegetation - 1)
+
+    return layers
+
+
+def write_tilemap_scene(world_path, output_file, tileset_file, project_dir=PROJECT_DIR):
+    """Write a baked world as a scene of TileMapLayer nodes using the generated TileSet"""
+    world = open_world(world_path)
+    if max(world.width, world.height) > np.iinfo(np.int16).max:
+        raise ValueError(f"TileMapLayer cells are 16-bit, {world.width}x{world.height} is too large")
+    layers = tilemap_layers(world)
+
+    lines = [
+        "[gd_scene load_steps=2 format=4]",
+        "",
+        f'[ext_resource type="TileSet" path="{res_path(tileset_file, project_dir)}" id="1_tileset"]',
+        "",
+        '[node name="BakedWorld" type="Node2D"]',
+        # TerrainTile sprites are centred on x * tile_size; tilemap cells start there
+        f"position = Vector2({-TILE_SIZE // 2}, {-TILE_SIZE // 2})"
+    ]
+    for layer_name, data in layers.items():
+        lines += [
+            "",
+            f'[node name="{layer_name}" type="TileMapLayer" parent="."]',
+            f'tile_map_data = PackedByteArray("{base64.b64encode(data).decode("ascii")}")',
+            'tile_set = ExtResource("1_tileset")'
+        ]
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the world TileSet and bake worlds into TileMapLayer scenes")
+    parser.add_argument("world", nargs="?", help="Baked .world file to write as a TileMapLayer scene")
+    parser.add_argument("-o", "--output", help="Scene file (default: scenes/world/baked/<world name>.tscn)")
+    parser.add_argument("--sprites", default=str(DEFAULT_SPRITE_DIR), help="Sprite directory")
+    args = parser.parse_args()
+
+    tileset_file = build_tileset(args.sprites)
+    print(f"✅ TileSet written to {tileset_file}")
+
+    if args.world:
+        output = args.output or PROJECT_DIR / "scenes" / "world" / "baked" / f"{Path(args.world).stem}.tscn"
+        scene = write_tilemap_scene(args.world, output, tileset_file)
+        print(f"✅ TileMapLayer scene written to {scene}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1089 @@
+#!/usr/bin/env python3
+"""
+World Baker for Cosmic Civilization Game
+Runs the WorldGenerator.gd pipeline on whole NumPy arrays so large worlds
+can be baked offline and loaded by the game instead of generated at runtime
+"""
+
+import argparse
+import json
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from chunk_store import ChunkStore, ChunkStoreError
+from world_format import write_world
+from world_nav import movement_costs, navigation_layers, navigation_meta, connected_components
+from world_spawn import DEFAULT_SPAWN_RADIUS, merge_sites, rank_sites, spawn_layers, spawn_suitability
+
+# Bump whenever baked output for the same params changes; part of world cache keys
+BAKER_VERSION = 5
+
+# Enum orders used in baked files - append only, the game indexes these
+TERRAIN_TYPES = ["water", "grass", "desert", "snow", "forest", "mountain", "swamp", "volcanic"]
+RESOURCE_TYPES = ["food", "wood", "stone", "metal", "rare_minerals", "fish", "obsidian", "peat"]
+VEGETATION_TYPES = ["grass_healthy", "flowers_healthy", "tree_mature", "bush_healthy",
+                    "tree_sapling", "grass_dry", "bush_dead"]
+
+TERRAIN = {name: index for index, name in enumerate(TERRAIN_TYPES)}
+RESOURCE_BITS = {name: 1 << index for index, name in enumerate(RESOURCE_TYPES)}
+VEGETATION_BITS = {name: 1 << index for index, name in enumerate(VEGETATION_TYPES)}
+
+# Flammability bitmask: why a tile burns in FireSystem.is_position_flammable
+FLAMMABLE_TERRAIN = ["forest", "grass", "swamp"]
+FLAMMABILITY_BITS = {"terrain": 1, "vegetation": 2}
+
+# Fuel contributed by terrain and by each vegetation entry; a tile's
+# fuel_load is the sum, capped at 255
+TERRAIN_FUEL = {"grass": 40, "forest": 120, "swamp": 60}
+VEGETATION_FUEL = {"grass_healthy": 20, "flowers_healthy": 10, "tree_mature": 100, "bush_healthy": 40,
+                   "tree_sapling": 30, "grass_dry": 50, "bush_dead": 60}
+
+# Per-terrain resource and vegetation chances (WorldGenerator's match blocks)
+PLACEMENT_TABLES_FILE = Path(__file__).resolve().parent / "oneiric-parallax" / "data" / "placement_tables.json"
+
+# Layers written to baked worlds and chunk stores, with their stored dtypes
+LAYER_DTYPES = {
+    "terrain": np.uint8,
+    "elevation": np.float16,
+    "temperature": np.float16,
+    "humidity": np.float16,
+    "fertility": np.float16,
+    "resources": np.uint8,
+    "vegetation": np.uint8,
+    "flammability": np.uint8,
+    "fuel_load": np.uint8,
+    "move_cost": np.uint8,
+    "region": np.uint32,
+    "spawn_score": np.uint8
+}
+
+# Layers computed from the others (see derive_world) rather than generated
+DERIVED_LAYERS = ["flammability", "fuel_load", "move_cost", "region", "spawn_score"]
+
+# Random phases: each gets its own Philox key, and each array of draws
+# within a phase its own counter lane
+RANDOM_PHASES = {"resources": 1, "vegetation": 2}
+PHILOX_VALUES_PER_BLOCK = 4
+
+# Bins for the climate histograms stored in world stats
+STATS_HISTOGRAM_BINS = 16
+
+# Same fields and defaults as WorldGenerator.set_generation_params
+DEFAULT_PARAMS = {
+    "world_size": [64, 64],
+    "seed": 0,
+    "temperature_scale": 0.1,
+    "humidity_scale": 0.15,
+    "elevation_scale": 0.08,
+    "resource_density": 0.3,
+    "vegetation_density": 0.4,
+    "river_count": 3,
+    # Flow accumulation that makes a river; None picks it from river_count.
+    # Chunked bakes need a fixed value so every chunk agrees.
+    "river_accumulation": None
+}
+
+# Presets from WorldGenUI.apply_preset
+PRESETS = {
+    "Earth-like": {"temperature_scale": 0.1, "humidity_scale": 0.15, "elevation_scale": 0.08,
+                   "resource_density": 0.3, "vegetation_density": 0.4, "river_count": 5},
+    "Desert World": {"temperature_scale": 0.05, "humidity_scale": 0.05, "elevation_scale": 0.12,
+                     "resource_density": 0.1, "vegetation_density": 0.1, "river_count": 1},
+    "Ocean World": {"temperature_scale": 0.08, "humidity_scale": 0.2, "elevation_scale": 0.04,
+                    "resource_density": 0.4, "vegetation_density": 0.2, "river_count": 8},
+    "Mountain World": {"temperature_scale": 0.12, "humidity_scale": 0.1, "elevation_scale": 0.15,
+                       "resource_density": 0.5, "vegetation_density": 0.3, "river_count": 3},
+    "Forest World": {"temperature_scale": 0.08, "humidity_scale": 0.2, "elevation_scale": 0.06,
+                     "resource_density": 0.4, "vegetation_density": 0.8, "river_count": 6},
+    "Volcanic World": {"temperature_scale": 0.15, "humidity_scale": 0.08, "elevation_scale": 0.2,
+                       "resource_density": 0.6, "vegetation_density": 0.2, "river_count": 2}
+}
+
+DEFAULT_OUTPUT_DIR = "oneiric-parallax/data/worlds"
+
+# Chunked baking: chunk side in tiles, extra tiles baked around each chunk
+# so rivers can drain across its edges, and the fixed river threshold
+# chunks use instead of one derived from the whole map
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_HALO = 32
+DEFAULT_CHUNK_RIVER_ACCUMULATION = 200
+
+# Elevation below which a tile is water, and where rivers end
+SEA_LEVEL = 0.3
+
+# Every threshold determine_terrain_type_advanced compares each value against
+BIOME_THRESHOLDS = {
+    "elevation": [SEA_LEVEL, 0.7, 0.8],
+    "temperature": [0.2, 0.3, 0.4, 0.7, 0.8],
+    "humidity": [0.3, 0.4, 0.6, 0.7, 0.8]
+}
+BIOME_LUT_FILE = "oneiric-parallax/data/biome_lut.json"
+
+# D8 neighbour offsets
+D8_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+# FastNoiseLite constants
+PRIME_X = 501125321
+PRIME_Y = 1136930381
+HASH_MULTIPLIER = 0x27D4EB2D
+SQRT3 = 1.7320508075688772
+F2 = 0.5 * (SQRT3 - 1.0)
+G2 = (3.0 - SQRT3) / 6.0
+
+# FastNoiseLite's 2D gradient table: 24 directions at 7.5 + 15k degrees
+# repeated five times, followed by 8 diagonal-ish directions (128 in total)
+_angles = np.radians(7.5 + 15.0 * np.arange(24))
+_gradients = np.tile(np.stack([np.sin(_angles), np.cos(_angles)], axis=1), (5, 1))
+_diagonals = np.radians([22.5, 67.5, 112.5, 157.5, 202.5, 247.5, 292.5, 337.5])
+_gradients = np.concatenate([_gradients, np.stack([np.sin(_diagonals), np.cos(_diagonals)], axis=1)])
+GRADIENTS_2D = _gradients.reshape(-1)
+
+# Cellular jitter vectors. FastNoiseLite ships a fixed table of 256 random
+# unit vectors; this is a fixed-seed table of the same shape, so cellular
+# noise has the same character as the engine's but is not bit-identical.
+_jitter_angles = np.random.default_rng(1337).uniform(0.0, 2.0 * np.pi, 256)
+RAND_VECS_2D = np.stack([np.cos(_jitter_angles), np.sin(_jitter_angles)], axis=1).reshape(-1)
+
+
+def _int32(values):
+    """Wrap integer values to signed 32-bit like C++ int arithmetic"""
+    return np.asarray(values, dtype=np.int64).astype(np.int32)
+
+
+def _hash(seed, x_primed, y_primed):
+    hashed = np.int32(seed) ^ x_primed ^ y_primed
+    return _int32(hashed.astype(np.int64) * HASH_MULTIPLIER)
+
+
+def _grad_coord(seed, x_primed, y_primed, xd, yd):
+    hashed = _hash(seed, x_primed, y_primed)
+    hashed ^= hashed >> 15
+    hashed &= 127 << 1
+    return xd * GRADIENTS_2D[hashed] + yd * GRADIENTS_2D[hashed | 1]
+
+
+def _single_perlin(seed, x, y):
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    xd0 = x - x0
+    yd0 = y - y0
+    xd1 = xd0 - 1.0
+    yd1 = yd0 - 1.0
+    xs = xd0 * xd0 * xd0 * (xd0 * (xd0 * 6.0 - 15.0) + 10.0)
+    ys = yd0 * yd0 * yd0 * (yd0 * (yd0 * 6.0 - 15.0) + 10.0)
+
+    x0 = _int32(x0.astype(np.int64) * PRIME_X)
+    y0 = _int32(y0.astype(np.int64) * PRIME_Y)
+    x1 = _int32(x0.astype(np.int64) + PRIME_X)
+    y1 = _int32(y0.astype(np.int64) + PRIME_Y)
+
+    xf0 = _grad_coord(seed, x0, y0, xd0, yd0)
+    xf0 += (_grad_coord(seed, x1, y0, xd1, yd0) - xf0) * xs
+    xf1 = _grad_coord(seed, x0, y1, xd0, yd1)
+    xf1 += (_grad_coord(seed, x1, y1, xd1, yd1) - xf1) * xs
+    return (xf0 + (xf1 - xf0) * ys) * 1.4247691104677813
+
+
+def _single_simplex(seed, x, y):
+    """OpenSimplex2 on coordinates already skewed by the noise transform"""
+    i = np.floor(x)
+    j = np.floor(y)
+    xi = x - i
+    yi = y - j
+    t = (xi + yi) * G2
+    x0 = xi - t
+    y0 = yi - t
+    i = _int32(i.astype(np.int64) * PRIME_X)
+    j = _int32(j.astype(np.int64) * PRIME_Y)
+    i1 = _int32(i.astype(np.int64) + PRIME_X)
+    j1 = _int32(j.astype(np.int64) + PRIME_Y)
+
+    a = 0.5 - x0 * x0 - y0 * y0
+    n0 = np.where(a > 0, (a * a) * (a * a) * _grad_coord(seed, i, j, x0, y0), 0.0)
+
+    c = (2.0 * (1.0 - 2.0 * G2) * (1.0 / G2 - 2.0)) * t + ((-2.0 * (1.0 - 2.0 * G2) * (1.0 - 2.0 * G2)) + a)
+    x2 = x0 + (2.0 * G2 - 1.0)
+    y2 = y0 + (2.0 * G2 - 1.0)
+    n2 = np.where(c > 0, (c * c) * (c * c) * _grad_coord(seed, i1, j1, x2, y2), 0.0)
+
+    upper = y0 > x0
+    x1 = np.where(upper, x0 + G2, x0 + (G2 - 1.0))
+    y1 = np.where(upper, y0 + (G2 - 1.0), y0 + G2)
+    b = 0.5 - x1 * x1 - y1 * y1
+    grad = _grad_coord(seed, np.where(upper, i, i1), np.where(upper, j1, j), x1, y1)
+    n1 = np.where(b > 0, (b * b) * (b * b) * grad, 0.0)
+
+    return (n0 + n1 + n2) * 99.83685446303647
+
+
+def _single_cellular(seed, x, y, jitter=1.0):
+    """Cellular noise with Euclidean distance and the Distance return type"""
+    # FastRound rounds halves away from zero
+    xr = np.where(x >= 0, np.floor(x + 0.5), np.ceil(x - 0.5)).astype(np.int64)
+    yr = np.where(y >= 0, np.floor(y + 0.5), np.ceil(y - 0.5)).astype(np.int64)
+    cell_jitter = 0.43701595 * jitter
+
+    distance0 = np.full(x.shape, 1e10)
+    for dx in (-1, 0, 1):
+        x_primed = _int32((xr + dx) * PRIME_X)
+        for dy in (-1, 0, 1):
+            y_primed = _int32((yr + dy) * PRIME_Y)
+            index = _hash(seed, x_primed, y_primed) & (255 << 1)
+            vec_x = (xr + dx - x) + RAND_VECS_2D[index] * cell_jitter
+            vec_y = (yr + dy - y) + RAND_VECS_2D[index | 1] * cell_jitter
+            np.minimum(distance0, vec_x * vec_x + vec_y * vec_y, out=distance0)
+
+    return np.sqrt(distance0) - 1.0
+
+
+class FastNoise:
+    """Vectorized 2D port of the FastNoiseLite setup used by WorldGenerator.gd
+
+    Mirrors Godot's FastNoiseLite defaults: FBm fractal with 5 octaves,
+    lacunarity 2.0 and gain 0.5. Noise types are "perlin", "simplex"
+    (OpenSimplex2, Godot's TYPE_SIMPLEX) and "cellular".
+    """
+
+    def __init__(self, noise_type, seed=0, frequency=0.01, octaves=5, lacunarity=2.0, gain=0.5):
+        self.noise_type = noise_type
+        self.seed = int(_int32(seed))
+        self.frequency = frequency
+        self.octaves = octaves
+        self.lacunarity = lacunarity
+        self.gain = gain
+
+        amp = abs(gain)
+        amp_fractal = 1.0
+        for _ in range(1, octaves):
+            amp_fractal += amp
+            amp *= abs(gain)
+        self.fractal_bounding = 1.0 / amp_fractal
+
+    def get_noise_2d(self, x, y):
+        """Sample noise at arrays of coordinates, like FastNoiseLite.get_noise_2d"""
+        x = np.asarray(x, dtype=np.float64) * self.frequency
+        y = np.asarray(y, dtype=np.float64) * self.frequency
+
+        if self.noise_type == "simplex":
+            t = (x + y) * F2
+            x = x + t
+            y = y + t
+
+        single = {
+            "perlin": _single_perlin,
+            "simplex": _single_simplex,
+            "cellular": _single_cellular
+        }[self.noise_type]
+
+        seed = self.seed
+        total = np.zeros(np.broadcast(x, y).shape)
+        amp = self.fractal_bounding
+        for _ in range(self.octaves):
+            total += single(seed, x, y) * amp
+            seed = int(_int32(seed + 1))
+            x = x * self.lacunarity
+            y = y * self.lacunarity
+            amp *= self.gain
+        return total
+
+
+def load_placement_tables(path=PLACEMENT_TABLES_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+
+def placement_table(chances, names):
+    """Per-terrain chance tables as (terrain, slot) arrays of probability and bit"""
+    slots = max((len(entries) for entries in chances.values()), default=0)
+    probabilities = np.zeros((len(TERRAIN_TYPES), slots))
+    bits = np.zeros((len(TERRAIN_TYPES), slots), dtype=np.uint8)
+    for terrain_name, entries in chances.items():
+        for slot, (name, chance) in enumerate(entries):
+            probabilities[TERRAIN[terrain_name], slot] = chance
+            bits[TERRAIN[terrain_name], slot] = 1 << names.index(name)
+    return probabilities, bits
+
+
+def tile_random(seed, phase, draw, x0, x1, y0, y1):
+    """Uniform [0, 1) values for tiles [x0, x1) x [y0, y1), keyed by (seed, phase, tile)
+
+    Philox is counter-based: the value for a tile depends only on the seed,
+    the phase, which draw it is and the tile coordinates, never on what was
+    generated before. Any region can be generated on any worker, in any
+    order, and matches the same tiles of a whole-map bake.
+    """
+    key = [seed & 0xFFFFFFFFFFFFFFFF, RANDOM_PHASES[phase]]
+    skip = y0 % PHILOX_VALUES_PER_BLOCK
+    count = y1 - y0
+    values = np.empty((x1 - x0, count))
+    for row, x in enumerate(range(x0, x1)):
+        # Counter words: block of four tiles along y, x, draw
+        generator = np.random.Philox(key=key, counter=[y0 // PHILOX_VALUES_PER_BLOCK, x, draw, 0])
+        raw = generator.random_raw(skip + count)[skip:]
+        # Same 53-bit conversion as Generator.random
+        values[row] = (raw >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+    return values
+
+
+def resolve_params(params=None, preset=None):
+    """Merge generation parameters over the defaults, like set_generation_params"""
+    resolved = dict(DEFAULT_PARAMS)
+    if preset:
+        resolved.update(PRESETS[preset])
+    if params:
+        resolved.update({key: value for key, value in params.items() if value is not None})
+    size = resolved["world_size"]
+    resolved["world_size"] = [int(size), int(size)] if np.isscalar(size) else [int(v) for v in size]
+    return resolved
+
+
+class WorldBaker:
+    def __init__(self, params=None, preset=None, region=None, placement=None):
+        """region is an optional (x0, y0, width, height) window of the world to
+        bake; noise, randomness and latitude still use world coordinates, so
+        a region matches the same tiles of a whole-world bake (rivers aside,
+        which only see the region); placement overrides the chance tables
+        loaded from PLACEMENT_TABLES_FILE
+        """
+        self.params = resolve_params(params, preset)
+        self.world_width, self.world_height = self.params["world_size"]
+        self.x0, self.y0, self.width, self.height = region or (0, 0, self.world_width, self.world_height)
+        seed = self.params["seed"]
+
+        self.elevation_noise = FastNoise("perlin", seed, self.params["elevation_scale"])
+        self.temperature_noise = FastNoise("simplex", seed + 1, self.params["temperature_scale"])
+        self.humidity_noise = FastNoise("simplex", seed + 2, self.params["humidity_scale"])
+        self.resource_noise = FastNoise("cellular", seed + 3, 0.2)
+
+        self.seed = seed
+        self.placement = placement or load_placement_tables()
+
+        # World layers, indexed [x, y] like WorldGenerator.world_data
+        self.elevation = None
+        self.temperature = None
+        self.humidity = None
+        self.terrain = None
+        self.resources = None
+        self.fertility = None
+        self.vegetation = None
+        self.flow_accumulation = None
+        self.stats = None
+        self.navigation = None
+        self.spawn_score = None
+
+    def tile_random(self, phase, draw):
+        """Per-tile uniform draws for the whole map; replaces the engine's global randf() stream"""
+        return tile_random(self.seed, phase, draw, self.x0, self.x0 + self.width, self.y0, self.y0 + self.height)
+
+    def coordinates(self):
+        return np.meshgrid(np.arange(self.x0, self.x0 + self.width), np.arange(self.y0, self.y0 + self.height),
+                           indexing="ij")
+
+    def bake(self, verbose=False, stats=True):
+        """Run every generation phase in the same order as generate_world_async"""
+        phases = [
+            ("elevation", self.generate_elevation_map),
+            ("climate", self.generate_climate_map),
+            ("terrain", self.generate_terrain_types),
+            ("resources", self.generate_resources),
+            ("rivers", self.generate_rivers),
+            ("vegetation", self.generate_vegetation),
+            ("stats", self.compute_stats)
+        ]
+        if not stats:
+            phases.pop()
+        for name, phase in phases:
+            start = time.perf_counter()
+            phase()
+            if verbose:
+                print(f"  {name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+        return self
+
+    def generate_elevation_map(self):
+        x, y = self.coordinates()
+        self.elevation = (self.elevation_noise.get_noise_2d(x, y) + 1.0) / 2.0
+
+    def generate_climate_map(self):
+        x, y = self.coordinates()
+        temperature = (self.temperature_noise.get_noise_2d(x, y) + 1.0) / 2.0
+        humidity = (self.humidity_noise.get_noise_2d(x, y) + 1.0) / 2.0
+
+        # Higher is colder, and so are the poles
+        temperature -= self.elevation * 0.3
+        half_height = self.world_height / 2.0
+        temperature -= (np.abs(y - half_height) / half_height) * 0.4
+
+        self.temperature = np.clip(temperature, 0.0, 1.0)
+        self.humidity = np.clip(humidity, 0.0, 1.0)
+
+    def generate_terrain_types(self):
+        self.terrain = classify_terrain(self.elevation, self.temperature, self.humidity)
+
+    def generate_resources(self):
+        x, y = self.coordinates()
+        resource_value = self.resource_noise.get_noise_2d(x, y)
+        shape = self.elevation.shape
+
+        placed = resource_value > (1.0 - self.params["resource_density"])
+        tables = self.placement["resources"]
+
+        fertility = self.tile_random("resources", 0)
+        multipliers = np.ones(len(TERRAIN_TYPES))
+        for terrain_name, multiplier in tables.get("fertility_multiplier", {}).items():
+            multipliers[TERRAIN[terrain_name]] = multiplier
+        fertility *= np.where(placed, multipliers[self.terrain], 1.0)
+
+        self.resources = self.place(tables["chances"], RESOURCE_TYPES, placed, "resources")
+        self.fertility = fertility
+
+    def generate_rivers(self):
+        """Rivers from D8 flow routing over the pit-filled elevation map
+
+        Sea tiles and the map edge are outlets. Every tile whose flow
+        accumulation reaches a threshold becomes river, with the threshold
+        picked so the river network has river_count sources unless
+        river_accumulation fixes it.
+        """
+        outlets = self.elevation < SEA_LEVEL
+        outlets[[0, -1], :] = True
+        outlets[:, [0, -1]] = True
+
+        filled = fill_pits(self.elevation, outlets)
+        receivers = d8_flow_directions(filled, outlets)
+        self.flow_accumulation = flow_accumulation(receivers)
+
+        land = ~outlets
+        threshold = self.params["river_accumulation"]
+        if threshold is None:
+            threshold = river_threshold(self.flow_accumulation, receivers, land, self.params["river_count"])
+        rivers = land & (self.flow_accumulation >= threshold)
+
+        self.terrain[rivers] = TERRAIN["water"]
+        self.resources[rivers] = RESOURCE_BITS["fish"]
+
+    def generate_vegetation(self):
+        grows = self.tile_random("vegetation", 0) < self.params["vegetation_density"] * self.fertility
+        self.vegetation = self.place(self.placement["vegetation"]["chances"], VEGETATION_TYPES, grows, "vegetation")
+
+    def place(self, chances, names, mask, phase):
+        """Bitset of items placed on masked tiles from a per-terrain chance table
+
+        Slot i of a terrain's list rolls against draw i + 1 of the phase, so
+        items on one tile roll independently, like separate randf() calls.
+        """
+        probabilities, bits = placement_table(chances, names)
+        placed = np.zeros(self.terrain.shape, dtype=np.uint8)
+        for slot in range(probabilities.shape[1]):
+            hits = mask & (self.tile_random(phase, slot + 1) < probabilities[self.terrain, slot])
+            placed |= np.where(hits, bits[self.terrain, slot], 0).astype(np.uint8)
+        return placed
+
+    def compute_stats(self):
+        self.stats = world_stats(self.terrain, self.resources, self.vegetation, {
+            "elevation": self.elevation,
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "fertility": self.fertility
+        })
+
+    def get_world_stats(self):
+        """WorldGenerator.get_world_stats, plus histograms and per-biome breakdowns"""
+        if self.stats is None:
+            self.compute_stats()
+        return self.stats
+
+    def get_navigation(self):
+        """HPA* graph over the movement costs, see world_nav.py"""
+        if self.navigation is None:
+            self.navigation = navigation_meta(movement_costs(self.terrain, TERRAIN_TYPES))
+        return self.navigation
+
+    def get_spawn_score(self):
+        """Spawn suitability (0-1) of every tile, see world_spawn.py"""
+        if self.spawn_score is None:
+            self.spawn_score = spawn_suitability(self.terrain, self.resources, self.fertility, self.elevation,
+                                                 TERRAIN_TYPES, RESOURCE_TYPES, SEA_LEVEL)
+        return self.spawn_score
+
+    def layers(self):
+        """Baked layers by name, in the dtypes stored in world files"""
+        layers = {
+            "terrain": self.terrain,
+            "elevation": self.elevation,
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "fertility": self.fertility,
+            "resources": self.resources,
+            "vegetation": self.vegetation,
+            **fire_layers(self.terrain, self.vegetation),
+            **navigation_layers(self.terrain, TERRAIN_TYPES),
+            **spawn_layers(self.get_spawn_score())
+        }
+        return {name: layers[name].astype(dtype, copy=False) for name, dtype in LAYER_DTYPES.items()}
+
+    def meta(self):
+        return {
+            "params": self.params,
+            "baker_version": BAKER_VERSION,
+            "terrain_types": TERRAIN_TYPES,
+            "resource_types": RESOURCE_TYPES,
+            "vegetation_types": VEGETATION_TYPES,
+            "flammability_bits": FLAMMABILITY_BITS,
+            "placement": self.placement,
+            "stats": self.get_world_stats(),
+            "navigation": self.get_navigation(),
+            "spawn_sites": rank_sites(self.get_spawn_score(), origin=(self.x0, self.y0))
+        }
+
+    def save(self, output_file):
+        """Save the baked world in the binary format WorldGenerator.load_baked_world reads"""
+        return write_world(output_file, self.width, self.height, self.layers(), self.meta())
+
+
+def _bake_chunk(job):
+    store_path, params, placement, chunk_x, chunk_y, halo = job
+    store = ChunkStore(store_path, "r+")
+    x0, y0, x1, y1 = store.chunk_bounds(chunk_x, chunk_y)
+    hx0, hy0 = max(x0 - halo, 0), max(y0 - halo, 0)
+    hx1, hy1 = min(x1 + halo, store.width), min(y1 + halo, store.height)
+
+    baker = WorldBaker(params, region=(hx0, hy0, hx1 - hx0, hy1 - hy0), placement=placement).bake(stats=False)
+    core = (slice(x0 - hx0, x1 - hx0), slice(y0 - hy0, y1 - hy0))
+    layers = {name: array[core] for name, array in baker.layers().items()}
+    store.write_chunk(chunk_x, chunk_y, layers)
+
+    # Partial sums for the world stats; merged once every chunk is in
+    partial = {
+        **stats_partial(layers["terrain"], layers["resources"], layers["vegetation"],
+                        {name: getattr(baker, name)[core] for name in ["elevation", "temperature", "humidity", "fertility"]}),
+        # bake_chunked keeps the halo at least the spawn radius, so core scores match a whole-world bake
+        "spawn_sites": rank_sites(baker.get_spawn_score()[core], origin=(x0, y0))
+    }
+    return chunk_x, chunk_y, partial
+
+
+def bake_chunked(output_dir, params=None, preset=None, chunk_size=DEFAULT_CHUNK_SIZE, halo=DEFAULT_HALO,
+                 workers=None, verbose=False, placement=None):
+    """Bake a world chunk by chunk across worker processes into a chunk store
+
+    Each worker bakes one chunk plus a halo and writes the chunk straight
+    into the memory-mapped store, so memory stays bounded by the chunk size
+    however large the world. Rivers only see the chunk and its halo, so they
+    use a fixed river_accumulation threshold. Re-running with the same
+    params resumes, skipping chunks the index already marks baked.
+    """
+    if halo < DEFAULT_SPAWN_RADIUS:
+        raise ValueError(f"A halo of {halo} tiles is smaller than the spawn radius of {DEFAULT_SPAWN_RADIUS}")
+    params = resolve_params(params, preset)
+    placement = placement or load_placement_tables()
+    if params["river_accumulation"] is None:
+        params["river_accumulation"] = DEFAULT_CHUNK_RIVER_ACCUMULATION
+    width, height = params["world_size"]
+    output_dir = Path(output_dir)
+
+    meta = {
+        "params": params,
+        "halo": halo,
+        "terrain_types": TERRAIN_TYPES,
+        "resource_types": RESOURCE_TYPES,
+        "vegetation_types": VEGETATION_TYPES,
+        "flammability_bits": FLAMMABILITY_BITS,
+        "placement": placement
+    }
+    try:
+        store = ChunkStore(output_dir, "r+")
+        if (store.meta.get("params") != params or store.meta.get("placement") != placement
+                or store.chunk_size != chunk_size):
+            raise ChunkStoreError(f"{output_dir} holds a different world; remove it or choose another output")
+    except ChunkStoreError:
+        if (output_dir / "index.json").exists():
+            raise
+        store = ChunkStore.create(output_dir, width, height, chunk_size, LAYER_DTYPES, meta)
+
+    partials = store.meta.setdefault("partial_stats", {})
+    jobs = [(str(output_dir), params, placement, chunk_x, chunk_y, halo)
+            for chunk_x in range(store.chunks_x) for chunk_y in range(store.chunks_y)
+            if not store.baked[chunk_x, chunk_y]]
+
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        for done, (chunk_x, chunk_y, partial) in enumerate(pool.imap_unordered(_bake_chunk, jobs), 1):
+            store.mark_baked(chunk_x, chunk_y)
+            partials[f"{chunk_x},{chunk_y}"] = {key: np.asarray(value).tolist() for key, value in partial.items()}
+            # Save progress now and then so an interrupted bake can resume
+            if done % 16 == 0 or done == len(jobs):
+                store.save_index()
+            if verbose:
+                print(f"  chunk {chunk_x},{chunk_y} ({done}/{len(jobs)}, {time.perf_counter() - start:.1f}s)")
+
+    store.meta["stats"] = merge_chunk_stats(partials.values(), width * height)
+    store.meta["spawn_sites"] = merge_sites(site for partial in partials.values() for site in partial["spawn_sites"])
+    merge_chunk_regions(store)
+    store.save_index()
+    return store
+
+
+def _local_regions(store, chunk_x, chunk_y):
+    """A chunk's region labels renumbered 1..n, keeping 0 for impassable tiles"""
+    labels = store.chunk(chunk_x, chunk_y, ["region"])["region"]
+    values, inverse = np.unique(labels, return_inverse=True)
+    return inverse.reshape(labels.shape) + (0 if values[0] == 0 else 1)
+
+
+def merge_chunk_regions(store):
+    """Relabel chunk-local region layers into world-wide regions
+
+    Chunks label regions on their own, so a region crossing chunk edges has
+    a different label in each chunk. Labels are joined wherever passable
+    tiles touch across an edge, then every chunk is rewritten one at a time,
+    so only chunk edges are held in memory. Running it again on merged
+    labels gives the same result.
+    """
+    chunks = [(chunk_x, chunk_y) for chunk_x in range(store.chunks_x) for chunk_y in range(store.chunks_y)]
+    bases, counts, edges = {}, {}, {}
+    total = 0
+    for chunk in chunks:
+        labels = _local_regions(store, *chunk)
+        bases[chunk] = total
+        counts[chunk] = int(labels.max())
+        total += counts[chunk] + 1
+        # Right, bottom, left and top edges
+        edges[chunk] = (labels[-1, :], labels[:, -1], labels[0, :], labels[:, 0])
+
+    u, v = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for chunk_x, chunk_y in chunks:
+        for neighbour, side in [((chunk_x + 1, chunk_y), 0), ((chunk_x, chunk_y + 1), 1)]:
+            if neighbour not in edges:
+                continue
+            edge, facing = edges[chunk_x, chunk_y][side], edges[neighbour][side + 2]
+            touching = (edge > 0) & (facing > 0)
+            u.append(bases[chunk_x, chunk_y] + edge[touching])
+            v.append(bases[neighbour] + facing[touching])
+
+    roots = connected_components(total, np.concatenate(u), np.concatenate(v))
+    passable = np.concatenate([bases[chunk] + np.arange(1, counts[chunk] + 1) for chunk in chunks])
+    passable_roots = np.unique(roots[passable])
+    region_of_root = np.zeros(total, dtype=np.uint32)
+    region_of_root[passable_roots] = np.arange(1, len(passable_roots) + 1)
+
+    for chunk in chunks:
+        labels = _local_regions(store, *chunk)
+        merged = np.where(labels > 0, region_of_root[roots[bases[chunk] + labels]], 0)
+        store.write_chunk(*chunk, {"region": merged.astype(np.uint32)})
+    store.meta["region_count"] = int(len(passable_roots))
+
+
+def stats_partial(terrain, resources, vegetation, climate):
+    """Counts, sums and per-terrain ranges of part of a world, for merge_chunk_stats to add up
+
+    Everything merges exactly but the float sums, so stats merged from
+    chunks match one partial of the whole world up to rounding.
+    """
+    terrain = np.asarray(terrain).ravel()
+    resources = np.asarray(resources).ravel()
+    terrain_counts = np.bincount(terrain, minlength=len(TERRAIN_TYPES))
+    partial = {
+        "terrain": terrain_counts,
+        "resources": _bit_counts(resources, RESOURCE_TYPES),
+        "vegetation": _bit_counts(vegetation, VEGETATION_TYPES),
+        "vegetated": int(np.count_nonzero(vegetation)),
+        "resourced": int(np.count_nonzero(resources)),
+        # Tiles of each terrain carrying each resource
+        "resource_terrain": np.stack([np.bincount(terrain[(resources >> bit) & 1 == 1], minlength=len(TERRAIN_TYPES))
+                                      for bit in range(len(RESOURCE_TYPES))])
+    }
+
+    # Group tiles by terrain once, then reduce each group's slice
+    order = np.argsort(terrain, kind="stable")
+    present = np.flatnonzero(terrain_counts)
+    starts = np.concatenate([[0], np.cumsum(terrain_counts)[:-1]])[present]
+    for name, values in climate.items():
+        values = np.asarray(values, dtype=np.float32).ravel()
+        grouped = values[order]
+        # Per terrain, left at 0 for terrains this part doesn't have
+        minimums = np.zeros(len(TERRAIN_TYPES), dtype=np.float32)
+        maximums = np.zeros(len(TERRAIN_TYPES), dtype=np.float32)
+        minimums[present] = np.minimum.reduceat(grouped, starts)
+        maximums[present] = np.maximum.reduceat(grouped, starts)
+        partial[name] = float(values.sum())
+        partial[f"{name}_histogram"] = np.bincount(
+            np.clip((values * STATS_HISTOGRAM_BINS).astype(np.int64), 0, STATS_HISTOGRAM_BINS - 1),
+            minlength=STATS_HISTOGRAM_BINS)
+        partial[f"{name}_min"] = minimums
+        partial[f"{name}_max"] = maximums
+        partial[f"{name}_sums"] = np.bincount(terrain, weights=values, minlength=len(TERRAIN_TYPES))
+    return partial
+
+
+def merge_chunk_stats(partials, total_tiles):
+    """world_stats from the stats_partial of every part of a world"""
+    partials = list(partials)
+
+    def total(key):
+        return np.sum([np.asarray(partial[key]) for partial in partials], axis=0)
+
+    terrain = total("terrain")
+    resources = total("resources")
+    vegetation = total("vegetation")
+    stats = {
+        "total_tiles": total_tiles,
+        "terrain_counts": {name: int(count) for name, count in zip(TERRAIN_TYPES, terrain) if count},
+        "resource_counts": {name: int(count) for name, count in zip(RESOURCE_TYPES, resources) if count},
+        "vegetation_counts": {name: int(count) for name, count in zip(VEGETATION_TYPES, vegetation) if count},
+        # Tiles with any vegetation; a tile can carry several types
+        "vegetated_tiles": int(total("vegetated"))
+    }
+    for name in ["elevation", "temperature", "humidity"]:
+        stats[f"avg_{name}"] = float(total(name)) / total_tiles
+
+    climate = [key[:-len("_histogram")] for key in partials[0] if key.endswith("_histogram")]
+    stats["histograms"] = {name: total(f"{name}_histogram").tolist() for name in climate}
+
+    biomes = {name: {"tiles": int(count), "fraction": float(count / total_tiles)}
+              for name, count in zip(TERRAIN_TYPES, terrain) if count}
+    for climate_name in climate:
+        sums = total(f"{climate_name}_sums")
+        for index in np.flatnonzero(terrain):
+            having = [partial for partial in partials if partial["terrain"][index]]
+            biomes[TERRAIN_TYPES[index]][climate_name] = {
+                "min": float(min(partial[f"{climate_name}_min"][index] for partial in having)),
+                "max": float(max(partial[f"{climate_name}_max"][index] for partial in having)),
+                "mean": float(sums[index] / terrain[index])
+            }
+    stats["biomes"] = biomes
+
+    # Coverage: share of all tiles, and which terrains each resource sits on
+    per_terrain = total("resource_terrain")
+    stats["resource_coverage"] = {
+        "any": float(total("resourced") / total_tiles),
+        **{name: {"fraction": float(resources[bit] / total_tiles),
+                  "terrain": {TERRAIN_TYPES[t]: int(count) for t, count in enumerate(per_terrain[bit]) if count}}
+           for bit, name in enumerate(RESOURCE_TYPES) if resources[bit]}
+    }
+    return stats
+
+
+def _bit_counts(bitsets, names):
+    """Tiles with each bit set, from one bincount over the byte values"""
+    by_value = np.bincount(np.asarray(bitsets).ravel(), minlength=256)
+    bits = (np.arange(256)[:, None] >> np.arange(len(names))) & 1
+    return by_value @ bits
+
+
+def world_stats(terrain, resources, vegetation, climate):
+    """Summary statistics for a baked world, all from bincounts and reductions
+
+    Includes everything WorldGenerator.get_world_stats reports, plus value
+    histograms, per-terrain climate ranges and resource coverage. Chunked
+    bakes merge the same fields from per-chunk partials.
+    """
+    return merge_chunk_stats([stats_partial(terrain, resources, vegetation, climate)], np.asarray(terrain).size)
+
+
+def fire_layers(terrain, vegetation):
+    """Flammability bitmask and fuel load (0-255) for every tile
+
+    Any nonzero flammability is flammable, so fire code can do one array
+    lookup instead of decoding the terrain name and vegetation list.
+    """
+    terrain = np.asarray(terrain)
+    vegetation = np.asarray(vegetation)
+
+    flammable_terrain = np.zeros(len(TERRAIN_TYPES), dtype=bool)
+    flammable_terrain[[TERRAIN[name] for name in FLAMMABLE_TERRAIN]] = True
+    flammability = np.where(flammable_terrain[terrain], FLAMMABILITY_BITS["terrain"], 0).astype(np.uint8)
+    flammability[vegetation != 0] |= FLAMMABILITY_BITS["vegetation"]
+
+    # Lookup tables over the terrain enum and every vegetation bitset value
+    terrain_fuel = np.array([TERRAIN_FUEL.get(name, 0) for name in TERRAIN_TYPES], dtype=np.int32)
+    bit_fuel = np.array([VEGETATION_FUEL.get(name, 0) for name in VEGETATION_TYPES], dtype=np.int32)
+    bitsets = np.arange(256)
+    vegetation_fuel = ((bitsets[:, None] >> np.arange(len(VEGETATION_TYPES))) & 1) @ bit_fuel
+    fuel_load = np.minimum(terrain_fuel[terrain] + vegetation_fuel[vegetation], 255).astype(np.uint8)
+
+    return {"flammability": flammability, "fuel_load": fuel_load}
+
+
+def derive_world(layers):
+    """(layers, meta) a whole world derives from its other layers, as WorldBaker bakes them
+
+    For worlds edited after baking. Stats come from the stored float16
+    climate layers, so they can differ from the baker's in the last digits.
+    """
+    terrain, resources, vegetation = layers["terrain"], layers["resources"], layers["vegetation"]
+    climate = {name: np.asarray(layers[name], dtype=np.float32)
+               for name in ["elevation", "temperature", "humidity", "fertility"]}
+    score = spawn_suitability(terrain, resources, climate["fertility"], climate["elevation"],
+                              TERRAIN_TYPES, RESOURCE_TYPES, SEA_LEVEL)
+    derived = {
+        **fire_layers(terrain, vegetation),
+        **navigation_layers(terrain, TERRAIN_TYPES),
+        **spawn_layers(score)
+    }
+    meta = {
+        "stats": world_stats(terrain, resources, vegetation, climate),
+        "navigation": navigation_meta(derived["move_cost"]),
+        "spawn_sites": rank_sites(score)
+    }
+    return {name: derived[name].astype(LAYER_DTYPES[name], copy=False) for name in DERIVED_LAYERS}, meta
+
+
+def _classify_terrain_rules(elevation, temperature, humidity):
+    """WorldGenerator.determine_terrain_type_advanced as vectorized comparisons"""
+    conditions = [
+        elevation < SEA_LEVEL,
+        (elevation > 0.8) & (temperature < 0.3),
+        elevation > 0.8,
+        (elevation > 0.7) & (temperature > 0.8),
+        temperature < 0.2,
+        (temperature < 0.4) & (humidity > 0.6),
+        temperature < 0.4,
+        (temperature < 0.7) & (humidity > 0.7),
+        (temperature < 0.7) & (humidity > 0.4),
+        temperature < 0.7,
+        humidity > 0.8,
+        humidity > 0.3
+    ]
+    choices = ["water", "snow", "mountain", "volcanic", "snow", "forest", "grass",
+               "forest", "grass", "desert", "swamp", "grass"]
+    return np.select(conditions, [TERRAIN[name] for name in choices], TERRAIN["desert"]).astype(np.uint8)
+
+
+def biome_bins(values, thresholds):
+    """Bin index of each value: 2i for values strictly between thresholds i-1
+    and i, 2i + 1 for values equal to threshold i
+
+    Thresholds are compared with both < and >, so a value sitting exactly on
+    one needs its own bin for the table to match the comparisons exactly.
+    """
+    bins = np.zeros(np.shape(values), dtype=np.intp)
+    for threshold in thresholds:
+        bins += values >= threshold
+        bins += values > threshold
+    return bins
+
+
+def _bin_representatives(thresholds):
+    """One value inside every bin biome_bins can return"""
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    bounds = np.concatenate([[thresholds[0] - 1.0], thresholds, [thresholds[-1] + 1.0]])
+    between = (bounds[:-1] + bounds[1:]) / 2.0
+    values = np.empty(2 * len(thresholds) + 1)
+    values[0::2] = between
+    values[1::2] = thresholds
+    return values
+
+
+def build_biome_lut():
+    """Terrain enum for every (elevation, temperature, humidity) bin
+
+    Built by running the comparison rules once per bin, so it agrees with
+    them everywhere, including exactly on the thresholds.
+    """
+    axes = [_bin_representatives(BIOME_THRESHOLDS[name]) for name in ["elevation", "temperature", "humidity"]]
+    return _classify_terrain_rules(*np.meshgrid(*axes, indexing="ij"))
+
+
+BIOME_LUT = build_biome_lut()
+
+
+def classify_terrain(elevation, temperature, humidity):
+    """Vectorized WorldGenerator.determine_terrain_type_advanced, as one table lookup"""
+    _, temperature_bins, humidity_bins = BIOME_LUT.shape
+    index = biome_bins(elevation, BIOME_THRESHOLDS["elevation"]) * temperature_bins
+    index += biome_bins(temperature, BIOME_THRESHOLDS["temperature"])
+    index *= humidity_bins
+    index += biome_bins(humidity, BIOME_THRESHOLDS["humidity"])
+    return BIOME_LUT.ravel()[index]
+
+
+def export_biome_lut(output_file=BIOME_LUT_FILE):
+    """Write the biome table as JSON for WorldGenerator to load
+
+    The table is flattened elevation-major, with terrain names rather than
+    enum values so the game does not depend on TERRAIN_TYPES order.
+    """
+    lut = {
+        "thresholds": BIOME_THRESHOLDS,
+        "shape": list(BIOME_LUT.shape),
+        "terrain": [TERRAIN_TYPES[value] for value in BIOME_LUT.ravel()]
+    }
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w") as f:
+        json.dump(lut, f, indent=2)
+    return output_file
+
+
+def _fill_sweep(filled, elevation, outlets, epsilon):
+    """One Gauss-Seidel pass along axis 0, pulling levels from the previous row"""
+    changed = False
+    for x in range(1, filled.shape[0]):
+        previous = filled[x - 1]
+        lowest = previous.copy()
+        np.minimum(lowest[1:], previous[:-1], out=lowest[1:])
+        np.minimum(lowest[:-1], previous[1:], out=lowest[:-1])
+        candidate = np.maximum(elevation[x], lowest + epsilon)
+        row = filled[x]
+        lower = (candidate < row) & ~outlets[x]
+        if lower.any():
+            row[lower] = candidate[lower]
+            changed = True
+    return changed
+
+
+def fill_pits(elevation, outlets, epsilon=1e-6):
+    """Raise every pit to its spill level so all land drains to an outlet
+
+    Computes the Priority-Flood+epsilon surface as a fixed point, using
+    row-by-row sweeps in the four axis directions. Each sweep carries spill
+    levels any distance along its direction, so a handful of rounds
+    converge even on 1024x1024 maps. Filled flats slope by epsilon per
+    tile towards their outlet.
+    """
+    filled = np.where(outlets, elevation, np.inf)
+    views = [
+        (filled, elevation, outlets),
+        (filled[::-1], elevation[::-1], outlets[::-1]),
+        (filled.T, elevation.T, outlets.T),
+        (filled.T[::-1], elevation.T[::-1], outlets.T[::-1])
+    ]
+    changed = True
+    while changed:
+        changed = False
+        for view in views:
+            changed |= _fill_sweep(*view, epsilon)
+    return filled
+
+
+def d8_flow_directions(filled, outlets):
+    """Flat index of each tile's steepest-descent neighbour, or -1 for outlets"""
+    width, height = filled.shape
+    padded = np.pad(filled, 1, constant_values=np.inf)
+    x, y = np.meshgrid(np.arange(width), np.arange(height), indexing="ij")
+    steepest = np.zeros(filled.shape)
+    receivers = np.full(filled.shape, -1, dtype=np.int64)
+    for dx, dy in D8_OFFSETS:
+        neighbour = padded[1 + dx:1 + dx + width, 1 + dy:1 + dy + height]
+        slope = (filled - neighbour) / np.hypot(dx, dy)
+        steeper = slope > steepest
+        steepest[steeper] = slope[steeper]
+        receivers[steeper] = ((x + dx) * height + (y + dy))[steeper]
+    receivers[outlets] = -1
+    return receivers
+
+
+def flow_accumulation(receivers):
+    """Number of tiles draining through each tile (itself included)
+
+    Processes tiles in upstream-to-downstream waves: a tile joins the
+    frontier once all its donors are done, so the total work is linear in
+    the number of tiles.
+    """
+    downstream = receivers.ravel()
+    count = downstream.size
+    accumulation = np.ones(count)
+    pending = np.bincount(downstream[downstream >= 0], minlength=count)
+    frontier = np.nonzero(pending == 0)[0]
+    while frontier.size:
+        targets = downstream[frontier]
+        drains = targets >= 0
+        frontier, targets = frontier[drains], targets[drains]
+        np.add.at(accumulation, targets, accumulation[frontier])
+        np.subtract.at(pending, targets, 1)
+        targets = np.unique(targets)
+        frontier = targets[pending[targets] == 0]
+    return accumulation.reshape(receivers.shape)
+
+
+def river_threshold(accumulation, receivers, land, river_count):
+    """Smallest accumulation threshold giving at most river_count river sources
+
+    A land tile is a source at threshold T when its accumulation reaches T
+    but none of its donors' does, i.e. for T in (max donor accumulation,
+    own accumulation]. Counting those intervals for every candidate T is
+    two sorted searches.
+    """
+    if river_count <= 0 or not land.any():
+        return np.inf
+
+    downstream = receivers.ravel()
+    flat_accumulation = accumulation.ravel()
+    max_donor = np.zeros(downstream.size)
+    drains = downstream >= 0
+    np.maximum.at(max_donor, downstream[drains], flat_accumulation[drains])
+
+    land = land.ravel()
+    own = np.sort(flat_accumulation[land])
+    donor = np.sort(max_donor[land])
+    candidates = np.unique(own)
+    sources = ((own.size - np.searchsorted(own, candidates, side="left"))
+               - (donor.size - np.searchsorted(donor, candidates, side="left")))
+    allowed = np.nonzero(sources <= river_count)[0]
+    return candidates[allowed[0]] if allowed.size else np.inf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake a world offline with the WorldGenerator pipeline")
+    parser.add_argument("--size", type=int, help="World width and height in tiles")
+    parser.add_argument("--seed", type=int, help="World seed")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="WorldGenUI preset to start from")
+    for name in ["temperature_scale", "humidity_scale", "elevation_scale", "resource_density", "vegetation_density"]:
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, type=float)
+    parser.add_argument("--river-count", dest="river_count", type=int)
+    parser.add_argument("--river-accumulation", dest="river_accumulation", type=int,
+                        help="Flow accumulation that makes a river (default: from river count)")
+    parser.add_argument("-o", "--output", help="Output file (default: data/worlds/world_<seed>_<size>.world)")
+    parser.add_argument("--placement", help="Resource/vegetation chance tables (default: data/placement_tables.json)")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Bake chunk by chunk into a memory-mapped chunk store directory, for huge worlds")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Tiles per chunk side (chunked)")
+    parser.add_argument("--halo", type=int, default=DEFAULT_HALO, help="Extra tiles baked around chunks (chunked)")
+    parser.add_argument("--workers", type=int, help="Worker processes (chunked; default: one per CPU)")
+    parser.add_argument("--export-biome-lut", nargs="?", const=BIOME_LUT_FILE, metavar="FILE",
+                        help="Write the biome lookup table for the game and exit")
+    args = parser.parse_args()
+
+    if args.export_biome_lut:
+        saved = export_biome_lut(args.export_biome_lut)
+        print(f"✅ Biome lookup table {'x'.join(map(str, BIOME_LUT.shape))} saved to {saved}")
+        return 0
+
+    params = {key: value for key, value in vars(args).items()
+              if key in DEFAULT_PARAMS and value is not None}
+    if args.size:
+        params["world_size"] = args.size
+    placement = load_placement_tables(args.placement) if args.placement else None
+
+    if args.chunked:
+        resolved = resolve_params(params, args.preset)
+        width, height = resolved["world_size"]
+        output = args.output or Path(DEFAULT_OUTPUT_DIR) / f"world_{resolved['seed']}_{width}.chunks"
+        print(f"🌍 Baking {width}x{height} world in {args.chunk_size}-tile chunks...")
+        start = time.perf_counter()
+        store = bake_chunked(output, params, args.preset, args.chunk_size, args.halo, args.workers, verbose=True,
+                             placement=placement)
+        print(f"✅ {store.baked.size} chunks in {output} ({time.perf_counter() - start:.2f}s)")
+        return 0
+
+    print("🌍 Baking world...")
+    start = time.perf_counter()
+    baker = WorldBaker(params, args.preset, placement=placement).bake(verbose=True)
+    print(f"✅ Baked {baker.width}x{baker.height} in {time.perf_counter() - start:.2f}s")
+
+    output = args.output or Path(DEFAULT_OUTPUT_DIR) / f"world_{baker.params['seed']}_{baker.width}.world"
+    saved = baker.save(output)
+    print(f"✅ World saved to {saved}")
+
+    stats = baker.get_world_stats()
+    for terrain, count in stats["terrain_counts"].items():
+        print(f"   - {terrain}: {count} ({count / stats['total_tiles'] * 100:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
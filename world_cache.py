@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+World Cache
+On-disk cache of baked worlds keyed by a hash of the generation params and
+the baker version, evicting least recently used worlds past a size limit.
+WorldGenerator reads the same index to load cached worlds instead of
+generating them, so pre-baking the built-in presets makes them instant.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from world_baker import BAKER_VERSION, DEFAULT_PARAMS, PLACEMENT_TABLES_FILE, PRESETS, WorldBaker, load_placement_tables, resolve_params
+
+DEFAULT_CACHE_DIR = "oneiric-parallax/data/worlds/cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_FILE = "index.json"
+
+# Every set_generation_params field, in key order
+KEY_FIELDS = ["temperature_scale", "humidity_scale", "elevation_scale", "resource_density", "vegetation_density",
+              "river_count"]
+
+
+def cache_key_text(params):
+    """Canonical text the cache key hashes
+
+    WorldGenerator.cache_key builds the same string, so floats are written
+    with a fixed precision both sides format identically.
+    """
+    params = resolve_params(params)
+    width, height = params["world_size"]
+    fields = [f"v{BAKER_VERSION}", f"seed={int(params['seed'])}", f"size={width}x{height}"]
+    for name in KEY_FIELDS:
+        value = params[name]
+        fields.append(f"{name}={int(value)}" if name == "river_count" else f"{name}={float(value):.6f}")
+    if params.get("river_accumulation") is not None:
+        # Never set by the game, so only part of the key when used
+        fields.append(f"river_accumulation={int(params['river_accumulation'])}")
+    return "|".join(fields)
+
+
+def cache_key(params):
+    return hashlib.sha256(cache_key_text(params).encode("utf-8")).hexdigest()
+
+
+def placement_digest(placement=None):
+    """Hash of the placement tables a world was baked with
+
+    The project's own tables hash as the bytes of placement_tables.json,
+    which WorldGenerator.find_cached_world checks with FileAccess.get_sha256;
+    any other tables hash as their JSON text and never match in the game.
+    """
+    if placement is None or placement == load_placement_tables():
+        return hashlib.sha256(PLACEMENT_TABLES_FILE.read_bytes()).hexdigest()
+    return hashlib.sha256(json.dumps(placement, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class WorldCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.index_file = self.root / INDEX_FILE
+        self.entries = {}
+        if self.index_file.exists():
+            with open(self.index_file) as f:
+                self.entries = json.load(f).get("worlds", {})
+
+    def save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        index = {"baker_version": BAKER_VERSION, "worlds": self.entries}
+        temporary = self.index_file.with_suffix(".tmp")
+        with open(temporary, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        temporary.replace(self.index_file)
+
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def get(self, params, placement=None):
+        """Path of the cached world for params, or None on a miss"""
+        key = cache_key(params)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        path = self.root / entry["file"]
+        if not path.exists() or entry.get("placement") != placement_digest(placement):
+            return None
+        entry["last_used"] = time.time()
+        self.save_index()
+        return path
+
+    def put(self, baker):
+        """Save a baked world into the cache, then evict down to max_bytes"""
+        key = cache_key(baker.params)
+        path = baker.save(self.root / f"{key[:24]}.world")
+        self.entries[key] = {
+            "file": path.name,
+            "size": path.stat().st_size,
+            "key": cache_key_text(baker.params),
+            "params": baker.params,
+            "placement": placement_digest(baker.placement),
+            "created": time.time(),
+            "last_used": time.time()
+        }
+        self.evict(keep=key)
+        self.save_index()
+        return path
+
+    def get_or_bake(self, params=None, preset=None, placement=None):
+        """(path, hit) for the world with these params, baking it on a miss"""
+        params = resolve_params(params, preset)
+        path = self.get(params, placement)
+        if path is not None:
+            return path, True
+        return self.put(WorldBaker(params, placement=placement).bake()), False
+
+    def evict(self, max_bytes=None, keep=None):
+        """Remove least recently used worlds until the cache fits; returns the removed keys"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        removed = []
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if self.total_bytes() <= max_bytes:
+                break
+            if key == keep:
+                continue
+            (self.root / entry["file"]).unlink(missing_ok=True)
+            del self.entries[key]
+            removed.append(key)
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the baked world cache")
+    parser.add_argument("command", choices=["get", "prebake", "list", "evict", "clear"])
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024), help="Cache size limit")
+    parser.add_argument("--size", type=int, help="World width and height in tiles (get)")
+    parser.add_argument("--seed", type=int, help="World seed (get, prebake)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="WorldGenUI preset (get)")
+    args = parser.parse_args()
+
+    cache = WorldCache(args.cache, int(args.max_mb * 1024 * 1024))
+
+    if args.command == "get":
+        params = {"seed": args.seed, "world_size": args.size}
+        start = time.perf_counter()
+        path, hit = cache.get_or_bake(params, args.preset)
+        print(f"{'⚡ Hit' if hit else '🌍 Baked'}: {path} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    elif args.command == "prebake":
+        # The defaults are what Main generates on first launch; presets are what WorldGenUI offers
+        seed = args.seed if args.seed is not None else DEFAULT_PARAMS["seed"]
+        for name in [None] + sorted(PRESETS):
+            path, hit = cache.get_or_bake({"seed": seed}, name)
+            print(f"   - {name or 'Defaults'}: {path}{' (cached)' if hit else ''}")
+        print(f"✅ Cache holds {len(cache.entries)} worlds, {cache.total_bytes() / 1024:.0f} KiB")
+
+    elif args.command == "list":
+        for key, entry in sorted(cache.entries.items(), key=lambda item: -item[1]["last_used"]):
+            print(f"   - {entry['file']} {entry['size'] / 1024:.0f} KiB  {entry['key']}")
+        print(f"📦 {len(cache.entries)} worlds, {cache.total_bytes() / 1024:.0f} KiB of {args.max_mb:.0f} MiB")
+
+    elif args.command == "evict":
+        removed = cache.evict()
+        cache.save_index()
+        print(f"🧹 Evicted {len(removed)} worlds")
+
+    elif args.command == "clear":
+        removed = cache.evict(max_bytes=0)
+        cache.save_index()
+        print(f"🧹 Removed {len(removed)} worlds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
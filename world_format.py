@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Baked World Format
+Versioned struct-of-arrays binary files for baked worlds, read through
+numpy.memmap in Python and FileAccess.get_buffer in Godot
+
+Layout (all integers little-endian):
+    magic        4 bytes   b"OPWD"
+    version      uint16
+    layer_count  uint16
+    width        uint32
+    height       uint32
+    meta_size    uint32
+    meta         meta_size bytes of UTF-8 JSON (params, type names, stats)
+    directory    layer_count entries of:
+                     name    24 bytes, NUL padded ASCII
+                     dtype   4 bytes, NumPy dtype string such as "<f2", NUL padded
+                     offset  uint64, from the start of the file
+                     nbytes  uint64
+    layers       raw arrays, each starting on a 64-byte boundary
+
+Every layer is a width x height array stored x-major (index = x * height + y)
+to match WorldGenerator.world_data[x][y].
+"""
+
+import json
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"OPWD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+DIRECTORY_ENTRY = struct.Struct("<24s4sQQ")
+LAYER_ALIGNMENT = 64
+
+
+class WorldFormatError(Exception):
+    pass
+
+
+def _align(offset):
+    return (offset + LAYER_ALIGNMENT - 1) // LAYER_ALIGNMENT * LAYER_ALIGNMENT
+
+
+def write_world(path, width, height, layers, meta=None):
+    """Write layers (name -> width x height array) to a baked world file
+
+    Arrays are stored with their own dtype, converted to little-endian.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    meta_bytes = json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+    arrays = []
+    for name, array in layers.items():
+        array = np.asarray(array)
+        if array.shape != (width, height):
+            raise WorldFormatError(f"Layer {name} has shape {array.shape}, expected {(width, height)}")
+        if len(name.encode("ascii")) > 24:
+            raise WorldFormatError(f"Layer name too long: {name}")
+        arrays.append((name, np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))))
+
+    offset = HEADER.size + len(meta_bytes) + DIRECTORY_ENTRY.size * len(arrays)
+    directory = []
+    for name, array in arrays:
+        offset = _align(offset)
+        directory.append((name, array, offset))
+        offset += array.nbytes
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(arrays), width, height, len(meta_bytes)))
+        f.write(meta_bytes)
+        for name, array, layer_offset in directory:
+            f.write(DIRECTORY_ENTRY.pack(name.encode("ascii"), array.dtype.str.encode("ascii"),
+                                         layer_offset, array.nbytes))
+        for name, array, layer_offset in directory:
+            f.write(b"\0" * (layer_offset - f.tell()))
+            f.write(array.tobytes())
+
+    return path
+
+
+class WorldFile:
+    """Read-only view of a baked world file
+
+    Layers are memory-mapped, so opening a file costs only the header and
+    tiles are paged in as they are touched.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise WorldFormatError(f"{self.path} is too short to be a baked world")
+            magic, version, layer_count, width, height, meta_size = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise WorldFormatError(f"{self.path} is not a baked world file")
+            if version > FORMAT_VERSION:
+                raise WorldFormatError(f"{self.path} is format version {version}, "
+                                       f"this reader supports up to {FORMAT_VERSION}")
+
+            self.version = version
+            self.width = width
+            self.height = height
+            self.meta = json.loads(f.read(meta_size).decode("utf-8"))
+
+            self.directory = {}
+            for _ in range(layer_count):
+                name, dtype, offset, nbytes = DIRECTORY_ENTRY.unpack(f.read(DIRECTORY_ENTRY.size))
+                name = name.rstrip(b"\0").decode("ascii")
+                self.directory[name] = (np.dtype(dtype.rstrip(b"\0").decode("ascii")), offset, nbytes)
+
+        self._layers = {}
+
+    def __contains__(self, name):
+        return name in self.directory
+
+    def __getitem__(self, name):
+        """Memory-mapped width x height array for a layer"""
+        if name not in self._layers:
+            if name not in self.directory:
+                raise KeyError(name)
+            dtype, offset, nbytes = self.directory[name]
+            if nbytes != dtype.itemsize * self.width * self.height:
+                raise WorldFormatError(f"Layer {name} in {self.path} has the wrong size")
+            self._layers[name] = np.memmap(self.path, dtype=dtype, mode="r", offset=offset,
+                                           shape=(self.width, self.height))
+        return self._layers[name]
+
+    def layer_names(self):
+        return list(self.directory)
+
+
+def open_world(path):
+    return WorldFile(path)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python world_format.py <world file>")
+        return 1
+
+    world = open_world(sys.argv[1])
+    print(f"🌍 {world.path} (format v{world.version})")
+    print(f"   - Size: {world.width}x{world.height}")
+    for name, (dtype, offset, nbytes) in world.directory.items():
+        print(f"   - {name}: {dtype.str} @ {offset} ({nbytes / 1024:.1f} KiB)")
+    params = world.meta.get("params")
+    if params:
+        print(f"   - Params: {json.dumps(params)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+World Edit Journal
+Save format for worlds changed by play (fires, spawning, terraforming): a
+baked world snapshot plus an append-only journal of tile deltas, so a save
+appends a few kilobytes instead of rewriting every layer
+
+Layout of a save directory:
+    save.json                 generations: snapshot file, journal file and
+                              the sequence number each one starts after
+    snapshot-<gen>.world      baked world (world_format.py) at the start of
+                              a generation
+    journal-<gen>.log         tile deltas made since that snapshot
+
+Journal file (all integers little-endian):
+    magic        4 bytes   b"OPJL"
+    version      uint16
+    padding      2 bytes
+    generation   uint32
+    base_seq     uint64    sequence number of the last edit in the snapshot
+    records      one per edit:
+                     crc32       uint32 of everything after it in the record
+                     size        uint32, payload bytes
+                     seq         uint64
+                     time        float64, seconds since the epoch
+                     layer       uint8, index into the snapshot's layers
+                     padding     3 bytes
+                     payload     count uint32 tile indices (x * height + y)
+                                 then count values in the layer's dtype
+
+A record cut short by a crash fails its CRC and everything from it on is
+dropped when the save is next opened for writing. Compaction folds the
+journal into a new snapshot and starts a new generation; older generations
+are kept so any sequence number can still be replayed until they are pruned.
+
+Derived layers (fire, navigation, spawn score) and the stats, navigation
+graph and spawn sites in the meta are never journaled: they are recomputed
+from the edited layers when read, compacted or replayed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from world_baker import DERIVED_LAYERS, derive_world
+from world_format import open_world, write_world
+
+SAVE_FORMAT = "opsave"
+SAVE_VERSION = 1
+SAVE_FILE = "save.json"
+JOURNAL_MAGIC = b"OPJL"
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sH2xIQ")
+RECORD_HEADER = struct.Struct("<IIQdB3x")
+
+# Matches chunk_baker.DEFAULT_CHUNK_SIZE, so dirty chunks are the chunk textures to re-bake
+DEFAULT_CHUNK_SIZE = 16
+
+# Compact once the journal grows past this share of the snapshot
+DEFAULT_COMPACT_RATIO = 0.25
+
+
+class WorldSaveError(Exception):
+    pass
+
+
+def snapshot_name(generation):
+    return f"snapshot-{generation:06d}.world"
+
+
+def journal_name(generation):
+    return f"journal-{generation:06d}.log"
+
+
+def read_journal(path, layer_dtypes):
+    """(generation, base_seq, records, valid_bytes) for a journal file
+
+    Each record is (seq, time, layer index, tile indices, values). Reading
+    stops at the first torn or corrupt record; valid_bytes is where it starts.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < JOURNAL_HEADER.size:
+        raise WorldSaveError(f"{path} is too short to be a journal")
+    magic, version, generation, base_seq = JOURNAL_HEADER.unpack_from(data)
+    if magic != JOURNAL_MAGIC:
+        raise WorldSaveError(f"{path} is not a world journal")
+    if version > JOURNAL_VERSION:
+        raise WorldSaveError(f"{path} is journal version {version}, this reader supports up to {JOURNAL_VERSION}")
+
+    records = []
+    offset = JOURNAL_HEADER.size
+    while offset + RECORD_HEADER.size <= len(data):
+        crc, size, seq, stamp, layer = RECORD_HEADER.unpack_from(data, offset)
+        end = offset + RECORD_HEADER.size + size
+        if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc or layer >= len(layer_dtypes):
+            break
+        dtype = layer_dtypes[layer]
+        count = size // (4 + dtype.itemsize)
+        payload = offset + RECORD_HEADER.size
+        indices = np.frombuffer(data, dtype="<u4", count=count, offset=payload)
+        values = np.frombuffer(data, dtype=dtype, count=count, offset=payload + 4 * count)
+        records.append((seq, stamp, layer, indices, values))
+        offset = end
+    return generation, base_seq, records, offset
+
+
+class WorldSave:
+    """A save directory opened at its latest state
+
+    Layers are read from the snapshot's memory maps until a layer is first
+    edited, at which point that layer alone is copied into memory.
+    """
+
+    def __init__(self, path, writable=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = Path(path)
+        self.writable = writable
+        self.chunk_size = chunk_size
+        save_file = self.path / SAVE_FILE
+        if not save_file.exists():
+            raise WorldSaveError(f"{self.path} is not a world save")
+        with open(save_file) as f:
+            self.index = json.load(f)
+        if self.index.get("format") != SAVE_FORMAT:
+            raise WorldSaveError(f"{self.path} is not a world save")
+        if self.index["version"] > SAVE_VERSION:
+            raise WorldSaveError(f"{self.path} is save version {self.index['version']}, "
+                                 f"this reader supports up to {SAVE_VERSION}")
+
+        self.generation = self.index["generations"][-1]
+        self.snapshot = open_world(self.path / self.generation["snapshot"])
+        self.width, self.height = self.snapshot.width, self.snapshot.height
+        self.layer_names = self.snapshot.layer_names()
+        self.layer_dtypes = [self.snapshot.directory[name][0] for name in self.layer_names]
+        self.dirty = np.zeros((-(-self.width // chunk_size), -(-self.height // chunk_size)), dtype=bool)
+        self._layers = {}
+        self._derived = None
+
+        journal_file = self.path / self.generation["journal"]
+        _, _, records, valid_bytes = read_journal(journal_file, self.layer_dtypes)
+        self.seq = self.generation["base_seq"]
+        self.records = 0
+        for seq, _, layer, indices, values in records:
+            self._apply(self.layer_names[layer], indices, values)
+            self.seq = seq
+            self.records += 1
+
+        self._journal = None
+        if writable:
+            self._journal = open(journal_file, "r+b")
+            # Drop a torn record left by a crash so new records follow the last good one
+            self._journal.truncate(valid_bytes)
+            self._journal.seek(valid_bytes)
+
+    @classmethod
+    def create(cls, path, world_file, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Start a save from a baked world file"""
+        path = Path(path)
+        if (path / SAVE_FILE).exists():
+            raise WorldSaveError(f"{path} already holds a save")
+        path.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(world_file, path / snapshot_name(0))
+        with open(path / journal_name(0), "wb") as f:
+            f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, 0, 0))
+        index = {
+            "format": SAVE_FORMAT,
+            "version": SAVE_VERSION,
+            "generations": [{"generation": 0, "snapshot": snapshot_name(0), "journal": journal_name(0),
+                             "base_seq": 0, "created": time.time()}]
+        }
+        _write_index(path, index)
+        return cls(path, chunk_size=chunk_size)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def layer(self, name):
+        """Current width x height array for a layer; treat it as read-only and edit through set_tiles"""
+        if name in DERIVED_LAYERS and self._layers:
+            return self.derived()[0][name]
+        return self._layers.get(name, self.snapshot[name])
+
+    def meta(self):
+        """Snapshot meta with the derived stats, navigation and spawn sites brought up to date"""
+        if not self._layers:
+            return self.snapshot.meta
+        return {**self.snapshot.meta, **self.derived()[1]}
+
+    def derived(self):
+        """(derived layers, meta) of the current layers, recomputed once after each edit"""
+        if self._derived is None:
+            self._derived = derive_world({name: self.layer(name) for name in self.layer_names
+                                          if name not in DERIVED_LAYERS})
+        return self._derived
+
+    def _apply(self, name, indices, values):
+        if name not in self._layers:
+            self._layers[name] = np.array(self.snapshot[name])
+        self._layers[name].reshape(-1)[indices] = values
+        self._derived = None
+        self.dirty[indices // self.height // self.chunk_size, indices % self.height // self.chunk_size] = True
+
+    def set_tiles(self, name, xs, ys, values, sync=False):
+        """Set one layer at tiles (xs, ys) and append the delta to the journal; returns its seq
+
+        With sync the record is fsynced before returning; otherwise it is left
+        to the OS, which survives the game crashing but not the machine.
+        """
+        if self._journal is None:
+            raise WorldSaveError(f"{self.path} is open read-only")
+        if name not in self.layer_names:
+            raise KeyError(name)
+        if name in DERIVED_LAYERS:
+            raise WorldSaveError(f"{name} is derived from the other layers, edit those instead")
+        layer = self.layer_names.index(name)
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        ys = np.asarray(ys, dtype=np.int64).ravel()
+        if ((xs < 0) | (xs >= self.width) | (ys < 0) | (ys >= self.height)).any():
+            raise WorldSaveError(f"Tiles outside the {self.width}x{self.height} world")
+        indices = (xs * self.height + ys).astype("<u4")
+        values = np.broadcast_to(np.asarray(values), indices.shape).astype(self.layer_dtypes[layer].newbyteorder("<"))
+
+        payload = indices.tobytes() + values.tobytes()
+        header = RECORD_HEADER.pack(0, len(payload), self.seq + 1, time.time(), layer)
+        crc = zlib.crc32(payload, zlib.crc32(header[4:]))
+        self._journal.write(struct.pack("<I", crc) + header[4:] + payload)
+        self._journal.flush()
+        if sync:
+            os.fsync(self._journal.fileno())
+
+        self._apply(name, indices, values)
+        self.seq += 1
+        self.records += 1
+        return self.seq
+
+    def dirty_chunks(self):
+        """(chunk_x, chunk_y) of every chunk edited since the snapshot"""
+        return [tuple(chunk) for chunk in np.argwhere(self.dirty).tolist()]
+
+    def journal_bytes(self):
+        return (self.path / self.generation["journal"]).stat().st_size - JOURNAL_HEADER.size
+
+    def needs_compaction(self, ratio=DEFAULT_COMPACT_RATIO):
+        return self.journal_bytes() > ratio * self.snapshot.path.stat().st_size
+
+    def compact(self):
+        """Fold the journal into a new snapshot and start a new generation
+
+        An edited world is written out whole with its derived layers and meta
+        recomputed, since an edit can move region labels and stats anywhere;
+        an unedited one is just copied.
+        """
+        if self._journal is None:
+            raise WorldSaveError(f"{self.path} is open read-only")
+        generation = self.generation["generation"] + 1
+        snapshot_file = self.path / snapshot_name(generation)
+        if self._layers:
+            write_world(snapshot_file, self.width, self.height,
+                        {name: self.layer(name) for name in self.layer_names}, self.meta())
+        else:
+            shutil.copyfile(self.snapshot.path, snapshot_file)
+
+        with open(self.path / journal_name(generation), "wb") as f:
+            f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, generation, self.seq))
+        self.index["generations"].append({"generation": generation, "snapshot": snapshot_name(generation),
+                                          "journal": journal_name(generation), "base_seq": self.seq,
+                                          "created": time.time()})
+        _write_index(self.path, self.index)
+
+        self.close()
+        self.__init__(self.path, chunk_size=self.chunk_size)
+        return generation
+
+    def prune(self, keep=1):
+        """Delete all but the newest keep generations; returns how many were removed"""
+        if keep < 1:
+            raise ValueError(f"keep must be at least 1, not {keep}")
+        generations = self.index["generations"]
+        removed = generations[:-keep]
+        self.index["generations"] = generations[len(removed):]
+        _write_index(self.path, self.index)
+        for entry in removed:
+            (self.path / entry["snapshot"]).unlink(missing_ok=True)
+            (self.path / entry["journal"]).unlink(missing_ok=True)
+        return len(removed)
+
+
+def _write_index(path, index):
+    save_file = Path(path) / SAVE_FILE
+    temporary = save_file.with_suffix(".tmp")
+    with open(temporary, "w") as f:
+        json.dump(index, f, indent=2)
+    temporary.replace(save_file)
+
+
+def open_save(path, writable=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    return WorldSave(path, writable, chunk_size)
+
+
+def replay(path, to_seq=None):
+    """(layers, meta) of a save as they were right after edit to_seq (default: latest)
+
+    Starts from the newest snapshot at or before to_seq, so only that
+    generation's journal is read.
+    """
+    path = Path(path)
+    with open(path / SAVE_FILE) as f:
+        generations = json.load(f)["generations"]
+    if to_seq is None:
+        to_seq = float("inf")
+    candidates = [entry for entry in generations if entry["base_seq"] <= to_seq]
+    if not candidates:
+        raise WorldSaveError(f"Edit {to_seq} is older than the oldest kept snapshot "
+                             f"(after edit {generations[0]['base_seq']})")
+    entry = candidates[-1]
+
+    snapshot = open_world(path / entry["snapshot"])
+    names = snapshot.layer_names()
+    layers = {name: np.array(snapshot[name]) for name in names}
+    _, _, records, _ = read_journal(path / entry["journal"], [snapshot.directory[name][0] for name in names])
+    meta = snapshot.meta
+    edited = False
+    for seq, _, layer, indices, values in records:
+        if seq > to_seq:
+            break
+        layers[names[layer]].reshape(-1)[indices] = values
+        edited = True
+    if edited:
+        derived, derived_meta = derive_world({name: layers[name] for name in names if name not in DERIVED_LAYERS})
+        layers.update(derived)
+        meta = {**meta, **derived_meta}
+    return layers, meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create, edit, compact and replay world saves")
+    parser.add_argument("command", choices=["create", "info", "set", "compact", "replay", "prune"])
+    parser.add_argument("save", help="Save directory")
+    parser.add_argument("--world", help="Baked world file to start the save from (create)")
+    parser.add_argument("--layer", default="terrain", help="Layer to edit (set)")
+    parser.add_argument("--tile", nargs=3, type=float, action="append", metavar=("X", "Y", "VALUE"),
+                        help="Tile to set (set, repeatable)")
+    parser.add_argument("--if-needed", action="store_true",
+                        help=f"Only compact once the journal passes {DEFAULT_COMPACT_RATIO:.0%} of the snapshot")
+    parser.add_argument("--to", type=int, help="Replay up to and including this edit (default: latest)")
+    parser.add_argument("--keep", type=int, default=1, help="Generations to keep (prune)")
+    parser.add_argument("-o", "--output", help="World file to write the replayed state to (replay)")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        if not args.world:
+            parser.error("create needs --world")
+        save = WorldSave.create(args.save, args.world)
+        print(f"💾 Created {save.path} from {args.world} ({save.width}x{save.height})")
+        save.close()
+
+    elif args.command == "info":
+        with open_save(args.save, writable=False) as save:
+            print(f"💾 {save.path} (save v{save.index['version']})")
+            print(f"   - Size: {save.width}x{save.height}")
+            print(f"   - Edits: {save.seq} total, {save.records} since the snapshot "
+                  f"({save.journal_bytes() / 1024:.1f} KiB of journal)")
+            print(f"   - Dirty chunks: {int(save.dirty.sum())}/{save.dirty.size} of {save.chunk_size} tiles")
+            for entry in save.index["generations"]:
+                print(f"   - Generation {entry['generation']}: {entry['snapshot']} after edit {entry['base_seq']}")
+            if save.needs_compaction():
+                print("   - Journal is due for compaction")
+
+    elif args.command == "set":
+        if not args.tile:
+            parser.error("set needs at least one --tile")
+        tiles = np.array(args.tile)
+        with open_save(args.save) as save:
+            start = time.perf_counter()
+            seq = save.set_tiles(args.layer, tiles[:, 0], tiles[:, 1], tiles[:, 2], sync=True)
+            print(f"✅ Edit {seq}: {len(tiles)} {args.layer} tiles in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    elif args.command == "compact":
+        with open_save(args.save) as save:
+            if args.if_needed and not save.needs_compaction():
+                print("✅ Journal is small enough, nothing to do")
+                return 0
+            start = time.perf_counter()
+            dirty = int(save.dirty.sum())
+            generation = save.compact()
+            print(f"✅ Generation {generation}: folded {dirty} dirty chunks in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    elif args.command == "replay":
+        start = time.perf_counter()
+        layers, meta = replay(args.save, args.to)
+        width, height = next(iter(layers.values())).shape
+        print(f"⏪ Replayed to edit {'latest' if args.to is None else args.to} in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        if args.output:
+            write_world(args.output, width, height, layers, meta)
+            print(f"✅ Saved to {args.output}")
+
+    elif args.command == "prune":
+        if args.keep < 1:
+            parser.error("--keep must be at least 1")
+        with open_save(args.save) as save:
+            print(f"🧹 Removed {save.prune(args.keep)} generations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
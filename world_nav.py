@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+World Navigation Data
+Movement costs, connected regions and a hierarchical pathfinding (HPA*)
+graph baked alongside a world, so units can check reachability with one
+lookup and plan paths over a few hundred abstract nodes instead of every tile
+
+Movement is 8-directional without cutting corners past impassable tiles.
+A step between two tiles costs the mean of their movement costs, times
+sqrt(2) on diagonals, so every cost is symmetric.
+
+The HPA* graph splits the map into square clusters. Wherever a run of
+passable tiles crosses a cluster border there is an entrance (one in the
+middle of short runs, one at each end of long ones) with a node on either
+side. Nodes are linked across borders by one step and, inside a cluster, by
+the cost of the cheapest path that stays in the cluster.
+"""
+
+import argparse
+import heapq
+import sys
+import time
+
+import numpy as np
+
+from world_format import open_world
+
+# Cost to move across each terrain, by name; 0 means impassable
+IMPASSABLE = 0
+MOVE_COSTS = {"water": IMPASSABLE, "grass": 10, "desert": 15, "snow": 25, "forest": 20, "mountain": 60,
+              "swamp": 30, "volcanic": 40}
+
+# Matches chunk_baker.DEFAULT_CHUNK_SIZE, so a cluster is one chunk texture
+DEFAULT_CLUSTER_SIZE = 16
+
+# Border runs at least this long get an entrance at each end instead of one in the middle
+MAX_ENTRANCE_WIDTH = 6
+
+# Clusters whose intra-cluster costs are relaxed together, bounding memory on large maps
+CLUSTER_BATCH = 1024
+
+# Stand-ins for the start and goal tiles in abstract path searches
+START = -2
+GOAL = -1
+
+STEP_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def movement_costs(terrain, terrain_types):
+    """Per-tile movement cost (uint8) from the terrain enum"""
+    lut = np.array([MOVE_COSTS[name] for name in terrain_types], dtype=np.uint8)
+    return lut[np.asarray(terrain)]
+
+
+def connected_components(count, u, v):
+    """Smallest member of each node's component, for an undirected edge list
+
+    Roots hook onto the smaller of each edge's roots, then every node jumps
+    to its root, until no edge joins two trees.
+    """
+    parent = np.arange(count)
+    while True:
+        root_u, root_v = parent[u], parent[v]
+        joining = root_u != root_v
+        if not joining.any():
+            return parent
+        np.minimum.at(parent, np.maximum(root_u, root_v)[joining], np.minimum(root_u, root_v)[joining])
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def region_labels(costs):
+    """Connected region of every tile (uint32): 0 for impassable, else 1, 2, ...
+
+    Two tiles share a region exactly when a unit can walk between them, so
+    reachability is one comparison.
+    """
+    passable = np.asarray(costs) != IMPASSABLE
+    width, height = passable.shape
+    index = np.arange(width * height).reshape(width, height)
+    across = passable[:-1, :] & passable[1:, :]
+    down = passable[:, :-1] & passable[:, 1:]
+    u = np.concatenate([index[:-1, :][across], index[:, :-1][down]])
+    v = np.concatenate([index[1:, :][across], index[:, 1:][down]])
+
+    roots = connected_components(width * height, u, v)
+    labels = np.zeros(width * height, dtype=np.uint32)
+    flat_passable = passable.ravel()
+    labels[flat_passable] = np.unique(roots[flat_passable], return_inverse=True)[1] + 1
+    return labels.reshape(width, height)
+
+
+def navigation_layers(terrain, terrain_types):
+    costs = movement_costs(terrain, terrain_types)
+    return {"move_cost": costs, "region": region_labels(costs)}
+
+
+def _cluster_tiles(costs, cluster_size):
+    """Costs as (clusters, cluster_size, cluster_size) tiles, padded with impassable tiles"""
+    width, height = costs.shape
+    clusters_x, clusters_y = -(-width // cluster_size), -(-height // cluster_size)
+    padded = np.zeros((clusters_x * cluster_size, clusters_y * cluster_size), dtype=np.float32)
+    padded[:width, :height] = costs
+    tiles = padded.reshape(clusters_x, cluster_size, clusters_y, cluster_size).transpose(0, 2, 1, 3)
+    return tiles.reshape(-1, cluster_size, cluster_size)
+
+
+def _shift(values, dx, dy, fill):
+    """values[..., x - dx, y - dy] at [..., x, y]"""
+    out = np.full_like(values, fill)
+    size_x, size_y = values.shape[-2:]
+    out[..., max(dx, 0):size_x + min(dx, 0), max(dy, 0):size_y + min(dy, 0)] = \
+        values[..., max(-dx, 0):size_x + min(-dx, 0), max(-dy, 0):size_y + min(-dy, 0)]
+    return out
+
+
+def cluster_distances(tiles, sources):
+    """Cheapest in-cluster path cost from each source to every tile
+
+    tiles is (clusters, n, n) movement costs and sources (k, 3) rows of
+    (cluster, local x, local y). Returns (k, n, n) distances, relaxing every
+    source at once until nothing improves.
+    """
+    passable = tiles != IMPASSABLE
+    size_x, size_y = tiles.shape[1:]
+    steps = []
+    for dx, dy in STEP_OFFSETS:
+        # Cost of stepping into [x, y] from [x - dx, y - dy]; corners can't be cut
+        allowed = passable & _shift(passable, dx, dy, False)
+        if dx and dy:
+            allowed &= _shift(passable, dx, 0, False) & _shift(passable, 0, dy, False)
+        cost = (tiles + _shift(tiles, dx, dy, 0)) / 2.0 * (np.sqrt(2.0) if dx and dy else 1.0)
+        into = (slice(max(dx, 0), size_x + min(dx, 0)), slice(max(dy, 0), size_y + min(dy, 0)))
+        out_of = (slice(max(-dx, 0), size_x + min(-dx, 0)), slice(max(-dy, 0), size_y + min(-dy, 0)))
+        cost = np.where(allowed, cost, np.inf).astype(np.float32)
+        steps.append((into, out_of, cost[(sources[:, 0],) + into]))
+
+    distances = np.full((len(sources), size_x, size_y), np.inf, dtype=np.float32)
+    distances[np.arange(len(sources)), sources[:, 1], sources[:, 2]] = 0.0
+
+    # Relax in place, so improvements carry on through later offsets in the same sweep
+    while True:
+        before = distances.copy()
+        for into, out_of, cost in steps:
+            target = distances[(...,) + into]
+            np.minimum(target, distances[(...,) + out_of] + cost, out=target)
+        if np.array_equal(before, distances):
+            return distances
+
+
+def _entrances(passable, cluster_size, axis):
+    """(inside, outside) tile pairs for entrances across borders perpendicular to axis"""
+    if axis == 1:
+        inside, outside = _entrances(passable.T, cluster_size, 0)
+        return inside[:, ::-1], outside[:, ::-1]
+
+    width, height = passable.shape
+    pairs = []
+    for border in range(cluster_size, width, cluster_size):
+        open_rows = passable[border - 1] & passable[border]
+        edges = np.diff(np.concatenate([[0], open_rows.astype(np.int8), [0]]))
+        # Runs end at gaps and at cluster corners
+        run_starts, run_ends = [], []
+        for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            cuts = [start, *range((start // cluster_size + 1) * cluster_size, end, cluster_size), end]
+            run_starts.extend(cuts[:-1])
+            run_ends.extend(cuts[1:])
+        for start, end in zip(run_starts, run_ends):
+            if end - start >= MAX_ENTRANCE_WIDTH:
+                rows = [start, end - 1]
+            else:
+                rows = [(start + end - 1) // 2]
+            pairs.extend((border - 1, row, border, row) for row in rows)
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 4)
+    return pairs[:, :2], pairs[:, 2:]
+
+
+def build_hpa_graph(costs, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """HPA* abstract graph: node tiles (N, 2) and undirected edges (E, 3) of (a, b, cost)"""
+    costs = np.asarray(costs)
+    width, height = costs.shape
+    clusters_y = -(-height // cluster_size)
+    passable = costs != IMPASSABLE
+
+    inside_x, outside_x = _entrances(passable, cluster_size, 0)
+    inside_y, outside_y = _entrances(passable, cluster_size, 1)
+    ends = np.concatenate([inside_x, outside_x, inside_y, outside_y])
+    tile_index = ends[:, 0] * height + ends[:, 1]
+    node_tiles, node_of = np.unique(tile_index, return_inverse=True)
+    nodes = np.stack([node_tiles // height, node_tiles % height], axis=1)
+
+    # Crossing edges: one step between the two sides of an entrance
+    pair_count = len(inside_x)
+    cross_a = np.concatenate([node_of[:pair_count], node_of[2 * pair_count:2 * pair_count + len(inside_y)]])
+    cross_b = np.concatenate([node_of[pair_count:2 * pair_count], node_of[2 * pair_count + len(inside_y):]])
+    cross_cost = (costs.ravel()[node_tiles[cross_a]].astype(np.float32)
+                  + costs.ravel()[node_tiles[cross_b]]) / 2.0
+    edges = [np.stack([cross_a, cross_b, cross_cost], axis=1)]
+
+    # Intra-cluster edges: every pair of nodes in a cluster that can reach each other inside it
+    cluster_of = (nodes[:, 0] // cluster_size) * clusters_y + nodes[:, 1] // cluster_size
+    order = np.argsort(cluster_of, kind="stable")
+    counts = np.bincount(cluster_of, minlength=-(-width // cluster_size) * clusters_y)
+    slot_of = np.empty(len(nodes), dtype=np.int64)
+    slot_of[order] = np.arange(len(nodes)) - np.repeat(np.cumsum(counts) - counts, counts)
+    slots = int(counts.max()) if len(nodes) else 0
+
+    tiles = _cluster_tiles(costs, cluster_size)
+    for first in range(0, len(tiles), CLUSTER_BATCH):
+        members = np.flatnonzero((cluster_of >= first) & (cluster_of < first + CLUSTER_BATCH))
+        if not members.size:
+            continue
+        local = nodes % cluster_size
+        sources = np.column_stack([cluster_of[members] - first, local[members]])
+        distances = cluster_distances(tiles[first:first + CLUSTER_BATCH], sources)
+        row_of = np.empty(len(nodes), dtype=np.int64)
+        row_of[members] = np.arange(len(members))
+
+        # Every pair of nodes in a cluster, each pair once
+        slot_nodes = np.full((CLUSTER_BATCH, slots), -1, dtype=np.int64)
+        slot_nodes[cluster_of[members] - first, slot_of[members]] = members
+        first_slot, second_slot = np.triu_indices(slots, 1)
+        a, b = slot_nodes[:, first_slot], slot_nodes[:, second_slot]
+        paired = (a >= 0) & (b >= 0)
+        a, b = a[paired], b[paired]
+        cost = distances[row_of[a], local[b, 0], local[b, 1]]
+        reachable = np.isfinite(cost)
+        edges.append(np.stack([a[reachable], b[reachable], cost[reachable]], axis=1))
+
+    return nodes.astype(np.int32), np.concatenate(edges).astype(np.float32)
+
+
+def navigation_meta(costs, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """HPA* graph as JSON-friendly lists for world meta"""
+    nodes, edges = build_hpa_graph(costs, cluster_size)
+    return {
+        "cluster_size": cluster_size,
+        "move_costs": MOVE_COSTS,
+        # Flattened: nodes as x, y pairs and edges as a, b, cost triples
+        "nodes": nodes.ravel().tolist(),
+        "edges": [value for a, b, cost in edges.tolist() for value in (int(a), int(b), round(cost, 2))]
+    }
+
+
+class Navigator:
+    """Path queries over a baked world's navigation data"""
+
+    def __init__(self, costs, regions, navigation):
+        self.costs = np.asarray(costs)
+        self.regions = np.asarray(regions)
+        self.cluster_size = navigation["cluster_size"]
+        self.nodes = np.array(navigation["nodes"], dtype=np.int64).reshape(-1, 2)
+        edges = np.array(navigation["edges"], dtype=np.float64).reshape(-1, 3)
+        self.neighbours = [[] for _ in range(len(self.nodes))]
+        for a, b, cost in edges:
+            self.neighbours[int(a)].append((int(b), cost))
+            self.neighbours[int(b)].append((int(a), cost))
+        clusters_y = -(-self.costs.shape[1] // self.cluster_size)
+        self.clusters_y = clusters_y
+        self.node_cluster = (self.nodes[:, 0] // self.cluster_size) * clusters_y + self.nodes[:, 1] // self.cluster_size
+
+    @classmethod
+    def from_world(cls, world):
+        return cls(world["move_cost"], world["region"], world.meta["navigation"])
+
+    def reachable(self, start, goal):
+        region = self.regions[tuple(start)]
+        return bool(region) and region == self.regions[tuple(goal)]
+
+    def _cluster(self, tile):
+        return (tile[0] // self.cluster_size) * self.clusters_y + tile[1] // self.cluster_size
+
+    def _local_costs(self, tile, targets):
+        """In-cluster path cost from tile to each target tile in the same cluster"""
+        size = self.cluster_size
+        cluster_x, cluster_y = tile[0] // size * size, tile[1] // size * size
+        tiles = np.zeros((1, size, size), dtype=np.float32)
+        window = self.costs[cluster_x:cluster_x + size, cluster_y:cluster_y + size]
+        tiles[0, :window.shape[0], :window.shape[1]] = window
+        source = np.array([[0, tile[0] - cluster_x, tile[1] - cluster_y]])
+        distances = cluster_distances(tiles, source)[0]
+        return [float(distances[x - cluster_x, y - cluster_y]) for x, y in targets]
+
+    def find_path(self, start, goal):
+        """(cost, waypoints) from start to goal, or None when goal is unreachable
+
+        Waypoints are the entrance tiles crossed, from start to goal;
+        consecutive waypoints share a cluster, so walking between them only
+        needs a search within one cluster.
+        """
+        start, goal = tuple(int(v) for v in start), tuple(int(v) for v in goal)
+        if not self.reachable(start, goal):
+            return None
+
+        start_cluster, goal_cluster = self._cluster(start), self._cluster(goal)
+        start_nodes = np.flatnonzero(self.node_cluster == start_cluster)
+        goal_nodes = np.flatnonzero(self.node_cluster == goal_cluster)
+        goal_links = dict(zip(goal_nodes.tolist(), self._local_costs(goal, self.nodes[goal_nodes])))
+
+        # Dijkstra from start; GOAL and START stand for the query's own tiles
+        best = {}
+        heap = []
+        if start_cluster == goal_cluster:
+            direct = self._local_costs(start, [goal])[0]
+            if np.isfinite(direct):
+                heapq.heappush(heap, (direct, GOAL, START))
+        for node, cost in zip(start_nodes.tolist(), self._local_costs(start, self.nodes[start_nodes])):
+            if np.isfinite(cost):
+                heapq.heappush(heap, (cost, node, START))
+
+        previous = {}
+        while heap:
+            cost, node, came_from = heapq.heappop(heap)
+            if node in best:
+                continue
+            best[node] = cost
+            previous[node] = came_from
+            if node == GOAL:
+                break
+            for neighbour, step in self.neighbours[node]:
+                if neighbour not in best:
+                    heapq.heappush(heap, (cost + step, neighbour, node))
+            link = goal_links.get(node)
+            if link is not None and np.isfinite(link):
+                heapq.heappush(heap, (cost + link, GOAL, node))
+
+        if GOAL not in best:
+            return None
+        waypoints = [goal]
+        node = previous[GOAL]
+        while node != START:
+            waypoints.append(tuple(self.nodes[node].tolist()))
+            node = previous[node]
+        waypoints.append(start)
+        return best[GOAL], waypoints[::-1]
+
+
+def grid_path_cost(costs, start, goal):
+    """Exact cheapest path cost by Dijkstra over every tile, to check HPA* against"""
+    costs = np.asarray(costs, dtype=np.float64)
+    width, height = costs.shape
+    best = np.full(costs.shape, np.inf)
+    best[start] = 0.0
+    heap = [(0.0, tuple(start))]
+    while heap:
+        cost, (x, y) = heapq.heappop(heap)
+        if (x, y) == tuple(goal):
+            return cost
+        if cost > best[x, y]:
+            continue
+        for dx, dy in STEP_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height) or costs[nx, ny] == IMPASSABLE:
+                continue
+            if dx and dy and (costs[x + dx, y] == IMPASSABLE or costs[x, y + dy] == IMPASSABLE):
+                continue
+            step = (costs[x, y] + costs[nx, ny]) / 2.0 * (np.sqrt(2.0) if dx and dy else 1.0)
+            if cost + step < best[nx, ny]:
+                best[nx, ny] = cost + step
+                heapq.heappush(heap, (cost + step, (nx, ny)))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and query a baked world's navigation data")
+    parser.add_argument("world", help="Baked world file")
+    parser.add_argument("--path", nargs=4, type=int, metavar=("X0", "Y0", "X1", "Y1"), help="Find a path")
+    parser.add_argument("--exact", action="store_true", help="Also compute the exact grid cost for --path")
+    args = parser.parse_args()
+
+    world = open_world(args.world)
+    if "navigation" not in world.meta:
+        print(f"❌ {args.world} has no navigation data; re-bake it with world_baker.py")
+        return 1
+
+    navigator = Navigator.from_world(world)
+    regions = np.asarray(world["region"])
+    print(f"🧭 {world.path}: {int(regions.max())} regions, {len(navigator.nodes)} nodes, "
+          f"{sum(map(len, navigator.neighbours)) // 2} edges in {navigator.cluster_size}-tile clusters")
+    sizes = np.bincount(regions.ravel())[1:]
+    if sizes.size:
+        print(f"   - Largest region: {sizes.max()} tiles ({sizes.max() / regions.size * 100:.1f}% of the map)")
+
+    if args.path:
+        start, goal = tuple(args.path[:2]), tuple(args.path[2:])
+        began = time.perf_counter()
+        found = navigator.find_path(start, goal)
+        elapsed = (time.perf_counter() - began) * 1000
+        if found is None:
+            print(f"🚫 {goal} is unreachable from {start} ({elapsed:.2f} ms)")
+            return 0
+        cost, waypoints = found
+        print(f"✅ Path cost {cost:.1f} through {len(waypoints) - 2} entrances ({elapsed:.2f} ms)")
+        if args.exact:
+            exact = grid_path_cost(world["move_cost"], start, goal)
+            print(f"   - Exact cost {exact:.1f} ({(cost / exact - 1) * 100:.1f}% longer)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+World Previews
+Renders baked worlds as multi-resolution tile pyramids and thumbnails,
+coloured from the terrain and vegetation sprites, plus a static viewer page
+for browsing them (and sweep results) without launching the game
+"""
+
+import argparse
+import html
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from chunk_store import ChunkStore, ChunkStoreError
+from world_baker import TERRAIN_TYPES, VEGETATION_TYPES
+from world_format import open_world
+
+DEFAULT_SPRITE_DIR = "oneiric-parallax/sprites"
+DEFAULT_OUTPUT_DIR = "previews"
+PYRAMID_TILE_SIZE = 256
+THUMBNAIL_SIZE = 128
+
+# How strongly vegetation tints the terrain colour of its tile
+VEGETATION_TINT = 0.35
+
+MANIFEST_SCRIPT = "previews.js"
+VIEWER_FILE = "index.html"
+
+
+def mean_sprite_color(path, fallback=(255, 0, 255)):
+    """Average colour of a sprite's opaque pixels"""
+    if not Path(path).exists():
+        return np.array(fallback, dtype=np.float32)
+    with Image.open(path) as img:
+        pixels = np.asarray(img.convert("RGBA"), dtype=np.float32).reshape(-1, 4)
+    opaque = pixels[pixels[:, 3] > 0]
+    return opaque[:, :3].mean(axis=0) if len(opaque) else np.array(fallback, dtype=np.float32)
+
+
+def load_palettes(sprite_dir=DEFAULT_SPRITE_DIR):
+    """Terrain and vegetation colours in enum order"""
+    sprite_dir = Path(sprite_dir)
+    terrain = np.stack([mean_sprite_color(sprite_dir / "terrain" / f"{name}.png") for name in TERRAIN_TYPES])
+    vegetation = np.stack([mean_sprite_color(sprite_dir / "vegetation" / f"{name}.png") for name in VEGETATION_TYPES])
+    return terrain, vegetation
+
+
+# Index of the lowest set bit for every byte value (0 for zero, which is masked out)
+_LOWEST_BIT = np.array([max((value & -value).bit_length() - 1, 0) for value in range(256)], dtype=np.intp)
+
+
+def colorize(terrain, vegetation, palettes):
+    """RGB image (rows are y) for [x, y] terrain and vegetation arrays"""
+    terrain_palette, vegetation_palette = palettes
+    terrain = np.asarray(terrain)
+    vegetation = np.asarray(vegetation)
+    colors = terrain_palette[terrain]
+    tint = vegetation_palette[_LOWEST_BIT[vegetation]]
+    vegetated = (vegetation != 0)[..., None]
+    colors = np.where(vegetated, colors * (1.0 - VEGETATION_TINT) + tint * VEGETATION_TINT, colors)
+    return np.clip(colors + 0.5, 0, 255).astype(np.uint8).transpose(1, 0, 2)
+
+
+class LayerSource:
+    """Region reads from either a baked .world file or a chunk store directory"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            self.store = ChunkStore(self.path)
+            self.world = None
+            self.width, self.height = self.store.width, self.store.height
+            self.meta = self.store.meta
+        except ChunkStoreError:
+            self.store = None
+            self.world = open_world(self.path)
+            self.width, self.height = self.world.width, self.world.height
+            self.meta = self.world.meta
+
+    def region(self, name, x0, y0, x1, y1):
+        if self.store is not None:
+            return self.store.region(name, x0, y0, x1, y1)
+        return np.asarray(self.world[name][x0:x1, y0:y1])
+
+
+def pyramid_levels(width, height, tile_size=PYRAMID_TILE_SIZE):
+    """Image sizes per level: level 0 is one pixel per tile, each level halves
+    the previous, and the last fits in a single pyramid tile"""
+    levels = [(width, height)]
+    while max(levels[-1]) > tile_size:
+        w, h = levels[-1]
+        levels.append((-(-w // 2), -(-h // 2)))
+    return levels
+
+
+def render_pyramid(world_path, output_dir, sprite_dir=DEFAULT_SPRITE_DIR, tile_size=PYRAMID_TILE_SIZE,
+                   palettes=None):
+    """Write pyramid tiles <level>/<column>_<row>.png, pyramid.json and thumbnail.png
+
+    Level 0 is rendered one tile_size block at a time straight from the
+    world's layers; every higher tile is averaged down from the four below
+    it, so memory stays at a few tiles whatever the world size.
+    """
+    source = LayerSource(world_path)
+    palettes = palettes or load_palettes(sprite_dir)
+    output_dir = Path(output_dir)
+    levels = pyramid_levels(source.width, source.height, tile_size)
+
+    level_dir = output_dir / "0"
+    level_dir.mkdir(parents=True, exist_ok=True)
+    for column in range(-(-source.width // tile_size)):
+        for row in range(-(-source.height // tile_size)):
+            x0, y0 = column * tile_size, row * tile_size
+            x1, y1 = min(x0 + tile_size, source.width), min(y0 + tile_size, source.height)
+            image = colorize(source.region("terrain", x0, y0, x1, y1),
+                             source.region("vegetation", x0, y0, x1, y1), palettes)
+            Image.fromarray(image, "RGB").save(level_dir / f"{column}_{row}.png")
+
+    for level in range(1, len(levels)):
+        below_dir = output_dir / str(level - 1)
+        level_dir = output_dir / str(level)
+        level_dir.mkdir(parents=True, exist_ok=True)
+        width, height = levels[level]
+        for column in range(-(-width // tile_size)):
+            for row in range(-(-height // tile_size)):
+                canvas = np.zeros((tile_size * 2, tile_size * 2, 3), dtype=np.float32)
+                weight = np.zeros((tile_size * 2, tile_size * 2, 1), dtype=np.float32)
+                for dx in (0, 1):
+                    for dy in (0, 1):
+                        below = below_dir / f"{column * 2 + dx}_{row * 2 + dy}.png"
+                        if not below.exists():
+                            continue
+                        with Image.open(below) as img:
+                            pixels = np.asarray(img.convert("RGB"), dtype=np.float32)
+                        top, left = dy * tile_size, dx * tile_size
+                        canvas[top:top + pixels.shape[0], left:left + pixels.shape[1]] = pixels
+                        weight[top:top + pixels.shape[0], left:left + pixels.shape[1]] = 1.0
+
+                # 2x2 box filter, ignoring pixels past the edge of the world
+                canvas = canvas.reshape(tile_size, 2, tile_size, 2, 3).sum(axis=(1, 3))
+                weight = weight.reshape(tile_size, 2, tile_size, 2, 1).sum(axis=(1, 3))
+                tile_width = min(tile_size, width - column * tile_size)
+                tile_height = min(tile_size, height - row * tile_size)
+                pixels = canvas[:tile_height, :tile_width] / np.maximum(weight[:tile_height, :tile_width], 1.0)
+                Image.fromarray(np.clip(pixels + 0.5, 0, 255).astype(np.uint8), "RGB").save(
+                    level_dir / f"{column}_{row}.png")
+
+    with Image.open(output_dir / str(len(levels) - 1) / "0_0.png") as top:
+        thumbnail = top.copy()
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.BOX)
+    thumbnail.save(output_dir / "thumbnail.png")
+
+    pyramid = {
+        "world": str(world_path),
+        "width": source.width,
+        "height": source.height,
+        "tile_size": tile_size,
+        "levels": [list(size) for size in levels],
+        "params": source.meta.get("params", {})
+    }
+    with open(output_dir / "pyramid.json", "w") as f:
+        json.dump(pyramid, f, indent=2)
+    return pyramid
+
+
+def write_thumbnail(terrain, vegetation, output_file, palettes, size=THUMBNAIL_SIZE):
+    """Thumbnail straight from in-memory layers, for sweeps that never save worlds"""
+    image = Image.fromarray(colorize(terrain, vegetation, palettes), "RGB")
+    image.thumbnail((size, size), Image.BOX)
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    image.save(output_file)
+    return output_file
+
+
+def load_manifest(root):
+    """Entries listed in <root>/previews.js"""
+    manifest_file = Path(root) / MANIFEST_SCRIPT
+    if not manifest_file.exists():
+        return []
+    text = manifest_file.read_text()
+    return json.loads(text[text.index("=") + 1:].strip().rstrip(";"))
+
+
+def write_viewer(root, entries):
+    """Write the manifest and the static viewer page into root
+
+    The manifest is a script rather than JSON so the page also works when
+    opened straight from disk, where browsers refuse to fetch files.
+    Entries are {"name", "thumbnail", "group"?, "pyramid"?, "info"?}, with
+    paths relative to root.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / MANIFEST_SCRIPT, "w") as f:
+        f.write("window.PREVIEWS = " + json.dumps(entries, indent=1) + ";\n")
+    with open(root / VIEWER_FILE, "w") as f:
+        f.write(VIEWER_HTML.replace("{title}", html.escape(root.name)))
+    return root / VIEWER_FILE
+
+
+def add_entries(root, new_entries):
+    """Merge entries into the manifest by group and name and rewrite the viewer"""
+    def key(entry):
+        return entry.get("group", ""), entry["name"]
+
+    entries = {key(entry): entry for entry in load_manifest(root)}
+    entries.update({key(entry): entry for entry in new_entries})
+    return write_viewer(root, [entries[entry_key] for entry_key in sorted(entries)])
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>World previews - {title}</title>
+<style>
+body { background: #1e1e24; color: #ddd; font-family: sans-serif; margin: 16px; }
+input { background: #2b2b33; color: #ddd; border: 1px solid #555; padding: 4px 8px; width: 320px; }
+h2 { font-size: 15px; margin: 20px 0 8px; }
+.grid { display: flex; flex-wrap: wrap; gap: 8px; }
+.card { width: 136px; cursor: pointer; font-size: 11px; }
+.card img { width: 128px; height: 128px; object-fit: contain; image-rendering: pixelated; background: #000;
+            border: 4px solid transparent; }
+.card.bad img { border-color: #a33; }
+#view { display: none; position: fixed; inset: 0; background: #000; overflow: hidden; cursor: grab; }
+#view img { position: absolute; image-rendering: pixelated; }
+#bar { position: fixed; top: 8px; left: 8px; z-index: 2; background: rgba(0,0,0,.7); padding: 6px 10px; }
+</style>
+</head>
+<body>
+<input id="filter" placeholder="Filter by name or group...">
+<div id="list"></div>
+<div id="view"><div id="bar"></div><div id="tiles"></div></div>
+<script src="previews.js"></script>
+<script>
+const list = document.getElementById("list"), view = document.getElementById("view");
+const tiles = document.getElementById("tiles"), bar = document.getElementById("bar");
+
+function showList() {
+  const query = document.getElementById("filter").value.toLowerCase();
+  const groups = {};
+  for (const entry of window.PREVIEWS || []) {
+    if (query && !(entry.name + " " + (entry.group || "")).toLowerCase().includes(query)) continue;
+    (groups[entry.group || ""] = groups[entry.group || ""] || []).push(entry);
+  }
+  list.innerHTML = "";
+  for (const [group, entries] of Object.entries(groups)) {
+    const heading = document.createElement("h2");
+    heading.textContent = (group || "Worlds") + " (" + entries.length + ")";
+    const grid = document.createElement("div");
+    grid.className = "grid";
+    for (const entry of entries) {
+      const card = document.createElement("div");
+      card.className = "card" + (entry.info && entry.info.playable === false ? " bad" : "");
+      card.title = JSON.stringify(entry.info || {}, null, 1);
+      card.innerHTML = '<img loading="lazy"><div></div>';
+      card.querySelector("img").src = entry.thumbnail;
+      card.querySelector("div").textContent = entry.name;
+      card.onclick = () => openEntry(entry);
+      grid.appendChild(card);
+    }
+    list.append(heading, grid);
+  }
+}
+
+let current = null, scale = 1, panX = 0, panY = 0;
+
+function openEntry(entry) {
+  current = entry;
+  // pyramid.json is mirrored into the manifest, so no fetch is needed
+  current.pyramidInfo = entry.pyramid ? entry.pyramid_info : null;
+  const info = current.pyramidInfo;
+  scale = info ? Math.min(innerWidth / info.width, innerHeight / info.height) : 4;
+  panX = 0; panY = 0;
+  view.style.display = "block";
+  draw();
+}
+
+function draw() {
+  const info = current.pyramidInfo;
+  bar.textContent = current.name + "  (wheel: zoom, drag: pan, Esc: close)";
+  tiles.innerHTML = "";
+  if (!info) {
+    const img = document.createElement("img");
+    img.src = current.thumbnail;
+    img.style.left = panX + "px"; img.style.top = panY + "px";
+    img.style.width = 128 * scale + "px";
+    tiles.appendChild(img);
+    return;
+  }
+  // Pick the level whose pixels are closest to screen pixels
+  let level = Math.max(0, Math.min(info.levels.length - 1, Math.floor(Math.log2(1 / scale))));
+  const factor = 2 ** level, size = info.tile_size, [w, h] = info.levels[level];
+  const step = size * factor * scale;
+  for (let column = 0; column * size < w; column++) {
+    for (let row = 0; row * size < h; row++) {
+      const left = panX + column * step, top = panY + row * step;
+      if (left > innerWidth || top > innerHeight || left + step < 0 || top + step < 0) continue;
+      const img = document.createElement("img");
+      img.src = current.pyramid + "/" + level + "/" + column + "_" + row + ".png";
+      img.style.left = left + "px"; img.style.top = top + "px";
+      img.style.width = Math.min(size, w - column * size) * factor * scale + "px";
+      tiles.appendChild(img);
+    }
+  }
+}
+
+view.addEventListener("wheel", event => {
+  event.preventDefault();
+  const zoom = event.deltaY < 0 ? 1.25 : 0.8;
+  panX = event.clientX - (event.clientX - panX) * zoom;
+  panY = event.clientY - (event.clientY - panY) * zoom;
+  scale *= zoom;
+  draw();
+}, {passive: false});
+let drag = null;
+view.addEventListener("mousedown", event => { drag = [event.clientX - panX, event.clientY - panY]; });
+addEventListener("mouseup", () => { drag = null; });
+addEventListener("mousemove", event => {
+  if (!drag) return;
+  panX = event.clientX - drag[0]; panY = event.clientY - drag[1];
+  draw();
+});
+addEventListener("keydown", event => { if (event.key === "Escape") view.style.display = "none"; });
+document.getElementById("filter").oninput = showList;
+showList();
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render baked worlds as pyramid tiles and thumbnails")
+    parser.add_argument("worlds", nargs="+", help="Baked .world files or chunk store directories")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_DIR, help="Preview root with the viewer page")
+    parser.add_argument("--sprites", default=DEFAULT_SPRITE_DIR, help="Sprite directory for the colours")
+    parser.add_argument("--tile-size", type=int, default=PYRAMID_TILE_SIZE, help="Pyramid tile size in pixels")
+    args = parser.parse_args()
+
+    root = Path(args.output)
+    palettes = load_palettes(args.sprites)
+    entries = []
+    for world in args.worlds:
+        name = Path(world).name
+        start = time.perf_counter()
+        pyramid = render_pyramid(world, root / "worlds" / name, args.sprites, args.tile_size, palettes)
+        entries.append({
+            "name": name,
+            "group": "Baked worlds",
+            "thumbnail": f"worlds/{name}/thumbnail.png",
+            "pyramid": f"worlds/{name}",
+            "pyramid_info": {key: pyramid[key] for key in ["width", "height", "tile_size", "levels"]},
+            "info": pyramid["params"]
+        })
+        print(f"🗺️  {name}: {len(pyramid['levels'])} levels in {time.perf_counter() - start:.2f}s")
+
+    viewer = add_entries(root, entries)
+    print(f"✅ Viewer written to {viewer}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
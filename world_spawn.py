@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Civilization Spawn Sites
+Scores every tile as a place to found a civilization from what lies within
+a radius of it (fertility, food, wood, stone and fresh water), then ranks
+well-spaced candidate sites, so CivilizationManager spawns with a table
+lookup instead of a random position
+
+Window sums come from summed-area tables, so the cost per tile is four
+lookups whatever the radius.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from world_format import open_world
+
+# Share of the score each ingredient contributes
+SPAWN_WEIGHTS = {"fertility": 0.3, "food": 0.25, "wood": 0.15, "stone": 0.1, "fresh_water": 0.2}
+
+# Resource bits that count as each ingredient; fish feeds people too
+SPAWN_RESOURCES = {"food": ["food", "fish"], "wood": ["wood"], "stone": ["stone"]}
+
+# Tiles of an ingredient within the radius that score it in full
+SATURATION_TILES = 3
+
+# How well a settlement does on the site's own tile; anything missing
+# (water, mountain, volcanic) can't host one
+SPAWN_TERRAIN = {"grass": 1.0, "forest": 0.8, "swamp": 0.6, "desert": 0.5, "snow": 0.4}
+
+# Sites stay this many tiles inside the map, so starting units aren't placed off it
+EDGE_MARGIN = 2
+
+# Window radius in tiles; chunked bakes need it no larger than the halo
+DEFAULT_SPAWN_RADIUS = 6
+DEFAULT_SITE_COUNT = 16
+# Minimum distance between two sites, in tiles along either axis
+DEFAULT_SITE_SPACING = 12
+
+
+def box_sum(values, radius):
+    """Sum of values over the (2 * radius + 1)^2 window around every tile, from a summed-area table
+
+    Tiles outside the map count as zero.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    width, height = values.shape
+    size = 2 * radius + 1
+    table = np.zeros((width + size, height + size))
+    table[1:, 1:] = np.pad(values, radius).cumsum(axis=0).cumsum(axis=1)
+    return (table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size])[:width, :height]
+
+
+def spawn_suitability(terrain, resources, fertility, elevation, terrain_types, resource_types, sea_level,
+                      radius=DEFAULT_SPAWN_RADIUS):
+    """Spawn score (0-1) of every tile; 0 where a civilization can't start
+
+    Pass the whole map, or a region with a halo of at least the radius:
+    the edge margin applies to whatever edges the arrays have.
+    """
+    terrain = np.asarray(terrain)
+    resources = np.asarray(resources)
+    window_tiles = box_sum(np.ones(terrain.shape), radius)
+
+    components = {"fertility": box_sum(fertility, radius) / window_tiles}
+    for name, kinds in SPAWN_RESOURCES.items():
+        bits = sum(1 << resource_types.index(kind) for kind in kinds)
+        components[name] = np.minimum(box_sum((resources & bits) != 0, radius) / SATURATION_TILES, 1.0)
+    # Rivers are water above sea level
+    fresh_water = (terrain == terrain_types.index("water")) & (np.asarray(elevation) >= sea_level)
+    components["fresh_water"] = np.minimum(box_sum(fresh_water, radius) / SATURATION_TILES, 1.0)
+
+    score = sum(SPAWN_WEIGHTS[name] * component for name, component in components.items())
+    habitability = np.array([SPAWN_TERRAIN.get(name, 0.0) for name in terrain_types])
+    score *= habitability[terrain]
+    score[:EDGE_MARGIN, :] = score[-EDGE_MARGIN:, :] = 0.0
+    score[:, :EDGE_MARGIN] = score[:, -EDGE_MARGIN:] = 0.0
+    return score
+
+
+def spawn_layers(score):
+    """Spawn score quantized to a uint8 layer"""
+    return {"spawn_score": np.round(np.clip(score, 0.0, 1.0) * 255).astype(np.uint8)}
+
+
+def rank_sites(score, count=DEFAULT_SITE_COUNT, spacing=DEFAULT_SITE_SPACING, origin=(0, 0)):
+    """Best sites as [x, y, score] rows, each at least spacing tiles from the others
+
+    Greedy: take the best tile left, rule out its neighbourhood, repeat.
+    origin offsets the returned coordinates for scores covering part of a world.
+    """
+    remaining = np.array(score, dtype=np.float64)
+    sites = []
+    for _ in range(count):
+        x, y = np.unravel_index(np.argmax(remaining), remaining.shape)
+        if remaining[x, y] <= 0:
+            break
+        sites.append([int(x) + origin[0], int(y) + origin[1], round(float(remaining[x, y]), 4)])
+        remaining[max(x - spacing + 1, 0):x + spacing, max(y - spacing + 1, 0):y + spacing] = 0
+    return sites
+
+
+def merge_sites(candidates, count=DEFAULT_SITE_COUNT, spacing=DEFAULT_SITE_SPACING):
+    """Rank sites from several partial lists (such as one per chunk) with the same spacing rule"""
+    sites = []
+    for x, y, score in sorted(candidates, key=lambda site: -site[2]):
+        if len(sites) == count:
+            break
+        if all(max(abs(x - other[0]), abs(y - other[1])) >= spacing for other in sites):
+            sites.append([int(x), int(y), score])
+    return sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or re-rank the spawn sites of a baked world")
+    parser.add_argument("world", help="Baked world file")
+    parser.add_argument("--count", type=int, default=DEFAULT_SITE_COUNT, help="Sites to list")
+    parser.add_argument("--spacing", type=int, default=DEFAULT_SITE_SPACING, help="Minimum tiles between sites")
+    args = parser.parse_args()
+
+    world = open_world(args.world)
+    if "spawn_score" not in world:
+        print(f"❌ {args.world} has no spawn scores; re-bake it with world_baker.py")
+        return 1
+
+    score = np.asarray(world["spawn_score"]) / 255.0
+    sites = rank_sites(score, args.count, args.spacing)
+    terrain_types = world.meta["terrain_types"]
+    print(f"🏕️  {world.path}: {len(sites)} sites, {np.count_nonzero(score)} tiles can host a civilization")
+    for rank, (x, y, site_score) in enumerate(sites, 1):
+        print(f"   {rank:2d}. ({x}, {y}) {terrain_types[world['terrain'][x, y]]}, score {site_score:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+World Parameter Sweep
+Bakes many (seed, preset, parameter) combinations across a process pool and
+summarizes how the resulting maps are distributed, to pick presets that
+reliably give playable worlds
+"""
+
+import argparse
+import itertools
+import json
+import re
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from world_baker import PRESETS, TERRAIN_TYPES, WorldBaker, load_placement_tables
+from world_preview import add_entries, load_palettes, write_thumbnail
+
+DEFAULT_SEEDS = 200
+DEFAULT_SIZE = 64
+PERCENTILES = [5, 50, 95]
+
+# A biome counts towards diversity once it covers this share of the map
+BIOME_MIN_FRACTION = 0.01
+
+# What makes a map playable
+PLAYABLE = {
+    "min_water_fraction": 0.01,
+    "max_water_fraction": 0.6,
+    "min_biomes": 4,
+    "min_resource_coverage": 0.001
+}
+
+METRICS = ["water_fraction", "biome_count", "biome_entropy", "resource_coverage", "resource_types",
+           "vegetation_coverage", "avg_temperature"]
+
+
+def world_metrics(stats, playable=PLAYABLE):
+    """Per-world numbers to compare across a sweep, from WorldBaker.get_world_stats"""
+    total = stats["total_tiles"]
+    fractions = np.array([stats["terrain_counts"].get(name, 0) / total for name in TERRAIN_TYPES])
+    present = fractions[fractions > 0]
+
+    metrics = {
+        "water_fraction": float(fractions[TERRAIN_TYPES.index("water")]),
+        "biome_count": int(np.count_nonzero(fractions >= BIOME_MIN_FRACTION)),
+        # Shannon entropy in bits: 0 for a single biome, 3 for all eight equally
+        "biome_entropy": float(-(present * np.log2(present)).sum()),
+        "resource_coverage": stats["resource_coverage"]["any"],
+        "resource_types": len(stats["resource_counts"]),
+        "vegetation_coverage": stats["vegetated_tiles"] / total,
+        "avg_temperature": stats["avg_temperature"]
+    }
+    metrics["playable"] = bool(
+        playable["min_water_fraction"] <= metrics["water_fraction"] <= playable["max_water_fraction"]
+        and metrics["biome_count"] >= playable["min_biomes"]
+        and metrics["resource_coverage"] >= playable["min_resource_coverage"]
+    )
+    return metrics
+
+
+_palettes = None
+
+
+def preview_path(group, seed):
+    """Thumbnail path, relative to the preview root, for one sweep run"""
+    return f"sweep/{re.sub(r'[^A-Za-z0-9_.=-]+', '_', group)}/seed_{seed}.png"
+
+
+def _bake_run(job):
+    global _palettes
+    group, preset, params, playable, placement, previews = job
+    baker = WorldBaker(params, preset, placement=placement).bake()
+    if previews:
+        # Loaded once per worker process
+        if _palettes is None:
+            _palettes = load_palettes()
+        write_thumbnail(baker.terrain, baker.vegetation, Path(previews) / preview_path(group, params["seed"]), _palettes)
+    return group, params["seed"], world_metrics(baker.get_world_stats(), playable)
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=np.float64)
+    summary = {"mean": float(values.mean()), "std": float(values.std())}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{percentile}"] = float(value)
+    return summary
+
+
+def parse_vary(values):
+    """--vary name=v1,v2,... options as a list of (name, values)"""
+    grid = []
+    for option in values or []:
+        name, _, listed = option.partition("=")
+        name = name.replace("-", "_")
+        cast = int if name == "river_count" else float
+        grid.append((name, [cast(value) for value in listed.split(",")]))
+    return grid
+
+
+def sweep_jobs(presets, seeds, size, grid, playable=PLAYABLE, placement=None, previews=None):
+    """One job per (preset, parameter combination, seed); jobs sharing a group are summarized together"""
+    names = [name for name, _ in grid]
+    for preset in presets:
+        for combination in itertools.product(*[values for _, values in grid]):
+            overrides = dict(zip(names, combination))
+            group = preset + "".join(f" {name}={value}" for name, value in overrides.items())
+            for seed in seeds:
+                yield group, preset, dict(overrides, seed=seed, world_size=size), playable, placement, previews
+
+
+def run_sweep(presets, seeds, size=DEFAULT_SIZE, grid=None, workers=None, playable=PLAYABLE, placement=None,
+              previews=None):
+    """Bake every combination and return {group: summary}
+
+    With previews set, every run also gets a thumbnail listed in the
+    preview viewer under that directory.
+    """
+    jobs = list(sweep_jobs(presets, seeds, size, grid or [], playable, placement, previews))
+    runs = {}
+    with Pool(workers) as pool:
+        for group, seed, metrics in pool.imap_unordered(_bake_run, jobs, chunksize=8):
+            runs.setdefault(group, []).append((seed, metrics))
+
+    summaries = {}
+    for group, results in runs.items():
+        results.sort()
+        summaries[group] = {
+            "runs": len(results),
+            "playable_fraction": float(np.mean([metrics["playable"] for _, metrics in results])),
+            "unplayable_seeds": [seed for seed, metrics in results if not metrics["playable"]],
+            **{name: summarize([metrics[name] for _, metrics in results]) for name in METRICS}
+        }
+
+    if previews:
+        add_entries(previews, [{"name": f"seed {seed}", "group": group, "thumbnail": preview_path(group, seed),
+                                "info": metrics}
+                               for group, results in runs.items() for seed, metrics in results])
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep world generation seeds, presets and parameters")
+    parser.add_argument("--presets", nargs="+", choices=sorted(PRESETS), default=sorted(PRESETS))
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS, help="Seeds per combination")
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="World width and height in tiles")
+    parser.add_argument("--vary", action="append", metavar="PARAM=V1,V2,...",
+                        help="Override a preset parameter with each listed value, e.g. elevation_scale=0.05,0.1")
+    parser.add_argument("--playable", action="append", metavar="NAME=VALUE",
+                        help=f"Override a playability threshold ({', '.join(PLAYABLE)})")
+    parser.add_argument("--placement", help="Resource/vegetation chance tables to sweep with")
+    parser.add_argument("--previews", nargs="?", const="previews", metavar="DIR",
+                        help="Write a thumbnail per run and list them in the preview viewer (default: previews)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--json", help="Write summaries as JSON to this file")
+    args = parser.parse_args()
+
+    grid = parse_vary(args.vary)
+    playable = dict(PLAYABLE)
+    for option in args.playable or []:
+        name, _, value = option.partition("=")
+        if name not in PLAYABLE:
+            parser.error(f"Unknown playability threshold: {name}")
+        playable[name] = float(value)
+
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+    combinations = len(args.presets) * int(np.prod([len(values) for _, values in grid]))
+
+    print(f"🌍 Sweeping {combinations * len(seeds)} worlds ({combinations} combinations x {len(seeds)} seeds, "
+          f"{args.size}x{args.size})...")
+    start = time.perf_counter()
+    placement = load_placement_tables(args.placement) if args.placement else None
+    summaries = run_sweep(args.presets, seeds, args.size, grid, args.workers, playable, placement, args.previews)
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s\n")
+
+    ranked = sorted(summaries.items(), key=lambda item: -item[1]["playable_fraction"])
+    for group, summary in ranked:
+        water = summary["water_fraction"]
+        print(f"{group}")
+        print(f"   - Playable: {summary['playable_fraction'] * 100:.1f}% of {summary['runs']} seeds")
+        print(f"   - Water: median {water['p50'] * 100:.1f}% (p5 {water['p5'] * 100:.1f}%, p95 {water['p95'] * 100:.1f}%)")
+        print(f"   - Biomes: median {summary['biome_count']['p50']:.0f}, "
+              f"entropy {summary['biome_entropy']['mean']:.2f} bits")
+        print(f"   - Resources: coverage median {summary['resource_coverage']['p50'] * 100:.2f}%, "
+              f"{summary['resource_types']['mean']:.1f} types on average")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"playable": playable, "groups": summaries}, f, indent=2)
+        print(f"\n✅ Summaries saved to {args.json}")
+    if args.previews:
+        print(f"✅ Thumbnails listed in {Path(args.previews) / 'index.html'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())